@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+# Додаємо батьківську директорію до шляху для імпорту модулів
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,33 @@
-#!/usr/bin/env python3
-
-import sys
-import os
-
-# Додаємо батьківську директорію до шляху для імпорту модулів
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.game import Game
-
-def main():
-    """Точка входу в гру."""
-    game = Game()
-    game.run()
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+
+import time
+
+# Початок відліку часу запуску — до імпорту pygame та модулів гри
+STARTUP_START = time.perf_counter()
+
+import sys
+import os
+import argparse
+
+# Додаємо батьківську директорію до шляху для імпорту модулів
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.startup import StartupTimer
+from src.game import Game
+
+def main():
+    """Точка входу в гру."""
+    parser = argparse.ArgumentParser(description="Гра з баклажаном")
+    parser.add_argument("--record", metavar="FILE",
+                        help="Записати сесію у файл для відтворення (див. replay.py)")
+    args = parser.parse_args()
+    
+    startup_timer = StartupTimer(STARTUP_START)
+    startup_timer.mark("імпорт модулів")
+    game = Game(startup_timer=startup_timer)
+    if args.record:
+        game.start_recording(args.record)
+    game.run()
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,103 +1,176 @@
-import pygame
-from src.constants import *
-
-class AchievementSystem:
-    """
-    Система досягнень для гри з баклажаном.
-    """
-    def __init__(self, language_manager):
-        """
-        Ініціалізація системи досягнень.
-        
-        Args:
-            language_manager: Менеджер мови для перекладу текстів
-        """
-        self.language_manager = language_manager
-        
-        # Копіюємо список досягнень з констант
-        self.achievements = []
-        for achievement in ACHIEVEMENTS:
-            self.achievements.append(achievement.copy())
-        
-        # Змінні для відображення повідомлень про досягнення
-        self.achievement_text = None
-        self.achievement_timer = 0
-        
-        # Ініціалізація шрифту
-        self.font = pygame.font.Font(None, LARGE_FONT_SIZE)
-    
-    def check_achievements(self, total_clicks):
-        """
-        Перевірка досягнень на основі загальної кількості кліків.
-        
-        Args:
-            total_clicks: Загальна кількість кліків
-        """
-        for i, achievement in enumerate(self.achievements):
-            if total_clicks >= achievement["threshold"] and not achievement["achieved"]:
-                achievement["achieved"] = True
-                
-                # Отримуємо перекладену назву досягнення
-                achievement_name = self.language_manager.get_achievement_name(i)
-                self.show_achievement(achievement_name)
-    
-    def show_achievement(self, name):
-        """
-        Показує повідомлення про отримане досягнення.
-        
-        Args:
-            name: Назва досягнення
-        """
-        self.achievement_text = self.font.render(
-            f"{self.language_manager.get_text('achievement_unlocked')}: {name}!", 
-            True, 
-            ACHIEVEMENT_COLOR
-        )
-        self.achievement_timer = ACHIEVEMENT_DISPLAY_TIME
-    
-    def update(self):
-        """Оновлення стану системи досягнень."""
-        if self.achievement_timer > 0:
-            self.achievement_timer -= 1
-    
-    def render(self, screen):
-        """
-        Рендеринг повідомлення про досягнення.
-        
-        Args:
-            screen: Поверхня для рендерингу
-        """
-        if self.achievement_timer > 0 and self.achievement_text:
-            # Обчислюємо прозорість
-            alpha = 255
-            if self.achievement_timer < 30:  # Затухання в останню секунду
-                alpha = int(255 * (self.achievement_timer / 30))
-            
-            # Створюємо копію тексту з потрібною прозорістю
-            text_surface = self.achievement_text.copy()
-            text_surface.set_alpha(alpha)
-            
-            # Центруємо текст на екрані
-            x = screen.get_width() // 2 - text_surface.get_width() // 2
-            y = 80  # Трохи нижче верхнього краю екрану
-            
-            # Малюємо напівпрозоре тло
-            bg_rect = text_surface.get_rect()
-            bg_rect.center = (screen.get_width() // 2, y + text_surface.get_height() // 2)
-            bg_rect.inflate_ip(20, 10)  # Трохи більший розмір, ніж текст
-            
-            bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-            bg_surface.fill((0, 0, 0))
-            bg_surface.set_alpha(min(128, alpha // 2))  # Половина прозорості тексту
-            
-            screen.blit(bg_surface, bg_rect)
-            screen.blit(text_surface, (x, y))
-            
-    def get_unlocked_achievements(self):
-        """
-        Отримує список розблокованих досягнень.
-        
-        Returns:
-            Список розблокованих досягнень
-        """
+import pygame
+from src.constants import *
+from src.fonts import get_font
+from src.save_format import iterate_bits
+from src.achievement_index import AchievementIndex, load_achievement_definitions
+
+class AchievementSystem:
+    """
+    Система досягнень для гри з баклажаном.
+    """
+    def __init__(self, language_manager, text_cache, definitions=None):
+        """
+        Ініціалізація системи досягнень.
+        
+        Args:
+            language_manager: Менеджер мови для перекладу текстів
+            text_cache: Спільний кеш текстових поверхонь
+            definitions: Визначення досягнень (за замовчуванням з файлу даних)
+        """
+        self.language_manager = language_manager
+        self.text_cache = text_cache
+        
+        # Індекс досягнень, завантажених з файлу даних
+        if definitions is None:
+            definitions = load_achievement_definitions()
+        self.index = AchievementIndex(definitions)
+        self.achievements = self.index.achievements
+        self.update_names()
+        language_manager.subscribe(self.on_language_changed)
+        
+        # Пошук id досягнення за назвою будь-якою мовою (для міграції старих збережень)
+        self.ids_by_name = {}
+        for achievement in self.achievements:
+            for name in achievement["names"].values():
+                self.ids_by_name[name] = achievement["id"]
+        
+        # Лічильник змін набору отриманих досягнень (для інвалідації кешів)
+        self.revision = 0
+        
+        # Змінні для відображення повідомлень про досягнення
+        self.achievement_text = None
+        self.achievement_timer = 0
+        
+        # Ініціалізація шрифту
+        self.font = get_font(LARGE_FONT_SIZE)
+    
+    def update_names(self):
+        """Оновлює назви досягнень відповідно до поточної мови."""
+        for achievement in self.achievements:
+            achievement["name"] = self.language_manager.get_achievement_name(achievement)
+    
+    def on_language_changed(self, language):
+        """
+        Оновлює назви досягнень після зміни мови.
+        
+        Args:
+            language: Код нової мови
+        """
+        self.update_names()
+        self.achievement_text = None
+        self.achievement_timer = 0
+        self.revision += 1
+    
+    def check_achievements(self, total_clicks, announce=True):
+        """
+        Перевірка досягнень на основі загальної кількості кліків.
+        Розблоковує всі рівні, пройдені з моменту попередньої перевірки.
+        
+        Args:
+            total_clicks: Загальна кількість кліків
+            announce: Чи показувати повідомлення про отримане досягнення
+            
+        Returns:
+            Список щойно отриманих досягнень
+        """
+        unlocked = self.index.unlock_up_to(total_clicks)
+        if unlocked:
+            self.revision += 1
+        if unlocked and announce:
+            # Показуємо повідомлення про найвище отримане досягнення
+            self.show_achievement(unlocked[-1]["name"])
+        return unlocked
+    
+    def get_unlocked_bits(self):
+        """
+        Отримує бітову маску отриманих досягнень для збереження.
+        
+        Returns:
+            Ціле число, в якому встановлено біти з id отриманих досягнень
+        """
+        return self.index.unlocked_bits
+    
+    def restore_achievements(self, bits):
+        """
+        Відновлює отримані досягнення зі збереження.
+        Кожен встановлений біт знаходиться за id через словник, тому
+        відновлення лінійне за кількістю отриманих досягнень.
+        
+        Args:
+            bits: Бітова маска отриманих досягнень (біт = id)
+        """
+        for achievement_id in iterate_bits(bits):
+            index = self.index.indices_by_id.get(achievement_id)
+            if index is not None:
+                self.index.set_achieved(index)
+        self.revision += 1
+    
+    def show_achievement(self, name):
+        """
+        Показує повідомлення про отримане досягнення.
+        
+        Args:
+            name: Назва досягнення
+        """
+        self.achievement_text = self.text_cache.render(
+            self.font,
+            f"{self.language_manager.get_text('achievement_unlocked')}: {name}!",
+            ACHIEVEMENT_COLOR
+        )
+        self.achievement_timer = ACHIEVEMENT_DISPLAY_TIME
+    
+    def is_animating(self):
+        """Повертає True, якщо показується повідомлення про досягнення."""
+        return self.achievement_timer > 0
+    
+    def update(self):
+        """Оновлення стану системи досягнень."""
+        if self.achievement_timer > 0:
+            self.achievement_timer -= 1
+    
+    def render(self, screen):
+        """
+        Рендеринг повідомлення про досягнення.
+        
+        Args:
+            screen: Поверхня для рендерингу
+            
+        Returns:
+            Список перемальованих прямокутників
+        """
+        if self.achievement_timer > 0 and self.achievement_text:
+            # Обчислюємо прозорість
+            alpha = 255
+            if self.achievement_timer < 30:  # Затухання в останню секунду
+                alpha = int(255 * (self.achievement_timer / 30))
+            
+            # Створюємо копію тексту з потрібною прозорістю
+            text_surface = self.achievement_text.copy()
+            text_surface.set_alpha(alpha)
+            
+            # Центруємо текст на екрані
+            x = screen.get_width() // 2 - text_surface.get_width() // 2
+            y = 80  # Трохи нижче верхнього краю екрану
+            
+            # Малюємо напівпрозоре тло
+            bg_rect = text_surface.get_rect()
+            bg_rect.center = (screen.get_width() // 2, y + text_surface.get_height() // 2)
+            bg_rect.inflate_ip(20, 10)  # Трохи більший розмір, ніж текст
+            
+            bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
+            bg_surface.fill((0, 0, 0))
+            bg_surface.set_alpha(min(128, alpha // 2))  # Половина прозорості тексту
+            
+            screen.blit(bg_surface, bg_rect)
+            screen.blit(text_surface, (x, y))
+            return [bg_rect]
+        return []
+            
+    def get_unlocked_achievements(self):
+        """
+        Отримує список розблокованих досягнень.
+        
+        Returns:
+            Список розблокованих досягнень
+        """
         return [a for a in self.achievements if a["achieved"]]
\ No newline at end of file
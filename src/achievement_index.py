@@ -0,0 +1,159 @@
+import os
+import json
+from bisect import bisect_right
+from src.constants import *
+
+def load_achievement_definitions(path=None):
+    """
+    Завантажує визначення досягнень з файлу даних.
+    Окрім явно описаних досягнень, файл може містити генератори рівнів
+    виду base^k, які розгортаються у звичайні визначення.
+    
+    Args:
+        path: Шлях до файлу даних (за замовчуванням assets/data/achievements.json)
+        
+    Returns:
+        Список визначень, відсортований за порогом
+    """
+    if path is None:
+        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(script_dir, ACHIEVEMENTS_DATA_FILE)
+    
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    
+    definitions = []
+    for entry in data.get("achievements", []):
+        definitions.append({
+            "id": entry["id"],
+            "threshold": entry["threshold"],
+            "names": entry["name"]
+        })
+    
+    # Процедурно згенеровані рівні: поріг base^k для k з діапазону
+    for generator in data.get("generated", []):
+        base = generator["base"]
+        for exponent in range(generator["exponent_from"], generator["exponent_to"] + 1):
+            threshold = base ** exponent
+            definitions.append({
+                "id": generator["id_start"] + exponent,
+                "threshold": threshold,
+                "names": {
+                    language: template.format(exponent=exponent, threshold=threshold)
+                    for language, template in generator["name"].items()
+                }
+            })
+    
+    definitions.sort(key=lambda definition: definition["threshold"])
+    return definitions
+
+class AchievementIndex:
+    """
+    Відсортований за порогами індекс досягнень.
+    Курсор вказує на перше неотримане досягнення, тому наступний та
+    попередній пороги доступні за O(1), а розблокування всіх рівнів,
+    пройдених за одне збільшення лічильника, знаходиться через bisect.
+    Клас не залежить від pygame.
+    """
+    def __init__(self, definitions):
+        """
+        Ініціалізація індексу.
+        
+        Args:
+            definitions: Визначення досягнень, відсортовані за порогом
+        """
+        self.achievements = []
+        for definition in definitions:
+            self.achievements.append({
+                "id": definition["id"],
+                "threshold": definition["threshold"],
+                "names": definition["names"],
+                "name": "",
+                "achieved": False
+            })
+        self.thresholds = [achievement["threshold"] for achievement in self.achievements]
+        self.cursor = 0
+        
+        # Пошук за стабільним id та бітова маска отриманих досягнень (біт = id)
+        self.indices_by_id = {achievement["id"]: i for i, achievement in enumerate(self.achievements)}
+        self.unlocked_bits = 0
+    
+    def advance_cursor(self):
+        """Зсуває курсор за вже отримані досягнення."""
+        while self.cursor < len(self.achievements) and self.achievements[self.cursor]["achieved"]:
+            self.cursor += 1
+    
+    def unlock_up_to(self, total_clicks):
+        """
+        Розблоковує всі досягнення з порогом не більшим за кількість кліків.
+        
+        Args:
+            total_clicks: Загальна кількість кліків
+            
+        Returns:
+            Список щойно отриманих досягнень
+        """
+        end = bisect_right(self.thresholds, total_clicks)
+        unlocked = []
+        for index in range(self.cursor, end):
+            achievement = self.achievements[index]
+            if not achievement["achieved"]:
+                achievement["achieved"] = True
+                self.unlocked_bits |= 1 << achievement["id"]
+                unlocked.append(achievement)
+        self.advance_cursor()
+        return unlocked
+    
+    def set_achieved(self, index):
+        """
+        Позначає досягнення як отримане (наприклад, при завантаженні збереження).
+        
+        Args:
+            index: Індекс досягнення
+        """
+        achievement = self.achievements[index]
+        achievement["achieved"] = True
+        self.unlocked_bits |= 1 << achievement["id"]
+        self.advance_cursor()
+    
+    def next_achievement(self):
+        """
+        Отримує наступне неотримане досягнення.
+        
+        Returns:
+            Досягнення або None, якщо всі отримано
+        """
+        if self.cursor < len(self.achievements):
+            return self.achievements[self.cursor]
+        return None
+    
+    def next_milestone(self):
+        """
+        Отримує поріг наступного неотриманого досягнення.
+        
+        Returns:
+            Поріг або None, якщо всі досягнення отримано
+        """
+        if self.cursor < len(self.thresholds):
+            return self.thresholds[self.cursor]
+        return None
+    
+    def previous_milestone(self):
+        """
+        Отримує найбільший поріг, що передує наступному досягненню.
+        
+        Returns:
+            Поріг або 0, якщо попередніх досягнень немає
+        """
+        if self.cursor > 0:
+            return self.thresholds[self.cursor - 1]
+        return 0
+    
+    def last_milestone(self):
+        """
+        Отримує найбільший поріг серед усіх досягнень.
+        
+        Returns:
+            Поріг або 0, якщо досягнень немає
+        """
+        return self.thresholds[-1] if self.thresholds else 0
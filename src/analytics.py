@@ -0,0 +1,341 @@
+"""
+Аналітика кліків у базі SQLite.
+Кожен клік записується компактним рядком: час, кнопка, позиція та номер
+кадру. Головний потік лише додає рядки в буфер у пам'яті, а фоновий потік
+записує їх пакетами в одній транзакції у файл бази в режимі WAL і виконує
+запити статистики, тому ігровий цикл ніколи не чекає на базу.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from concurrent.futures import Future
+from src.constants import *
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started INTEGER NOT NULL,
+    ended INTEGER,
+    left_clicks INTEGER NOT NULL DEFAULT 0,
+    right_clicks INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS clicks (
+    session INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    button INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    frame INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clicks_by_session_time ON clicks (session, time);
+"""
+
+def connect(path):
+    """
+    Відкриває базу аналітики та створює схему, якщо її ще немає.
+    
+    Args:
+        path: Шлях до файлу бази
+    
+    Returns:
+        З'єднання sqlite3
+    """
+    connection = sqlite3.connect(path)
+    # WAL дозволяє читати базу під час запису, а synchronous=NORMAL
+    # синхронізує диск лише на контрольних точках, а не в кожній транзакції
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    connection.commit()
+    return connection
+
+def query_lifetime_stats(connection):
+    """
+    Загальна статистика за всі сесії.
+    Лічильники беруться з підсумків сесій, тому запит не проходить по всіх кліках.
+    
+    Args:
+        connection: З'єднання sqlite3
+    
+    Returns:
+        Словник зі статистикою
+    """
+    sessions, left_clicks, right_clicks, first_started, last_ended = connection.execute(
+        "SELECT COUNT(*), TOTAL(left_clicks), TOTAL(right_clicks), MIN(started), MAX(ended) FROM sessions"
+    ).fetchone()
+    return {
+        "sessions": sessions,
+        "left_clicks": int(left_clicks),
+        "right_clicks": int(right_clicks),
+        "total_clicks": int(left_clicks + right_clicks),
+        "first_session_ms": first_started,
+        "last_session_ms": last_ended
+    }
+
+def query_session_history(connection, limit=ANALYTICS_HISTORY_SIZE):
+    """
+    Останні сесії з кількістю кліків і тривалістю.
+    
+    Args:
+        connection: З'єднання sqlite3
+        limit: Максимальна кількість сесій
+    
+    Returns:
+        Список словників від найновішої сесії до найстарішої
+    """
+    rows = connection.execute(
+        "SELECT id, started, ended, left_clicks, right_clicks FROM sessions ORDER BY id DESC LIMIT ?",
+        (limit,)
+    ).fetchall()
+    return [
+        {
+            "session": session,
+            "started_ms": started,
+            "duration_s": (ended - started) / 1000 if ended is not None else None,
+            "left_clicks": left_clicks,
+            "right_clicks": right_clicks
+        }
+        for session, started, ended, left_clicks, right_clicks in rows
+    ]
+
+def query_cps_histogram(connection, session=None):
+    """
+    Гістограма кліків на секунду: скільки секунд гри мали кожну кількість кліків.
+    Групування виконується в SQLite за індексом (сесія, час).
+    
+    Args:
+        connection: З'єднання sqlite3
+        session: Номер сесії (None — усі сесії)
+    
+    Returns:
+        Словник {кліків на секунду: кількість секунд}
+    """
+    where = "" if session is None else "WHERE session = ?"
+    parameters = () if session is None else (session,)
+    rows = connection.execute(
+        f"SELECT cps, COUNT(*) FROM ("
+        f"SELECT COUNT(*) AS cps FROM clicks {where} GROUP BY session, time / 1000"
+        f") GROUP BY cps ORDER BY cps",
+        parameters
+    ).fetchall()
+    return dict(rows)
+
+class ClickAnalytics:
+    """
+    Фоновий записувач аналітики кліків.
+    Рядки накопичуються в буфері та скидаються в базу пакетом, коли їх
+    набирається ANALYTICS_BATCH_SIZE або минає ANALYTICS_FLUSH_INTERVAL.
+    З'єднання з базою належить лише фоновому потоку, тому запити
+    статистики теж виконуються там і повертають Future.
+    """
+    def __init__(self, path):
+        """
+        Ініціалізація записувача.
+        
+        Args:
+            path: Шлях до файлу бази
+        """
+        self.path = path
+        self.session = None
+        self.session_started = int(time.time() * 1000)
+        
+        # Стан, спільний з фоновим потоком (захищений умовою)
+        self.condition = threading.Condition()
+        self.pending_clicks = []
+        self.pending_queries = []
+        self.stopping = False
+        
+        self.connection = None
+        self.thread = threading.Thread(target=self.worker, name="ClickAnalytics", daemon=True)
+    
+    def start(self):
+        """Запускає фоновий потік запису."""
+        self.thread.start()
+    
+    def record_click(self, button, pos, frame):
+        """
+        Додає клік у буфер.
+        
+        Args:
+            button: Кнопка миші (1 - ліва, 3 - права)
+            pos: Позиція кліку
+            frame: Номер кадру, в якому оброблено клік
+        """
+        row = (int(time.time() * 1000), button, pos[0], pos[1], frame)
+        with self.condition:
+            self.pending_clicks.append(row)
+            # Будимо потік лише для повного пакета, решту забере таймер
+            if len(self.pending_clicks) >= ANALYTICS_BATCH_SIZE:
+                self.condition.notify()
+    
+    def submit_query(self, query, *args):
+        """
+        Ставить запит у чергу фонового потоку.
+        Перед запитом у базу скидаються всі накопичені кліки.
+        
+        Args:
+            query: Функція, яка приймає з'єднання та аргументи
+            *args: Додаткові аргументи запиту
+        
+        Returns:
+            Future з результатом запиту
+        """
+        future = Future()
+        with self.condition:
+            self.pending_queries.append((future, query, args))
+            self.condition.notify()
+        return future
+    
+    def lifetime_stats(self):
+        """Загальна статистика за всі сесії (Future)."""
+        return self.submit_query(query_lifetime_stats)
+    
+    def session_history(self, limit=ANALYTICS_HISTORY_SIZE):
+        """Останні сесії (Future)."""
+        return self.submit_query(query_session_history, limit)
+    
+    def cps_histogram(self, session=None):
+        """Гістограма кліків на секунду (Future); session=None — усі сесії."""
+        return self.submit_query(query_cps_histogram, session)
+    
+    def stop(self):
+        """Скидає буфер, закриває сесію та зупиняє фоновий потік."""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        if self.thread.is_alive():
+            self.thread.join()
+    
+    def worker(self):
+        """Цикл фонового потоку: пакетний запис кліків і виконання запитів."""
+        try:
+            self.connection = connect(self.path)
+            with self.connection:
+                self.session = self.connection.execute(
+                    "INSERT INTO sessions (started) VALUES (?)", (self.session_started,)).lastrowid
+        except sqlite3.Error as e:
+            print(f"Не вдалося відкрити базу аналітики: {e}")
+            self.connection = None
+        
+        while True:
+            with self.condition:
+                deadline = time.monotonic() + ANALYTICS_FLUSH_INTERVAL
+                while not (len(self.pending_clicks) >= ANALYTICS_BATCH_SIZE
+                           or self.pending_queries or self.stopping):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                clicks = self.pending_clicks
+                self.pending_clicks = []
+                queries = self.pending_queries
+                self.pending_queries = []
+                stopping = self.stopping
+            
+            if clicks:
+                self.flush(clicks)
+            for future, query, args in queries:
+                self.run_query(future, query, args)
+            
+            if stopping:
+                with self.condition:
+                    if not (self.pending_clicks or self.pending_queries):
+                        break
+        self.close()
+    
+    def flush(self, clicks):
+        """
+        Записує пакет кліків однією транзакцією та оновлює підсумки сесії.
+        
+        Args:
+            clicks: Список кортежів (час, кнопка, x, y, кадр)
+        """
+        if self.connection is None:
+            return
+        left_clicks = sum(1 for click in clicks if click[1] == 1)
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO clicks (session, time, button, x, y, frame) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.session,) + click for click in clicks])
+                self.connection.execute(
+                    "UPDATE sessions SET ended = ?, left_clicks = left_clicks + ?, "
+                    "right_clicks = right_clicks + ? WHERE id = ?",
+                    (clicks[-1][0], left_clicks, len(clicks) - left_clicks, self.session))
+        except sqlite3.Error as e:
+            print(f"Не вдалося записати аналітику: {e}")
+    
+    def run_query(self, future, query, args):
+        """
+        Виконує запит і передає результат у Future.
+        
+        Args:
+            future: Future для результату
+            query: Функція запиту
+            args: Аргументи запиту
+        """
+        if not future.set_running_or_notify_cancel():
+            return
+        if self.connection is None:
+            future.set_exception(sqlite3.OperationalError("База аналітики недоступна"))
+            return
+        try:
+            future.set_result(query(self.connection, *args))
+        except sqlite3.Error as e:
+            future.set_exception(e)
+    
+    def close(self):
+        """Позначає кінець сесії та закриває з'єднання."""
+        if self.connection is None:
+            return
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE sessions SET ended = ? WHERE id = ?", (int(time.time() * 1000), self.session))
+        except sqlite3.Error as e:
+            print(f"Не вдалося завершити сесію аналітики: {e}")
+        self.connection.close()
+        self.connection = None
+
+def main(argv=None):
+    """
+    Виводить статистику кліків з бази аналітики у форматі JSON.
+    
+    Args:
+        argv: Аргументи командного рядка
+    """
+    parser = argparse.ArgumentParser(description="Статистика кліків гри з баклажаном")
+    parser.add_argument("--db", help="Файл бази аналітики (за замовчуванням у корені гри)")
+    parser.add_argument("--session", type=int, help="Гістограма лише для цієї сесії")
+    parser.add_argument("--history", type=int, default=ANALYTICS_HISTORY_SIZE, help="Кількість останніх сесій")
+    args = parser.parse_args(argv)
+    
+    path = args.db
+    if path is None:
+        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(script_dir, ANALYTICS_FILE)
+    if not os.path.exists(path):
+        print(f"Базу аналітики не знайдено: {path}", file=sys.stderr)
+        return 1
+    
+    try:
+        connection = connect(path)
+        report = {
+            "lifetime": query_lifetime_stats(connection),
+            "sessions": query_session_history(connection, args.history),
+            "cps_histogram": query_cps_histogram(connection, args.session)
+        }
+        connection.close()
+    except sqlite3.Error as e:
+        print(f"Не вдалося прочитати базу аналітики: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,196 +1,481 @@
-import pygame
-import math
-import random
-from src.constants import *
-
-class AnimationSystem:
-    """
-    Клас для управління всіма анімаціями в грі.
-    """
-    def __init__(self, screen, eggplant_image, eggplant_rect):
-        """
-        Ініціалізація системи анімації.
-        
-        Args:
-            screen: Поверхня для рендерингу
-            eggplant_image: Зображення баклажана
-            eggplant_rect: Прямокутник із розташуванням баклажана
-        """
-        self.screen = screen
-        self.eggplant_image = eggplant_image
-        self.eggplant_rect = eggplant_rect
-        
-        # Змінні для анімації кліку
-        self.click_animation = False
-        self.click_timer = 0
-        self.click_scale = 1.0
-        
-        # Змінні для анімації тексту
-        self.floating_texts = []
-        
-        # Частинки
-        self.particles = []
-        
-        # Кеш масштабованих зображень
-        self.initialize_scaling_cache()
-    
-    def initialize_scaling_cache(self):
-        """Створює кеш змасштабованих зображень для оптимізації."""
-        self.scaled_images = {}
-        # Передобчислюємо кілька масштабів для швидкого доступу
-        scales = [0.9, 0.95, 1.0, 1.05, 1.1, 1.15, 1.2]
-        for scale in scales:
-            scaled_width = int(self.eggplant_rect.width * scale)
-            scaled_height = int(self.eggplant_rect.height * scale)
-            self.scaled_images[scale] = pygame.transform.smoothscale(
-                self.eggplant_image, (scaled_width, scaled_height))
-    
-    def get_scaled_image(self, scale):
-        """
-        Отримує передобчислене змасштабоване зображення.
-        
-        Args:
-            scale: Потрібний масштаб
-            
-        Returns:
-            Змасштабоване зображення
-        """
-        # Знаходимо найближчий доступний масштаб
-        closest_scale = min(self.scaled_images.keys(), 
-                          key=lambda x: abs(x - scale))
-        return self.scaled_images[closest_scale]
-    
-    def start_click_animation(self):
-        """Запускає анімацію кліку."""
-        self.click_animation = True
-        self.click_timer = CLICK_ANIMATION_DURATION
-        
-    def add_floating_text(self, text):
-        """
-        Додає текст, що з'являється і повільно зникає.
-        
-        Args:
-            text: Текст для відображення
-        """
-        text_font = pygame.font.Font(None, FONT_SIZE)
-        text_surface = text_font.render(text, True, TEXT_ANIMATION_COLOR)
-        # Розміщуємо текст над баклажаном з невеликою випадковою варіацією
-        x = self.eggplant_rect.centerx - text_surface.get_width() // 2 + random.randint(-20, 20)
-        y = self.eggplant_rect.top - 30 + random.randint(-10, 10)
-        
-        self.floating_texts.append({
-            "surface": text_surface,
-            "pos": [x, y],
-            "timer": TEXT_ANIMATION_DURATION,
-            "alpha": 255
-        })
-    
-    def spawn_particles(self, pos, count=PARTICLE_COUNT):
-        """
-        Створює частинки при кліку.
-        
-        Args:
-            pos: Позиція, де створити частинки
-            count: Кількість частинок
-        """
-        for _ in range(count):
-            # Випадковий кут і швидкість
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(2, 5)
-            # Випадкова тривалість життя та колір
-            lifetime = random.randint(20, 40)
-            color = random.choice(PARTICLE_COLORS)
-            
-            self.particles.append({
-                "pos": list(pos),
-                "vel": [math.cos(angle) * speed, math.sin(angle) * speed],
-                "lifetime": lifetime,
-                "color": color,
-                "size": random.randint(PARTICLE_MIN_SIZE, PARTICLE_MAX_SIZE)
-            })
-    
-    def update(self):
-        """Оновлення всіх анімацій."""
-        # Оновлення анімації кліку
-        if self.click_animation:
-            # Плавна пульсація при кліку
-            progress = 1 - (self.click_timer / CLICK_ANIMATION_DURATION)
-            self.click_scale = 1 + (CLICK_ANIMATION_SCALE - 1) * math.sin(progress * math.pi)
-            self.click_timer -= 1
-            if self.click_timer <= 0:
-                self.click_animation = False
-                self.click_scale = 1.0
-        
-        # Оновлення плаваючих текстів
-        for text in self.floating_texts[:]:
-            text["timer"] -= 1
-            text["pos"][1] -= 1  # Рух тексту вгору
-            # Поступове зникнення тексту
-            if text["timer"] < TEXT_FADE_SPEED:
-                text["alpha"] = int(255 * (text["timer"] / TEXT_FADE_SPEED))
-            # Видалення тексту, коли час вийшов
-            if text["timer"] <= 0:
-                self.floating_texts.remove(text)
-        
-        # Оновлення частинок
-        self.update_particles()
-    
-    def update_particles(self):
-        """Оновлення стану частинок."""
-        for particle in self.particles[:]:
-            particle["lifetime"] -= 1
-            if particle["lifetime"] <= 0:
-                self.particles.remove(particle)
-                continue
-                
-            # Рух частинок
-            particle["pos"][0] += particle["vel"][0]
-            particle["pos"][1] += particle["vel"][1]
-            # Додавання "гравітації"
-            particle["vel"][1] += PARTICLE_GRAVITY
-    
-    def render(self, center_pos):
-        """
-        Рендеринг баклажана та всіх анімаційних ефектів.
-        
-        Args:
-            center_pos: Позиція центра баклажана
-        """
-        # Малювання баклажана з поточним масштабом
-        scaled_image = self.get_scaled_image(self.click_scale)
-        scaled_rect = scaled_image.get_rect()
-        scaled_rect.center = center_pos
-        self.screen.blit(scaled_image, scaled_rect)
-        
-        # Оновлюємо прямокутник баклажана для коректного визначення натискань
-        self.eggplant_rect = scaled_rect
-        
-        # Малювання частинок
-        self.render_particles()
-        
-        # Малювання плаваючих текстів
-        self.render_floating_texts()
-    
-    def render_particles(self):
-        """Рендеринг частинок."""
-        for particle in self.particles:
-            # Прозорість залежить від часу життя
-            alpha = 255 * (particle["lifetime"] / 40)
-            
-            # Створюємо тимчасову поверхню для частинки
-            surf = pygame.Surface((particle["size"], particle["size"]))
-            surf.fill(particle["color"])
-            surf.set_alpha(alpha)
-            
-            # Малюємо частинку
-            self.screen.blit(surf, particle["pos"])
-    
-    def render_floating_texts(self):
-        """Рендеринг плаваючих текстів."""
-        for text in self.floating_texts:
-            # Створюємо копію з потрібною прозорістю
-            text_surface = text["surface"].copy()
-            text_surface.set_alpha(text["alpha"])
-            
-            # Малюємо текст
-            self.screen.blit(text_surface, text["pos"])
\ No newline at end of file
+import pygame
+import math
+import random
+import numpy as np
+from collections import OrderedDict
+from src.constants import *
+from src.fonts import get_font
+from src.glyph_atlas import GlyphAtlas
+from src.particles import ParticleSystem
+from src.assets import scale_sprite
+
+class AnimationSystem:
+    """
+    Клас для управління всіма анімаціями в грі.
+    """
+    def __init__(self, screen, eggplant_image, eggplant_rect, text_cache, seed=None):
+        """
+        Ініціалізація системи анімації.
+        
+        Args:
+            screen: Поверхня для рендерингу
+            eggplant_image: Зображення баклажана
+            eggplant_rect: Прямокутник із розташуванням баклажана
+            text_cache: Спільний кеш текстових поверхонь
+            seed: Зерно генераторів випадкових чисел (None — випадкове)
+        """
+        self.screen = screen
+        self.eggplant_image = eggplant_image
+        self.eggplant_rect = eggplant_rect
+        self.text_cache = text_cache
+        
+        # Власний генератор випадкових чисел, щоб сесію можна було відтворити
+        self.random = random.Random(seed)
+        
+        # Змінні для анімації кліку
+        self.click_animation = False
+        self.click_timer = 0
+        self.click_scale = 1.0
+        self.previous_click_scale = 1.0
+        
+        # Змінні для анімації тексту
+        self.floating_texts = []
+        self.text_font = get_font(FONT_SIZE)
+        self.text_atlas = GlyphAtlas(self.text_font, TEXT_ANIMATION_COLOR)
+        
+        # Частинки
+        self.particles = ParticleSystem(seed=seed)
+        
+        # Кеш масштабованих зображень
+        self.window_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.window_scale = 1.0
+        self.initialize_scaling_cache()
+        
+        # Таблиця готових спрайтів частинок
+        self.initialize_particle_sprites()
+        
+        # Параметри, що залежать від рівня якості
+        self.particle_spawn_count = PARTICLE_COUNT
+        self.floating_text_limit = None
+        self.alpha_levels = PARTICLE_ALPHA_LEVELS
+    
+    def initialize_scaling_cache(self):
+        """
+        Створює порожній LRU-кеш змасштабованих зображень.
+        Ключ кешу: (квантований масштаб, ширина вікна, висота вікна).
+        Зображення створюються лише при першому запиті, а найдавніше
+        використані видаляються, коли кеш перевищує ліміт пам'яті.
+        Разом із кожним зображенням зберігається маска непрозорих пікселів
+        для точного визначення натискань; вона будується, коли масштаб уперше
+        малюється, тому готові зображення з диска не сповільнюють запуск.
+        """
+        self.scaled_images = OrderedDict()
+        self.scaled_masks = {}
+        self.scaled_images_bytes = 0
+        self.scaled_images_budget = SPRITE_CACHE_BUDGET
+        self.eggplant_mask = None
+    
+    def set_window_size(self, width, height):
+        """
+        Задає розмір вікна, під який масштабується баклажан.
+        При розмірі вікна за замовчуванням баклажан має оригінальний розмір.
+        
+        Args:
+            width: Ширина вікна
+            height: Висота вікна
+        """
+        self.window_size = (width, height)
+        self.window_scale = min(width / SCREEN_WIDTH, height / SCREEN_HEIGHT)
+        # Одразу готуємо зображення у стані спокою, щоб перший кадр не чекав на масштабування
+        self.get_scaled_image(1.0)
+        self.eggplant_mask = self.get_scaled_mask(1.0)
+    
+    def initialize_particle_sprites(self):
+        """
+        Створює таблицю спрайтів для всіх комбінацій розміру, кольору
+        та рівня прозорості частинок.
+        Індекс спрайта: ((розмір - мінімальний розмір) * кількість кольорів + колір) * рівні + рівень.
+        """
+        self.particle_sprites = []
+        for size in range(PARTICLE_MIN_SIZE, PARTICLE_MAX_SIZE + 1):
+            for color in PARTICLE_COLORS:
+                for level in range(PARTICLE_ALPHA_LEVELS):
+                    surf = pygame.Surface((size, size))
+                    surf.fill(color)
+                    surf.set_alpha(255 * level // (PARTICLE_ALPHA_LEVELS - 1))
+                    self.particle_sprites.append(surf)
+    
+    def get_scale_key(self, scale):
+        """
+        Обчислює ключ кешу масштабів.
+        
+        Args:
+            scale: Масштаб відносно розміру баклажана у вікні
+        
+        Returns:
+            Кортеж (квантований масштаб, ширина вікна, висота вікна)
+        """
+        return (int(round(scale / SPRITE_SCALE_STEP)), self.window_size[0], self.window_size[1])
+    
+    def get_scaled_image(self, scale):
+        """
+        Отримує змасштабоване зображення з кешу, створюючи його за потреби.
+        
+        Args:
+            scale: Потрібний масштаб відносно розміру баклажана у вікні
+        
+        Returns:
+            Змасштабоване зображення
+        """
+        key = self.get_scale_key(scale)
+        image = self.scaled_images.get(key)
+        if image is not None:
+            self.scaled_images.move_to_end(key)
+            return image
+        
+        image = scale_sprite(self.eggplant_image, key[0] * SPRITE_SCALE_STEP * self.window_scale)
+        self.add_scaled_image(key, image)
+        return image
+    
+    def add_scaled_image(self, key, image):
+        """
+        Додає зображення в кеш масштабів, витісняючи найдавніше використані разом з їхніми масками.
+        
+        Args:
+            key: Ключ (квантований масштаб, ширина вікна, висота вікна)
+            image: Змасштабоване зображення
+        """
+        self.scaled_images[key] = image
+        self.scaled_images_bytes += self.get_cache_entry_size(image)
+        
+        # Видаляємо найдавніше використані зображення, залишаючи щойно створене
+        while self.scaled_images_bytes > self.scaled_images_budget and len(self.scaled_images) > 1:
+            evicted_key, evicted = self.scaled_images.popitem(last=False)
+            self.scaled_masks.pop(evicted_key, None)
+            self.scaled_images_bytes -= self.get_cache_entry_size(evicted)
+    
+    def get_scaled_mask(self, scale):
+        """
+        Отримує маску непрозорих пікселів змасштабованого зображення,
+        створюючи зображення та маску за потреби.
+        
+        Args:
+            scale: Масштаб відносно розміру баклажана у вікні
+        
+        Returns:
+            Маска pygame.mask.Mask
+        """
+        key = self.get_scale_key(scale)
+        mask = self.scaled_masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.get_scaled_image(scale))
+            self.scaled_masks[key] = mask
+        return mask
+    
+    def get_cache_entry_size(self, image):
+        """
+        Оцінює пам'ять, яку займає зображення разом з маскою (біт на піксель).
+        
+        Args:
+            image: Змасштабоване зображення
+        
+        Returns:
+            Розмір у байтах
+        """
+        return image.get_pitch() * image.get_height() + image.get_width() * image.get_height() // 8
+    
+    def hit_test(self, pos):
+        """
+        Перевіряє, чи точка потрапляє на непрозорий піксель баклажана
+        в тому вигляді, в якому його намальовано останнім.
+        Спочатку дешева перевірка прямокутника, потім одне читання маски.
+        
+        Args:
+            pos: Позиція у вікні
+        
+        Returns:
+            True, якщо натискання влучило в баклажан
+        """
+        rect = self.eggplant_rect
+        if not rect.collidepoint(pos):
+            return False
+        return self.eggplant_mask.get_at((pos[0] - rect.x, pos[1] - rect.y)) != 0
+    
+    def preload_scaled_images(self, images):
+        """
+        Заповнює кеш масштабів готовими зображеннями (наприклад, з кешу на диску).
+        
+        Args:
+            images: Словник {ключ масштабу: зображення}
+        """
+        for key, image in images.items():
+            if key not in self.scaled_images:
+                self.add_scaled_image(key, image)
+    
+    def apply_quality(self, settings):
+        """
+        Застосовує параметри рівня якості.
+        
+        Args:
+            settings: Словник параметрів з QUALITY_LEVELS
+        """
+        self.particle_spawn_count = settings["particle_count"]
+        self.particles.set_limit(settings["particle_limit"])
+        self.floating_text_limit = settings["floating_text_limit"]
+        self.alpha_levels = settings["alpha_levels"]
+    
+    def quantize_alpha(self, alpha):
+        """
+        Округлює прозорість вгору до найближчого з дозволених рівнів.
+        
+        Args:
+            alpha: Прозорість від 0 до 255
+        
+        Returns:
+            Квантована прозорість
+        """
+        step = 255 / (self.alpha_levels - 1)
+        return min(255, int(math.ceil(alpha / step) * step))
+    
+    def start_click_animation(self):
+        """Запускає анімацію кліку."""
+        self.click_animation = True
+        self.click_timer = CLICK_ANIMATION_DURATION
+    
+    def add_floating_text(self, parts):
+        """
+        Додає текст, що з'являється і повільно зникає.
+        Текст складається з гліфів атласу в окрему поверхню, тому
+        її прозорість можна змінювати напряму.
+        
+        Args:
+            parts: Частини тексту для атласу гліфів (рядки та цілі числа)
+        """
+        text_surface = self.text_atlas.render(parts)
+        # Розміщуємо текст над баклажаном з невеликою випадковою варіацією
+        x = self.eggplant_rect.centerx - text_surface.get_width() // 2 + self.random.randint(-20, 20)
+        y = self.eggplant_rect.top - 30 + self.random.randint(-10, 10)
+        
+        # При зниженій якості найстаріші тексти зникають одразу
+        if self.floating_text_limit is not None:
+            while len(self.floating_texts) >= self.floating_text_limit:
+                self.floating_texts.pop(0)
+        
+        self.floating_texts.append({
+            "surface": text_surface,
+            "pos": [x, y],
+            "previous_y": y,
+            "timer": TEXT_ANIMATION_DURATION,
+            "alpha": 255
+        })
+    
+    def spawn_particles(self, pos, count=None):
+        """
+        Створює частинки при кліку.
+        
+        Args:
+            pos: Позиція, де створити частинки
+            count: Кількість частинок (за замовчуванням залежить від рівня якості)
+        """
+        if count is None:
+            count = self.particle_spawn_count
+        self.particles.spawn(pos, count)
+    
+    def is_animating(self):
+        """Повертає True, якщо є активні анімації (пульсація, тексти чи частинки)."""
+        return self.click_animation or bool(self.floating_texts) or self.particles.count > 0
+    
+    def update(self):
+        """Оновлення всіх анімацій на один крок симуляції."""
+        # Оновлення анімації кліку
+        self.previous_click_scale = self.click_scale
+        if self.click_animation:
+            # Плавна пульсація при кліку
+            progress = 1 - (self.click_timer / CLICK_ANIMATION_DURATION)
+            self.click_scale = 1 + (CLICK_ANIMATION_SCALE - 1) * math.sin(progress * math.pi)
+            self.click_timer -= 1
+            if self.click_timer <= 0:
+                self.click_animation = False
+                self.click_scale = 1.0
+        
+        # Оновлення плаваючих текстів
+        for text in self.floating_texts[:]:
+            text["timer"] -= 1
+            text["previous_y"] = text["pos"][1]
+            text["pos"][1] -= 1  # Рух тексту вгору
+            # Поступове зникнення тексту
+            if text["timer"] < TEXT_FADE_SPEED:
+                text["alpha"] = self.quantize_alpha(255 * (text["timer"] / TEXT_FADE_SPEED))
+            # Видалення тексту, коли час вийшов
+            if text["timer"] <= 0:
+                self.floating_texts.remove(text)
+        
+        # Оновлення частинок
+        self.update_particles()
+    
+    def update_particles(self):
+        """Оновлення стану частинок."""
+        self.particles.update()
+    
+    def render(self, center_pos, alpha=1.0):
+        """
+        Рендеринг баклажана та всіх анімаційних ефектів.
+        Стан інтерполюється між двома останніми кроками симуляції.
+        
+        Args:
+            center_pos: Позиція центра баклажана
+            alpha: Частка кроку симуляції від 0 (попередній стан) до 1 (поточний)
+        
+        Returns:
+            Список прямокутників, які були перемальовані
+        """
+        # Малювання баклажана з інтерпольованим масштабом
+        scale = self.interpolated_scale(alpha)
+        scaled_image = self.get_scaled_image(scale)
+        scaled_rect = scaled_image.get_rect()
+        scaled_rect.center = center_pos
+        self.screen.blit(scaled_image, scaled_rect)
+        
+        # Оновлюємо прямокутник і маску баклажана для коректного визначення натискань
+        self.eggplant_rect = scaled_rect
+        self.eggplant_mask = self.get_scaled_mask(scale)
+        
+        dirty_rects = [scaled_rect]
+        
+        # Малювання частинок
+        dirty_rects += self.render_particles(alpha)
+        
+        # Малювання плаваючих текстів
+        dirty_rects += self.render_floating_texts(alpha)
+        return dirty_rects
+    
+    def get_render_rects(self, center_pos, alpha=1.0):
+        """
+        Прямокутники, які займе render з тими самими аргументами, без малювання.
+        Дозволяють ще до очищення екрану визначити, які елементи інтерфейсу
+        перекриє анімація в цьому кадрі.
+        
+        Args:
+            center_pos: Позиція центра баклажана
+            alpha: Частка кроку симуляції від 0 (попередній стан) до 1 (поточний)
+        
+        Returns:
+            Список прямокутників
+        """
+        eggplant_rect = self.get_scaled_image(self.interpolated_scale(alpha)).get_rect()
+        eggplant_rect.center = center_pos
+        rects = [eggplant_rect]
+        if self.particles.count > 0:
+            rects.append(self.get_particle_bounds(self.particles.interpolated_positions(alpha)))
+        for text in self.floating_texts:
+            rects.append(pygame.Rect(self.get_floating_text_position(text, alpha), text["surface"].get_size()))
+        return rects
+    
+    def interpolated_scale(self, alpha):
+        """
+        Масштаб баклажана між двома останніми кроками симуляції.
+        
+        Args:
+            alpha: Частка кроку симуляції від 0 (попередній стан) до 1 (поточний)
+        
+        Returns:
+            Масштаб
+        """
+        return self.previous_click_scale + (self.click_scale - self.previous_click_scale) * alpha
+    
+    def get_particle_bounds(self, positions):
+        """
+        Спільна межа всіх частинок замість тисяч окремих прямокутників.
+        
+        Args:
+            positions: Масив позицій живих частинок
+        
+        Returns:
+            Прямокутник, що охоплює всі частинки
+        """
+        left, top = np.floor(positions.min(axis=0)).tolist()
+        right, bottom = np.ceil(positions.max(axis=0)).tolist()
+        return pygame.Rect(left, top, right - left + PARTICLE_MAX_SIZE, bottom - top + PARTICLE_MAX_SIZE)
+    
+    def get_floating_text_position(self, text, alpha):
+        """
+        Позиція плаваючого тексту між двома останніми кроками симуляції.
+        
+        Args:
+            text: Словник плаваючого тексту
+            alpha: Частка кроку симуляції від 0 (попередній стан) до 1 (поточний)
+        
+        Returns:
+            Кортеж (x, y)
+        """
+        x, y = text["pos"]
+        return x, text["previous_y"] + (y - text["previous_y"]) * alpha
+    
+    def render_particles(self, alpha=1.0):
+        """
+        Рендеринг частинок одним пакетним викликом.
+        
+        Args:
+            alpha: Частка кроку симуляції для інтерполяції позицій
+        
+        Returns:
+            Список з одним прямокутником, що охоплює всі частинки
+        """
+        particles = self.particles
+        count = particles.count
+        if count == 0:
+            return []
+        
+        # Рівень прозорості залежить від часу життя (округлення вгору,
+        # щоб жива частинка ніколи не ставала повністю прозорою)
+        levels = PARTICLE_ALPHA_LEVELS
+        alpha_levels = np.minimum(
+            (particles.lifetimes[:count] * (levels - 1) + PARTICLE_MAX_LIFETIME - 1) // PARTICLE_MAX_LIFETIME,
+            levels - 1)
+        
+        # При зниженій якості використовуємо лише частину рівнів прозорості
+        alpha_step = (levels - 1) // (self.alpha_levels - 1)
+        if alpha_step > 1:
+            alpha_levels = (alpha_levels + alpha_step - 1) // alpha_step * alpha_step
+        
+        # Індекси готових спрайтів у таблиці
+        sizes = particles.sizes[:count].astype(np.int32) - PARTICLE_MIN_SIZE
+        indices = (sizes * len(PARTICLE_COLORS) + particles.colors[:count]) * levels + alpha_levels
+        
+        # Інтерпольовані позиції між двома кроками симуляції
+        positions = particles.interpolated_positions(alpha)
+        
+        sprites = self.particle_sprites
+        blit_sequence = [
+            (sprites[index], pos)
+            for index, pos in zip(indices.tolist(), positions.tolist())
+        ]
+        
+        # pygame-ce має швидший fblits, у звичайному pygame використовуємо blits
+        fblits = getattr(self.screen, "fblits", None)
+        if fblits is not None:
+            fblits(blit_sequence)
+        else:
+            self.screen.blits(blit_sequence, doreturn=False)
+        
+        return [self.get_particle_bounds(positions)]
+    
+    def render_floating_texts(self, alpha=1.0):
+        """
+        Рендеринг плаваючих текстів.
+        
+        Args:
+            alpha: Частка кроку симуляції для інтерполяції позицій
+        
+        Returns:
+            Список перемальованих прямокутників
+        """
+        dirty_rects = []
+        for text in self.floating_texts:
+            # Поверхня належить лише цьому тексту, тому змінюємо прозорість без копії
+            text_surface = text["surface"]
+            text_surface.set_alpha(text["alpha"])
+            
+            # Малюємо текст
+            dirty_rects.append(self.screen.blit(text_surface, self.get_floating_text_position(text, alpha)))
+        return dirty_rects
\ No newline at end of file
@@ -0,0 +1,167 @@
+import os
+import mmap
+import struct
+import hashlib
+import pygame
+from src.constants import *
+from src.persistence import atomic_write
+
+# Заголовок файлу кешу: сигнатура, версія формату, SHA-256 вихідного PNG,
+# крок квантування масштабу, кількість записів
+SPRITE_CACHE_MAGIC = b"EGBK"
+SPRITE_CACHE_VERSION = 1
+SPRITE_CACHE_HEADER = struct.Struct("<4sH32sdI")
+# Запис: квантований масштаб, ширина вікна, висота вікна, ширина та висота зображення
+SPRITE_CACHE_ENTRY = struct.Struct("<IIIII")
+
+# Функція перетворення поверхні в байти (tostring у старих версіях pygame)
+surface_to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+def scale_sprite(image, factor):
+    """
+    Масштабує зображення з плавною інтерполяцією.
+    
+    Args:
+        image: Вихідне зображення
+        factor: Коефіцієнт масштабу
+    
+    Returns:
+        Змасштабоване зображення
+    """
+    return pygame.transform.smoothscale(image, (
+        max(1, int(image.get_width() * factor)),
+        max(1, int(image.get_height() * factor))))
+
+def sprite_scale_keys():
+    """
+    Отримує набір ключів кешу масштабів, які запікаються на диск:
+    усі квантовані масштаби анімації кліку при розмірі вікна за замовчуванням.
+    
+    Returns:
+        Список ключів (квантований масштаб, ширина вікна, висота вікна)
+    """
+    first = int(round(1.0 / SPRITE_SCALE_STEP))
+    last = int(round(CLICK_ANIMATION_SCALE / SPRITE_SCALE_STEP))
+    return [(step, SCREEN_WIDTH, SCREEN_HEIGHT) for step in range(first, last + 1)]
+
+def read_sprite_cache(cache_path, source_hash, keys):
+    """
+    Читає запечені зображення з файлу кешу через відображення в пам'ять.
+    
+    Args:
+        cache_path: Шлях до файлу кешу
+        source_hash: SHA-256 вихідного PNG
+        keys: Очікуваний набір ключів масштабів
+    
+    Returns:
+        Кортеж (вихідне зображення, словник {ключ: зображення}) або None,
+        якщо кешу немає або він застарів
+    """
+    try:
+        with open(cache_path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return parse_sprite_cache(mapped, source_hash, keys)
+    except (IOError, OSError, ValueError, struct.error, pygame.error):
+        return None
+
+def parse_sprite_cache(buffer, source_hash, keys):
+    """
+    Розбирає вміст файлу кешу.
+    Поверхні створюються через frombuffer поверх відображеного файлу
+    і одразу перетворюються у формат екрану, тому після повернення
+    буфер можна закрити.
+    
+    Args:
+        buffer: Вміст файлу (mmap або bytes)
+        source_hash: SHA-256 вихідного PNG
+        keys: Очікуваний набір ключів масштабів
+    
+    Returns:
+        Кортеж (вихідне зображення, словник {ключ: зображення}) або None
+    """
+    magic, version, cached_hash, scale_step, count = SPRITE_CACHE_HEADER.unpack_from(buffer)
+    if (magic != SPRITE_CACHE_MAGIC or version != SPRITE_CACHE_VERSION
+            or cached_hash != source_hash or scale_step != SPRITE_SCALE_STEP):
+        return None
+    
+    offset = SPRITE_CACHE_HEADER.size
+    entries = []
+    for _ in range(count):
+        entries.append(SPRITE_CACHE_ENTRY.unpack_from(buffer, offset))
+        offset += SPRITE_CACHE_ENTRY.size
+    # Перший запис — вихідне зображення (ключ з нульовим масштабом)
+    if [entry[:3] for entry in entries[1:]] != keys:
+        return None
+    
+    view = memoryview(buffer)
+    try:
+        source = None
+        images = {}
+        for step, window_width, window_height, width, height in entries:
+            size = width * height * 4
+            if offset + size > len(buffer):
+                return None
+            surface = pygame.image.frombuffer(view[offset:offset + size], (width, height), "RGBA").convert_alpha()
+            offset += size
+            if source is None:
+                source = surface
+            else:
+                images[(step, window_width, window_height)] = surface
+        return source, images
+    finally:
+        view.release()
+
+def write_sprite_cache(cache_path, source_hash, source, images):
+    """
+    Записує вихідне та змасштабовані зображення у файл кешу.
+    
+    Args:
+        cache_path: Шлях до файлу кешу
+        source_hash: SHA-256 вихідного PNG
+        source: Вихідне зображення
+        images: Словник {ключ: зображення}
+    """
+    surfaces = [((0, 0, 0), source)] + list(images.items())
+    parts = [SPRITE_CACHE_HEADER.pack(
+        SPRITE_CACHE_MAGIC, SPRITE_CACHE_VERSION, source_hash, SPRITE_SCALE_STEP, len(surfaces))]
+    for key, surface in surfaces:
+        parts.append(SPRITE_CACHE_ENTRY.pack(*key, surface.get_width(), surface.get_height()))
+    for key, surface in surfaces:
+        parts.append(surface_to_bytes(surface, "RGBA"))
+    
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    atomic_write(cache_path, b"".join(parts))
+
+def load_sprite(source_path, cache_path):
+    """
+    Завантажує спрайт та його запечені масштаби.
+    Якщо кеш на диску відповідає вихідному PNG, декодування та
+    масштабування пропускаються; інакше PNG декодується, масштаби
+    створюються заново і кеш перезаписується.
+    
+    Args:
+        source_path: Шлях до PNG-файлу
+        cache_path: Шлях до файлу кешу
+    
+    Returns:
+        Кортеж (вихідне зображення, словник {ключ масштабу: зображення})
+    
+    Raises:
+        pygame.error: Якщо PNG не вдалося завантажити
+        IOError: Якщо PNG не вдалося прочитати
+    """
+    with open(source_path, "rb") as file:
+        source_hash = hashlib.sha256(file.read()).digest()
+    keys = sprite_scale_keys()
+    
+    cached = read_sprite_cache(cache_path, source_hash, keys)
+    if cached is not None:
+        return cached
+    
+    source = pygame.image.load(source_path).convert_alpha()
+    images = {key: scale_sprite(source, key[0] * SPRITE_SCALE_STEP) for key in keys}
+    try:
+        write_sprite_cache(cache_path, source_hash, source, images)
+    except (IOError, OSError) as e:
+        print(f"Не вдалося записати кеш зображень: {e}")
+    return source, images
@@ -0,0 +1,202 @@
+"""
+Безголовий бенчмарк гри з баклажаном.
+Запускає Game з фіктивним відеодрайвером SDL, подає синтетичні потоки
+кліків і виводить статистику часу кадрів у форматі JSON.
+"""
+
+import os
+import json
+import time
+import argparse
+import tracemalloc
+
+def percentile(values, fraction):
+    """
+    Обчислює перцентиль відсортованого списку (найближчий ранг).
+    
+    Args:
+        values: Відсортований список значень
+        fraction: Частка від 0 до 1
+    
+    Returns:
+        Значення перцентиля
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+def summarize(values):
+    """
+    Зводить вибірку до середнього, p50, p95, p99 та максимуму.
+    
+    Args:
+        values: Список значень
+    
+    Returns:
+        Словник зі статистикою
+    """
+    ordered = sorted(values)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 0.50),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else 0.0
+    }
+
+def post_clicks(pygame, game, count, click_index):
+    """
+    Додає у чергу подій синтетичні кліки по баклажану.
+    Кліки чергуються між лівою та правою кнопками.
+    
+    Args:
+        pygame: Модуль pygame
+        game: Об'єкт гри
+        count: Кількість кліків
+        click_index: Порядковий номер першого кліку
+    """
+    for i in range(count):
+        button = 1 if (click_index + i) % 2 == 0 else 3
+        pygame.event.post(pygame.event.Event(
+            pygame.MOUSEBUTTONDOWN, button=button, pos=game.eggplant_rect.center))
+
+def run_scenario(width, height, clicks_per_second, frames, warmup, trace_allocations, adaptive):
+    """
+    Запускає один сценарій бенчмарку.
+    
+    Args:
+        width: Ширина вікна
+        height: Висота вікна
+        clicks_per_second: Частота синтетичних кліків
+        frames: Кількість вимірюваних кадрів
+        warmup: Кількість кадрів прогріву (не враховуються)
+        trace_allocations: Чи відстежувати виділення пам'яті через tracemalloc
+        adaptive: Чи вмикати регулятор якості
+    
+    Returns:
+        Словник з результатами сценарію
+    """
+    import pygame
+    from src.constants import FPS
+    from src.game import Game
+    
+    game = Game(width, height, persist_progress=False)
+    
+    frame_times = []
+    allocated_bytes = []
+    peak_particles = 0
+    clicks_posted = 0
+    clicks_due = 0.0
+    
+    # reset_peak з'явився лише в Python 3.9; без нього вимірюється приріст
+    # пам'яті за кадр, а не пік, тому тимчасові виділення не враховуються
+    measure_peak = hasattr(tracemalloc, "reset_peak")
+    if trace_allocations:
+        tracemalloc.start()
+    
+    for frame_index in range(warmup + frames):
+        # Кліки розподіляються за модельним часом, а не за реальним,
+        # щоб навантаження не залежало від швидкості машини
+        clicks_due += clicks_per_second / FPS
+        click_count = int(clicks_due) - clicks_posted
+        post_clicks(pygame, game, click_count, clicks_posted)
+        clicks_posted += click_count
+        
+        if trace_allocations:
+            if measure_peak:
+                tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        
+        start = time.perf_counter()
+        game.frame()
+        elapsed = time.perf_counter() - start
+        if adaptive:
+            game.update_quality(elapsed * 1000)
+        
+        if frame_index < warmup:
+            continue
+        
+        frame_times.append(elapsed * 1000)
+        if trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated_bytes.append((peak if measure_peak else current) - memory_before)
+        peak_particles = max(peak_particles, len(game.animation.particles))
+    
+    if trace_allocations:
+        tracemalloc.stop()
+    
+    result = {
+        "width": width,
+        "height": height,
+        "clicks_per_second": clicks_per_second,
+        "frames": frames,
+        "frame_time_ms": summarize(frame_times),
+        "allocated_bytes_per_frame": summarize(allocated_bytes) if trace_allocations else None,
+        "phase_ms": game.profiler.get_summary(),
+        "peak_particles": peak_particles,
+        "quality_level": game.quality.level,
+        "total_clicks": game.left_clicks + game.right_clicks,
+        "text_cache": game.text_cache.get_stats()
+    }
+    pygame.quit()
+    return result
+
+def parse_size(value):
+    """
+    Розбирає розмір вікна у форматі ШИРИНАxВИСОТА.
+    
+    Args:
+        value: Рядок розміру
+    
+    Returns:
+        Кортеж (ширина, висота)
+    """
+    try:
+        width, height = value.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Невірний розмір вікна: {value}")
+
+def main(argv=None):
+    """
+    Точка входу бенчмарку.
+    
+    Args:
+        argv: Аргументи командного рядка
+    """
+    parser = argparse.ArgumentParser(description="Безголовий бенчмарк гри з баклажаном")
+    parser.add_argument("--cps", type=float, action="append", dest="clicks_per_second",
+                        help="Кліків на секунду (можна вказати кілька разів)")
+    parser.add_argument("--size", type=parse_size, action="append", dest="sizes",
+                        help="Розмір вікна ШИРИНАxВИСОТА (можна вказати кілька разів)")
+    parser.add_argument("--frames", type=int, default=600, help="Кількість вимірюваних кадрів")
+    parser.add_argument("--warmup", type=int, default=60, help="Кількість кадрів прогріву")
+    parser.add_argument("--allocations", action="store_true",
+                        help="Вимірювати виділення пам'яті через tracemalloc (сповільнює кадри; "
+                             "до Python 3.9 — лише приріст пам'яті за кадр без тимчасових виділень)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Вмикати регулятор якості, як у звичайному ігровому циклі")
+    parser.add_argument("--output", help="Файл для результатів (за замовчуванням stdout)")
+    args = parser.parse_args(argv)
+    
+    # Фіктивні драйвери дозволяють запускати гру без вікна та звуку
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    
+    scenarios = []
+    for width, height in args.sizes or [(800, 600)]:
+        for clicks_per_second in args.clicks_per_second or [10.0]:
+            scenarios.append(run_scenario(
+                width, height, clicks_per_second, args.frames, args.warmup, args.allocations, args.adaptive))
+    
+    report = json.dumps({"scenarios": scenarios}, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import numpy as np
+import pygame
+from src.constants import *
+
+class ClickRateMeter:
+    """
+    Лічильник кліків за секунду в ковзному вікні.
+    Моменти кліків зберігаються в кільцевому буфері фіксованого розміру,
+    тому і запис, і підрахунок мають сталу вартість незалежно від кількості
+    кліків. Якщо за вікно кліків більше, ніж місць у буфері, показник
+    упирається в capacity / window.
+    """
+    def __init__(self, capacity=CPS_BUFFER_SIZE, window=CPS_WINDOW):
+        """
+        Ініціалізація лічильника.
+        
+        Args:
+            capacity: Кількість моментів кліків у кільцевому буфері
+            window: Тривалість ковзного вікна в секундах
+        """
+        self.capacity = capacity
+        self.window = window
+        # Порожні місця позначені -inf, тому ніколи не потрапляють у вікно
+        self.timestamps = np.full(capacity, -np.inf, dtype=np.float64)
+        self.head = 0
+        self.offsets = np.arange(capacity)
+    
+    def record(self, timestamp, count=1):
+        """
+        Записує кліки, що сталися в один момент.
+        
+        Args:
+            timestamp: Момент кліків у секундах
+            count: Кількість кліків
+        """
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+        indices = (self.head + self.offsets[:count]) % self.capacity
+        self.timestamps[indices] = timestamp
+        self.head = (self.head + count) % self.capacity
+    
+    def get_rate(self, now):
+        """
+        Обчислює кількість кліків за секунду у вікні, що закінчується в момент now.
+        
+        Args:
+            now: Поточний момент у секундах
+        
+        Returns:
+            Кліків за секунду
+        """
+        return np.count_nonzero(self.timestamps > now - self.window) / self.window
+    
+    def reset(self):
+        """Очищає буфер."""
+        self.timestamps.fill(-np.inf)
+        self.head = 0
+
+class ClickHeatmap:
+    """
+    Теплова карта позицій кліків.
+    Кліки накопичуються в масиві NumPy, що покриває вікно клітинками
+    HEATMAP_CELL_SIZE пікселів; згасання та перетворення в кольори виконуються
+    векторно над усім масивом. Поверхня оновлюється через pygame.surfarray
+    лише тоді, коли масив змінився і карту видно.
+    """
+    def __init__(self, width, height):
+        """
+        Ініціалізація теплової карти.
+        
+        Args:
+            width: Ширина вікна
+            height: Висота вікна
+        """
+        self.visible = False
+        
+        # Пляма одного кліку: гаусове ядро з піком 1
+        radius = HEATMAP_CLICK_RADIUS
+        offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+        distances = offsets[:, None] ** 2 + offsets[None, :] ** 2
+        self.kernel = np.exp(-distances / (2 * (radius / 2) ** 2)).astype(np.float32)
+        
+        # Таблиця кольорів: від синього через зелений і жовтий до червоного
+        levels = np.linspace(0.0, 1.0, 256)
+        self.colormap = np.stack([
+            np.clip(levels * 3 - 1, 0, 1),
+            np.clip(1.5 - np.abs(levels * 3 - 1.5), 0, 1),
+            np.clip(2 - levels * 3, 0, 1)
+        ], axis=1)
+        self.colormap = (self.colormap * 255).astype(np.uint8)
+        self.alphas = (np.sqrt(levels) * HEATMAP_ALPHA).astype(np.uint8)
+        
+        self.resize(width, height)
+    
+    def resize(self, width, height):
+        """
+        Створює масив під новий розмір вікна.
+        Накопичені кліки відкидаються, бо баклажан переміщується.
+        
+        Args:
+            width: Ширина вікна
+            height: Висота вікна
+        """
+        self.width = width
+        self.height = height
+        # Масив у порядку (x, y), як у pygame.surfarray
+        self.grid = np.zeros(
+            (max(1, -(-width // HEATMAP_CELL_SIZE)), max(1, -(-height // HEATMAP_CELL_SIZE))),
+            dtype=np.float32)
+        self.cells_surface = pygame.Surface(self.grid.shape, pygame.SRCALPHA)
+        self.surface = None
+        self.active = False  # Чи є в масиві ненульові значення
+        self.changed = True
+        self.steps_since_decay = 0
+    
+    def add_click(self, pos):
+        """
+        Додає пляму кліку в масив.
+        
+        Args:
+            pos: Позиція кліку у вікні
+        """
+        radius = HEATMAP_CLICK_RADIUS
+        cx = int(pos[0]) // HEATMAP_CELL_SIZE
+        cy = int(pos[1]) // HEATMAP_CELL_SIZE
+        grid_w, grid_h = self.grid.shape
+        
+        # Частина ядра, що потрапляє в межі масиву
+        x0, x1 = max(0, cx - radius), min(grid_w, cx + radius + 1)
+        y0, y1 = max(0, cy - radius), min(grid_h, cy + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.grid[x0:x1, y0:y1] += self.kernel[
+            x0 - cx + radius:x1 - cx + radius, y0 - cy + radius:y1 - cy + radius]
+        self.active = True
+        self.changed = True
+    
+    def update(self, steps=1):
+        """
+        Згасання раз на HEATMAP_DECAY_INTERVAL кроків симуляції.
+        Кілька пропущених згасань застосовуються одним множенням.
+        Коли карта згасла повністю, масив обнуляється і більше не змінюється.
+        
+        Args:
+            steps: Кількість кроків симуляції, що минули
+        """
+        if not self.active:
+            return
+        self.steps_since_decay += steps
+        decays = self.steps_since_decay // HEATMAP_DECAY_INTERVAL
+        if decays == 0:
+            return
+        self.steps_since_decay %= HEATMAP_DECAY_INTERVAL
+        # Обмеження насиченням не змінює кольорів, але обмежує час згасання
+        np.minimum(self.grid, HEATMAP_SATURATION, out=self.grid)
+        self.grid *= HEATMAP_DECAY ** decays
+        if self.grid.max() < HEATMAP_CUTOFF:
+            self.grid.fill(0.0)
+            self.active = False
+        self.changed = True
+    
+    def toggle(self):
+        """Показує або приховує теплову карту."""
+        self.visible = not self.visible
+    
+    def update_surface(self):
+        """Перетворює масив у кольори та передає їх у поверхню через surfarray."""
+        levels = (np.minimum(self.grid * (1.0 / HEATMAP_SATURATION), 1.0) * 255).astype(np.uint8)
+        pygame.surfarray.blit_array(self.cells_surface, self.colormap[levels])
+        alpha = pygame.surfarray.pixels_alpha(self.cells_surface)
+        alpha[...] = self.alphas[levels]
+        del alpha  # Звільняємо блокування поверхні
+        self.surface = pygame.transform.smoothscale(
+            self.cells_surface, (self.grid.shape[0] * HEATMAP_CELL_SIZE, self.grid.shape[1] * HEATMAP_CELL_SIZE))
+        self.changed = False
+    
+    def render(self, screen):
+        """
+        Малює теплову карту поверх гри.
+        
+        Args:
+            screen: Поверхня для рендерингу
+        
+        Returns:
+            Список перемальованих прямокутників
+        """
+        if not self.visible:
+            return []
+        if self.changed or self.surface is None:
+            self.update_surface()
+        return [screen.blit(self.surface, (0, 0))]
@@ -1,88 +1,136 @@
-"""
-Константи для гри з баклажаном.
-Усі "магічні числа" та фіксовані значення винесені сюди.
-"""
-
-# Розміри екрану за замовчуванням
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-
-# Кольори (RGB)
-BACKGROUND_COLOR = (230, 230, 250)  # Світло-лавандовий
-TEXT_COLOR = (0, 0, 0)  # Чорний
-TEXT_ANIMATION_COLOR = (255, 255, 255)  # Білий
-EGGPLANT_COLOR = (138, 43, 226)  # Фіолетовий (для заглушки)
-PROGRESS_BAR_BG_COLOR = (200, 200, 200)  # Світло-сірий
-PROGRESS_BAR_FILL_COLOR = (100, 100, 255)  # Синій
-ACHIEVEMENT_COLOR = (255, 215, 0)  # Золотистий
-PARTICLE_COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]  # Різні яскраві кольори
-BUTTON_COLOR = (100, 100, 255)  # Колір кнопок
-BUTTON_HOVER_COLOR = (80, 80, 200)  # Колір кнопок при наведенні
-BUTTON_TEXT_COLOR = (255, 255, 255)  # Колір тексту на кнопках
-ACHIEVEMENTS_BG_COLOR = (50, 50, 70, 200)  # Колір фону списку досягнень з прозорістю
-
-# Налаштування анімації
-FPS = 60  # Кадрів в секунду
-CLICK_ANIMATION_SCALE = 1.2  # Максимальний масштаб при кліку
-CLICK_ANIMATION_DURATION = 10  # Тривалість анімації кліку в кадрах
-TEXT_ANIMATION_DURATION = 30  # Тривалість анімації тексту в кадрах
-TEXT_FADE_SPEED = 15  # Швидкість зникнення тексту
-PARTICLE_COUNT = 13  # Кількість частинок при кліку
-PARTICLE_MAX_SIZE = 7  # Максимальний розмір частинок
-PARTICLE_MIN_SIZE = 3  # Мінімальний розмір частинок
-PARTICLE_GRAVITY = 0.1  # Симуляція гравітації для частинок
-
-# Налаштування інтерфейсу
-FONT_SIZE = 24  # Розмір шрифту за замовчуванням
-LARGE_FONT_SIZE = 36  # Розмір великого шрифту
-SMALL_FONT_SIZE = 18  # Розмір малого шрифту
-ACHIEVEMENT_DISPLAY_TIME = 180  # Час відображення досягнення (в кадрах)
-PROGRESS_BAR_WIDTH = 200  # Ширина прогрес-бару
-PROGRESS_BAR_HEIGHT = 20  # Висота прогрес-бару
-BUTTON_WIDTH = 150  # Ширина кнопок
-BUTTON_HEIGHT = 40  # Висота кнопок
-ACHIEVEMENT_LIST_PADDING = 10  # Відступи в списку досягнень
-
-# Досягнення
-ACHIEVEMENTS = [
-    {"name": "Ласкаво просимо до гри", "threshold": 10, "achieved": False},
-    {"name": "Початківець", "threshold": 50, "achieved": False},
-    {"name": "Ентузіаст", "threshold": 100, "achieved": False},
-    {"name": "Досвідчений", "threshold": 500, "achieved": False},
-    {"name": "Баклажанний майстер", "threshold": 1000, "achieved": False},
-    {"name": "Баклажанний гуру", "threshold": 2000, "achieved": False},
-    {"name": "Баклажанний бог", "threshold": 5000, "achieved": False},
-    {"name": "Надлюдський рефлекс", "threshold": 10000, "achieved": False},
-    {"name": "Нескінченний баклажан", "threshold": 50000, "achieved": False},
-    {"name": "Клік-король", "threshold": 100000, "achieved": False},
-    {"name": "Легенда баклажанів", "threshold": 1000000, "achieved": False}
-]
-
-# Переклади (залишаємо тільки українську мову)
-TRANSLATIONS = {
-    "uk": {  # Українська
-        "left_clicks": "Ліві кліки",
-        "right_clicks": "Праві кліки",
-        "total": "Всього",
-        "help_text": "Клікай на баклажан лівою або правою кнопкою миші!",
-        "achievement_unlocked": "Досягнення отримано",
-        "achievements_button": "Досягнення",
-        "close_button": "Закрити",
-        "achievements_title": "Отримані досягнення",
-        "no_achievements": "Досягнень поки немає. Продовжуйте клікати!",
-        "locked_achievement": "??? (доступно на {})",
-        "achievements": [
-            {"name": "Ласкаво просимо до гри", "threshold": 10},
-            {"name": "Початківець", "threshold": 50},
-            {"name": "Ентузіаст", "threshold": 100},
-            {"name": "Досвідчений", "threshold": 500},
-            {"name": "Баклажанний майстер", "threshold": 1000},
-            {"name": "Баклажанний гуру", "threshold": 2000},
-            {"name": "Баклажанний бог", "threshold": 5000},
-            {"name": "Надлюдський рефлекс", "threshold": 10000},
-            {"name": "Нескінченний баклажан", "threshold": 50000},
-            {"name": "Клік-король", "threshold": 100000},
-            {"name": "Легенда баклажанів", "threshold": 1000000}
-        ]
-    }
-}
\ No newline at end of file
+"""
+Константи для гри з баклажаном.
+Усі "магічні числа" та фіксовані значення винесені сюди.
+"""
+
+# Розміри екрану за замовчуванням
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+
+# Кольори (RGB)
+BACKGROUND_COLOR = (230, 230, 250)  # Світло-лавандовий
+TEXT_COLOR = (0, 0, 0)  # Чорний
+TEXT_ANIMATION_COLOR = (255, 255, 255)  # Білий
+EGGPLANT_COLOR = (138, 43, 226)  # Фіолетовий (для заглушки)
+PROGRESS_BAR_BG_COLOR = (200, 200, 200)  # Світло-сірий
+PROGRESS_BAR_FILL_COLOR = (100, 100, 255)  # Синій
+ACHIEVEMENT_COLOR = (255, 215, 0)  # Золотистий
+PARTICLE_COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]  # Різні яскраві кольори
+BUTTON_COLOR = (100, 100, 255)  # Колір кнопок
+BUTTON_HOVER_COLOR = (80, 80, 200)  # Колір кнопок при наведенні
+BUTTON_TEXT_COLOR = (255, 255, 255)  # Колір тексту на кнопках
+ACHIEVEMENTS_BG_COLOR = (50, 50, 70, 200)  # Колір фону списку досягнень з прозорістю
+
+# Налаштування анімації
+FPS = 60  # Кадрів в секунду
+SIMULATION_STEP = 1 / 60  # Фіксований крок симуляції в секундах (усі тривалості в "кадрах" рахуються в цих кроках)
+MAX_SIMULATION_STEPS = 5  # Максимальна кількість кроків симуляції за один кадр
+PACER_SPIN_MARGIN = 0.002  # Останні секунди перед початком кадру, які очікуються активно
+PACER_HISTORY = 240  # Кількість кадрів у буфері статистики обмежувача кадрів
+IDLE_MODE = True  # Коли нічого не анімується, чекати на введення замість малювання кадрів
+IDLE_WAIT_TIMEOUT = 1.0  # Максимальне очікування введення в режимі простою, секунди (для автозбереження)
+CLICK_ANIMATION_SCALE = 1.2  # Максимальний масштаб при кліку
+CLICK_ANIMATION_DURATION = 10  # Тривалість анімації кліку в кадрах
+TEXT_ANIMATION_DURATION = 30  # Тривалість анімації тексту в кадрах
+TEXT_FADE_SPEED = 15  # Швидкість зникнення тексту
+PARTICLE_COUNT = 13  # Кількість частинок при кліку
+PARTICLE_BURST_LIMIT = 130  # Максимальна кількість частинок від усіх кліків за один кадр
+PARTICLE_MAX_SIZE = 7  # Максимальний розмір частинок
+PARTICLE_MIN_SIZE = 3  # Мінімальний розмір частинок
+PARTICLE_GRAVITY = 0.1  # Симуляція гравітації для частинок
+PARTICLE_MIN_SPEED = 2  # Мінімальна початкова швидкість частинок
+PARTICLE_MAX_SPEED = 5  # Максимальна початкова швидкість частинок
+PARTICLE_MIN_LIFETIME = 20  # Мінімальна тривалість життя частинок в кадрах
+PARTICLE_MAX_LIFETIME = 40  # Максимальна тривалість життя частинок в кадрах
+PARTICLE_CAPACITY = 50000  # Максимальна кількість одночасно живих частинок
+PARTICLE_ALPHA_LEVELS = 16  # Кількість рівнів прозорості в таблиці спрайтів частинок
+
+# Налаштування рендерингу
+DIRTY_RECT_RENDERING = False  # Перемальовувати лише змінені ділянки екрану замість усього кадру
+TEXT_CACHE_SIZE = 256  # Максимальна кількість текстових поверхонь у кеші
+THOUSANDS_SEPARATOR = " "  # Роздільник груп розрядів у числах
+SPRITE_SCALE_STEP = 0.02  # Крок квантування масштабу баклажана в кеші
+SPRITE_CACHE_BUDGET = 64 * 1024 * 1024  # Ліміт пам'яті кешу масштабованих зображень, байти
+ASSET_CACHE_DIR = "cache"  # Каталог запечених зображень (відносно кореня гри)
+
+# Адаптивна якість: рівні від найвищого до найнижчого.
+# Кожен наступний рівень знижує ще один параметр: кількість частинок на клік,
+# ліміт частинок, кількість одночасних плаваючих текстів, кількість рівнів прозорості.
+QUALITY_LEVELS = [
+    {"particle_count": PARTICLE_COUNT, "particle_limit": PARTICLE_CAPACITY, "floating_text_limit": None, "alpha_levels": PARTICLE_ALPHA_LEVELS},
+    {"particle_count": 6, "particle_limit": PARTICLE_CAPACITY, "floating_text_limit": None, "alpha_levels": PARTICLE_ALPHA_LEVELS},
+    {"particle_count": 6, "particle_limit": 3000, "floating_text_limit": None, "alpha_levels": PARTICLE_ALPHA_LEVELS},
+    {"particle_count": 6, "particle_limit": 3000, "floating_text_limit": 5, "alpha_levels": PARTICLE_ALPHA_LEVELS},
+    {"particle_count": 3, "particle_limit": 1000, "floating_text_limit": 3, "alpha_levels": 4}
+]
+QUALITY_WINDOW = 30  # Кількість кадрів, за якими оцінюється навантаження
+QUALITY_DOWNGRADE_RATIO = 0.9  # Знижувати якість, якщо середній кадр довший за цю частку бюджету
+QUALITY_UPGRADE_RATIO = 0.5  # Підвищувати якість, якщо середній кадр коротший за цю частку бюджету
+
+# Запуск гри
+STARTUP_REPORT = True  # Виводити тривалість етапів запуску після першого кадру
+
+# Збереження прогресу
+SAVE_FILE = "save_data.json"  # Файл знімка прогресу у форматі JSON (відносно кореня гри)
+BINARY_SAVE_FILE = "save_data.bin"  # Файл знімка прогресу у двійковому форматі
+SAVE_BINARY = False  # Зберігати знімок у компактному двійковому форматі замість JSON
+JOURNAL_FILE = "save_data.journal"  # Журнал кліків між знімками (відносно кореня гри)
+AUTOSAVE_INTERVAL = 30  # Інтервал автозбереження в секундах
+
+# Аналітика кліків
+ANALYTICS_ENABLED = True  # Записувати кожен клік у базу аналітики
+ANALYTICS_FILE = "analytics.db"  # Файл бази SQLite з кліками (відносно кореня гри)
+ANALYTICS_BATCH_SIZE = 500  # Кількість кліків, після якої буфер скидається в базу
+ANALYTICS_FLUSH_INTERVAL = 2.0  # Максимальний час зберігання кліків у буфері, секунди
+ANALYTICS_HISTORY_SIZE = 20  # Кількість останніх сесій у статистиці
+
+# Налаштування профайлера
+PROFILER_HISTORY = 240  # Кількість кадрів у кільцевому буфері профайлера
+PROFILER_OVERLAY_REFRESH = 30  # Як часто оновлювати накладку профайлера (в кадрах)
+SLOW_FRAME_THRESHOLD_MS = 33.3  # Кадр, довший за цей поріг, вважається повільним
+PROFILER_CAPTURE_SLOW_FRAMES = False  # Записувати cProfile-знімки повільних кадрів
+PROFILER_CAPTURE_DIR = "profiles"  # Папка для знімків повільних кадрів (відносно кореня гри)
+PROFILER_MAX_CAPTURES = 20  # Максимальна кількість знімків за сесію
+
+# Сервер спільного лічильника
+SERVER_HOST = "127.0.0.1"  # Адреса сервера (0.0.0.0 — доступ з локальної мережі)
+SERVER_PORT = 8765  # Порт сервера
+SERVER_SNAPSHOT_RATE = 10  # Частота розсилки знімків стану клієнтам, разів на секунду
+SERVER_MAX_DELTA = 10000  # Максимальний приріст кліків в одному повідомленні клієнта
+SERVER_MAX_WRITE_BUFFER = 64 * 1024  # Клієнт з більшою чергою на запис пропускає знімки
+CLIENT_TICK_RATE = 10  # Частота надсилання приростів кліків клієнтом, разів на секунду
+LEADERBOARD_SIZE = 10  # Кількість гравців у таблиці лідерів
+
+# Налаштування інтерфейсу
+FONT_SIZE = 24  # Розмір шрифту за замовчуванням
+LARGE_FONT_SIZE = 36  # Розмір великого шрифту
+SMALL_FONT_SIZE = 18  # Розмір малого шрифту
+ACHIEVEMENT_DISPLAY_TIME = 180  # Час відображення досягнення (в кадрах)
+PROGRESS_BAR_WIDTH = 200  # Ширина прогрес-бару
+PROGRESS_BAR_HEIGHT = 20  # Висота прогрес-бару
+BUTTON_WIDTH = 150  # Ширина кнопок
+BUTTON_HEIGHT = 40  # Висота кнопок
+ACHIEVEMENT_LIST_PADDING = 10  # Відступи в списку досягнень
+ACHIEVEMENT_ROW_HEIGHT = 30  # Висота рядка отриманого досягнення
+LOCKED_ACHIEVEMENT_ROW_HEIGHT = 25  # Висота рядка закритого досягнення
+ACHIEVEMENT_SECTION_GAP = 20  # Відступ між отриманими та закритими досягненнями
+ACHIEVEMENT_SCROLL_STEP = 40  # Прокрутка списку досягнень за один крок коліщатка, пікселі
+
+# Статистика кліків
+CPS_WINDOW = 1.0  # Ковзне вікно лічильника кліків за секунду, секунди
+CPS_BUFFER_SIZE = 1024  # Кількість моментів кліків у кільцевому буфері лічильника
+HEATMAP_CELL_SIZE = 8  # Розмір клітинки теплової карти, пікселі
+HEATMAP_CLICK_RADIUS = 3  # Радіус плями одного кліку, клітинки
+HEATMAP_SATURATION = 20.0  # Накопичене значення, що відповідає найгарячішому кольору
+HEATMAP_DECAY = 0.9  # Множник згасання теплової карти
+HEATMAP_DECAY_INTERVAL = 6  # Кількість кроків симуляції між згасаннями
+HEATMAP_CUTOFF = 0.05  # Нижче цього значення карта вважається згаслою
+HEATMAP_ALPHA = 180  # Прозорість найгарячішої точки теплової карти
+
+# Досягнення
+ACHIEVEMENTS_DATA_FILE = "assets/data/achievements.json"  # Файл з визначеннями досягнень (відносно кореня гри)
+
+# Мови
+LANGUAGE_DIR = "assets/lang"  # Каталог з файлами мов (відносно кореня гри)
+LANGUAGES = ("uk", "en")  # Доступні мови в порядку перемикання
+DEFAULT_LANGUAGE = "uk"  # Мова за замовчуванням
\ No newline at end of file
@@ -0,0 +1,31 @@
+import pygame
+
+# Спільні для всього процесу шрифти: {(файл шрифту, розмір): шрифт}
+fonts = {}
+
+def get_font(size, name=None):
+    """
+    Отримує шрифт із реєстру, завантажуючи кожну пару (файл, розмір) лише раз.
+    Усі підсистеми отримують той самий об'єкт шрифту, тому й кеш
+    текстових поверхонь спільний для них.
+    
+    Args:
+        size: Розмір шрифту
+        name: Шлях до файлу шрифту (None — вбудований шрифт pygame)
+    
+    Returns:
+        Об'єкт pygame.font.Font
+    """
+    key = (name, size)
+    font = fonts.get(key)
+    if font is None:
+        if not fonts:
+            # Після pygame.quit() шрифти стають недійсними, тому реєстр очищається
+            pygame.register_quit(clear_fonts)
+        font = pygame.font.Font(name, size)
+        fonts[key] = font
+    return font
+
+def clear_fonts():
+    """Очищає реєстр шрифтів."""
+    fonts.clear()
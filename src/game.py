@@ -1,205 +1,616 @@
-import pygame
-import sys
-import os
-import json
-from src.ui import UI
-from src.animation import AnimationSystem
-from src.constants import *
-from src.achievement import AchievementSystem
-from src.language import LanguageManager
-
-class Game:
-    """
-    Головний клас гри з баклажаном.
-    Керує станом гри, взаємодією користувача та відображенням.
-    """
-    def __init__(self):
-        """Ініціалізація гри, налаштування вікна та завантаження ресурсів."""
-        pygame.init()
-        self.width, self.height = SCREEN_WIDTH, SCREEN_HEIGHT
-        
-        # Створення вікна з можливістю зміни розміру
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
-        pygame.display.set_caption("Гра з Баклажаном")
-        
-        # Ініціалізація менеджера мови
-        self.language_manager = LanguageManager()
-        
-        # Ініціалізація ігрового стану
-        self.left_clicks = 0
-        self.right_clicks = 0
-        self.particles = []
-        self.running = True
-        self.show_achievements_panel = False
-        
-        # Встановлення видимості курсору (завжди видимий для запису екрану)
-        pygame.mouse.set_visible(True)
-        
-        # Налаштування для запису екрану
-        os.environ['SDL_VIDEO_CENTERED'] = '1'  # Центрування вікна на екрані
-        
-        # Завантаження зображення баклажана
-        self.load_resources()
-        
-        # Ініціалізація підсистем
-        self.ui = UI(self.screen, self.width, self.height, self.language_manager)
-        self.animation = AnimationSystem(self.screen, self.eggplant_image, self.eggplant_rect)
-        self.achievements = AchievementSystem(self.language_manager)
-        
-        # Завантаження збереженого прогресу
-        self.load_progress()
-        
-        # Створення таймера для стабільної частоти кадрів
-        self.clock = pygame.time.Clock()
-    
-    def load_resources(self):
-        """Завантаження зображень та інших ресурсів."""
-        try:
-            # Отримання шляху до папки з ресурсами відносно поточного файлу
-            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            eggplant_path = os.path.join(script_dir, "assets", "images", "eggplant.png")
-            
-            self.eggplant_image = pygame.image.load(eggplant_path)
-            self.eggplant_rect = self.eggplant_image.get_rect()
-            self.eggplant_rect.center = (self.width // 2, self.height // 2)
-        except pygame.error as e:
-            print(f"Не вдалося завантажити зображення баклажана: {e}")
-            # Створення заглушки - фіолетовий прямокутник
-            self.eggplant_image = pygame.Surface((100, 150))
-            self.eggplant_image.fill(EGGPLANT_COLOR)
-            self.eggplant_rect = self.eggplant_image.get_rect()
-            self.eggplant_rect.center = (self.width // 2, self.height // 2)
-    
-    def save_progress(self):
-        """Збереження прогресу гри у файл."""
-        data = {
-            "left_clicks": self.left_clicks,
-            "right_clicks": self.right_clicks,
-            "achievements": [a for a in self.achievements.achievements if a["achieved"]]
-        }
-        
-        try:
-            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            save_path = os.path.join(script_dir, "save_data.json")
-            
-            with open(save_path, "w") as file:
-                json.dump(data, file)
-                print("Прогрес збережено")
-        except (IOError, OSError) as e:
-            print(f"Не вдалося зберегти прогрес: {e}")
-    
-    def load_progress(self):
-        """Завантаження прогресу гри з файлу."""
-        try:
-            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            save_path = os.path.join(script_dir, "save_data.json")
-            
-            with open(save_path, "r") as file:
-                data = json.load(file)
-                self.left_clicks = data.get("left_clicks", 0)
-                self.right_clicks = data.get("right_clicks", 0)
-                
-                # Завантаження досягнень
-                saved_achievements = data.get("achievements", [])
-                for saved in saved_achievements:
-                    for achievement in self.achievements.achievements:
-                        if saved.get("name") == achievement["name"]:
-                            achievement["achieved"] = True
-                
-                print("Прогрес завантажено")
-        except (IOError, json.JSONDecodeError, FileNotFoundError):
-            print("Не вдалося завантажити прогрес, починаємо з нуля")
-    
-    def handle_events(self):
-        """Обробка подій введення користувача."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-                self.save_progress()
-            
-            elif event.type == pygame.VIDEORESIZE:
-                self.handle_resize(event.w, event.h)
-            
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # Перевіряємо, чи відкрито панель досягнень
-                if self.show_achievements_panel:
-                    if event.button == 1:  # Ліва кнопка миші
-                        # Перевіряємо натискання на кнопку "Закрити"
-                        if self.ui.close_button_rect.collidepoint(event.pos):
-                            self.show_achievements_panel = False
-                else:
-                    # Перевіряємо кнопки інтерфейсу
-                    if event.button == 1:  # Ліва кнопка миші
-                        if self.ui.achievements_button_rect.collidepoint(event.pos):
-                            self.show_achievements_panel = True
-                        elif self.eggplant_rect.collidepoint(event.pos):
-                            self.handle_eggplant_click(event.button)
-                    elif event.button == 3 and self.eggplant_rect.collidepoint(event.pos):  # Права кнопка миші
-                        self.handle_eggplant_click(event.button)
-    
-    def handle_eggplant_click(self, button):
-        """
-        Обробка кліку на баклажан.
-        
-        Args:
-            button: Кнопка миші (1 - ліва, 3 - права)
-        """
-        if button == 1:  # Ліва кнопка миші
-            self.left_clicks += 1
-        elif button == 3:  # Права кнопка миші
-            self.right_clicks += 1
-            
-        self.animation.start_click_animation()
-        mouse_pos = pygame.mouse.get_pos()
-        self.animation.spawn_particles(mouse_pos)
-        
-        # Перевірка досягнень після кліку
-        total_clicks = self.left_clicks + self.right_clicks
-        self.achievements.check_achievements(total_clicks)
-        
-        # Показуємо текст над баклажаном
-        self.animation.add_floating_text(f"+1 ({self.language_manager.get_text('total')}: {total_clicks})")
-    
-    def handle_resize(self, width, height):
-        """Обробляє зміну розміру вікна."""
-        self.width, self.height = width, height
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
-        self.eggplant_rect.center = (self.width // 2, self.height // 2)
-        self.ui.update_screen_size(width, height)
-    
-    def update(self):
-        """Оновлення ігрового стану."""
-        self.animation.update()
-        self.achievements.update()
-    
-    def render(self):
-        """Рендеринг всіх елементів гри."""
-        # Очищення екрану
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        # Малювання баклажана
-        self.animation.render(self.eggplant_rect.center)
-        
-        # Малювання UI
-        total_clicks = self.left_clicks + self.right_clicks
-        self.ui.render(self.left_clicks, self.right_clicks, total_clicks, self.achievements)
-        
-        # Малювання досягнень
-        self.achievements.render(self.screen)
-        
-        # Малювання панелі досягнень
-        if self.show_achievements_panel:
-            self.ui.render_achievements_panel(self.achievements.achievements, total_clicks)
-        
-        # Оновлення екрану
-        pygame.display.flip()
-    
-    def run(self):
-        """Головний цикл гри."""
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
-        
+import pygame
+import sys
+import os
+import time
+import random
+from src.ui import UI
+from src.animation import AnimationSystem
+from src.constants import *
+from src.achievement import AchievementSystem
+from src.language import LanguageManager
+from src.text_cache import TextCache
+from src.profiler import FrameProfiler
+from src.pacer import FramePacer
+from src.quality import QualityGovernor
+from src.persistence import SaveManager
+from src.analytics import ClickAnalytics
+from src.click_stats import ClickRateMeter, ClickHeatmap
+from src.save_format import migrate_save
+from src.assets import load_sprite
+from src.startup import StartupTimer
+from src.replay import InputRecorder
+
+# Типи подій, які обробляє гра; решта не потрапляє в чергу і не будить цикл
+INPUT_EVENTS = (
+    pygame.QUIT, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED, pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL
+)
+
+class Game:
+    """
+    Головний клас гри з баклажаном.
+    Керує станом гри, взаємодією користувача та відображенням.
+    """
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, persist_progress=True, startup_timer=None, seed=None):
+        """
+        Ініціалізація гри, налаштування вікна та завантаження ресурсів.
+        
+        Args:
+            width: Початкова ширина вікна
+            height: Початкова висота вікна
+            persist_progress: Чи завантажувати та зберігати прогрес у файл
+            startup_timer: Вимірювач часу запуску (за замовчуванням відлік починається тут)
+            seed: Зерно генераторів випадкових чисел (None — випадкове)
+        """
+        self.startup_timer = startup_timer if startup_timer is not None else StartupTimer()
+        
+        # Ініціалізуються лише потрібні модулі pygame (без звуку, джойстиків тощо)
+        pygame.display.init()
+        pygame.font.init()
+        self.width, self.height = width, height
+        self.persist_progress = persist_progress
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.startup_timer.mark("ініціалізація pygame")
+        
+        # Ініціалізація менеджера мови
+        self.language_manager = LanguageManager()
+        
+        # Створення вікна з можливістю зміни розміру
+        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+        pygame.display.set_caption(self.language_manager.get_text("window_title"))
+        if IDLE_MODE:
+            # Непотрібні події не повинні будити цикл у режимі простою
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(INPUT_EVENTS)
+        self.startup_timer.mark("створення вікна")
+        
+        # Ініціалізація ігрового стану
+        self.left_clicks = 0
+        self.right_clicks = 0
+        self.particles = []
+        
+        # Кліки, накопичені за поточний кадр (обробляються одним пакетом)
+        self.pending_left_clicks = 0
+        self.pending_right_clicks = 0
+        self.pending_click_pos = None
+        self.running = True
+        
+        # Подія, що розбудила гру з режиму простою (обробляється в наступному кадрі)
+        self.wake_events = []
+        self.show_achievements_panel = False
+        
+        # Режим часткового перемальовування (dirty rects)
+        self.dirty_rect_mode = DIRTY_RECT_RENDERING
+        self.previous_dirty_rects = []
+        self.full_redraw = True
+        
+        # Встановлення видимості курсору (завжди видимий для запису екрану)
+        pygame.mouse.set_visible(True)
+        
+        # Налаштування для запису екрану
+        os.environ['SDL_VIDEO_CENTERED'] = '1'  # Центрування вікна на екрані
+        
+        # Завантаження зображення баклажана
+        self.load_resources()
+        self.startup_timer.mark("завантаження ресурсів")
+        
+        # Ініціалізація підсистем
+        self.text_cache = TextCache()
+        self.ui = UI(self.screen, self.width, self.height, self.language_manager, self.text_cache)
+        self.animation = AnimationSystem(
+            self.screen, self.eggplant_image, self.eggplant_rect, self.text_cache, self.seed)
+        self.animation.preload_scaled_images(self.baked_sprites)
+        self.animation.text_atlas.reset(self.language_manager.get_text("thousands_separator"))
+        self.fit_eggplant_to_window()
+        self.achievements = AchievementSystem(self.language_manager, self.text_cache)
+        self.click_rate = ClickRateMeter()
+        self.heatmap = ClickHeatmap(self.width, self.height)
+        self.language_manager.subscribe(self.on_language_changed)
+        self.startup_timer.mark("ініціалізація підсистем")
+        
+        # Завантаження збереженого прогресу та запуск фонового збереження
+        self.saver = None
+        self.analytics = None
+        self.unsaved_changes = False
+        self.last_autosave = time.monotonic()
+        if self.persist_progress:
+            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            json_path = os.path.join(script_dir, SAVE_FILE)
+            binary_path = os.path.join(script_dir, BINARY_SAVE_FILE)
+            self.saver = SaveManager(
+                binary_path if SAVE_BINARY else json_path,
+                os.path.join(script_dir, JOURNAL_FILE),
+                binary=SAVE_BINARY,
+                fallback_path=json_path if SAVE_BINARY else binary_path)
+            self.load_progress()
+            if self.saver is not None:
+                self.saver.start()
+            
+            # Аналітика кліків пишеться в окрему базу фоновим потоком
+            if ANALYTICS_ENABLED:
+                self.analytics = ClickAnalytics(os.path.join(script_dir, ANALYTICS_FILE))
+                self.analytics.start()
+        self.startup_timer.mark("завантаження прогресу")
+        
+        # Створення таймера для стабільної частоти кадрів
+        self.clock = FramePacer()
+        
+        # Накопичувач часу для симуляції з фіксованим кроком
+        self.accumulator = 0.0
+        self.frame_number = 0
+        self.game_time = 0.0  # Сума тривалостей кадрів, секунди (для лічильника кліків за секунду)
+        
+        # Регулятор якості під навантаженням
+        self.quality = QualityGovernor()
+        
+        # Профайлер кадрів
+        self.profiler = FrameProfiler(self.text_cache, self.clock)
+        
+        # Запис або відтворення сесії
+        self.recorder = None
+        self.replay = None
+        self.replay_dt = 0.0
+    
+    def load_resources(self):
+        """Завантаження зображень та інших ресурсів."""
+        try:
+            # Отримання шляху до папки з ресурсами відносно поточного файлу
+            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            eggplant_path = os.path.join(script_dir, "assets", "images", "eggplant.png")
+            cache_path = os.path.join(script_dir, ASSET_CACHE_DIR, "eggplant.bake")
+            
+            # Декодоване та змасштабоване зображення береться з кешу на диску, якщо він актуальний
+            self.eggplant_image, self.baked_sprites = load_sprite(eggplant_path, cache_path)
+            self.eggplant_rect = self.eggplant_image.get_rect()
+            self.eggplant_rect.center = (self.width // 2, self.height // 2)
+        except (pygame.error, IOError) as e:
+            print(f"Не вдалося завантажити зображення баклажана: {e}")
+            # Створення заглушки - фіолетовий прямокутник
+            self.baked_sprites = {}
+            self.eggplant_image = pygame.Surface((100, 150))
+            self.eggplant_image.fill(EGGPLANT_COLOR)
+            self.eggplant_rect = self.eggplant_image.get_rect()
+            self.eggplant_rect.center = (self.width // 2, self.height // 2)
+    
+    def save_progress(self):
+        """
+        Збереження прогресу гри у файл.
+        Знімок лише передається фоновому потоку, тому виклик не блокує гру.
+        """
+        if self.saver is None:
+            return
+        
+        # Усі значення незмінні, тому фоновий потік може кодувати їх без блокувань
+        data = {
+            "left_clicks": self.left_clicks,
+            "right_clicks": self.right_clicks,
+            "achievements": self.achievements.get_unlocked_bits()
+        }
+        self.saver.request_snapshot(data)
+        self.unsaved_changes = False
+        self.last_autosave = time.monotonic()
+    
+    def load_progress(self):
+        """Завантаження прогресу гри з файлу та відтворення журналу кліків."""
+        data, replay_left, replay_right = self.saver.load()
+        if self.saver.load_failed:
+            self.disable_saving()
+            return
+        if data is None and replay_left + replay_right == 0:
+            print("Не вдалося завантажити прогрес, починаємо з нуля")
+            return
+        
+        if data is not None:
+            # Збереження старих версій переводяться в поточний формат
+            try:
+                data = migrate_save(data, self.achievements.ids_by_name)
+            except ValueError as e:
+                print(f"Не вдалося завантажити прогрес: {e}")
+                self.disable_saving()
+                return
+        
+        if data is not None:
+            self.left_clicks = data.get("left_clicks", 0)
+            self.right_clicks = data.get("right_clicks", 0)
+            
+            # Завантаження досягнень за бітовою маскою id
+            self.achievements.restore_achievements(data.get("achievements", 0))
+        
+        # Кліки, записані в журнал після останнього знімка
+        self.left_clicks += replay_left
+        self.right_clicks += replay_right
+        self.achievements.check_achievements(self.left_clicks + self.right_clicks, announce=False)
+        
+        print("Прогрес завантажено")
+    
+    def disable_saving(self):
+        """
+        Вимикає збереження до кінця сесії, щоб не перезаписати збереження,
+        яке не вдалося прочитати (пошкоджене або з новішої версії гри).
+        """
+        print("Прогрес у цій сесії не зберігатиметься, щоб не перезаписати наявне збереження")
+        self.saver = None
+    
+    def start_recording(self, path):
+        """
+        Починає запис сесії з поточного стану гри.
+        
+        Args:
+            path: Шлях до файлу запису
+        """
+        self.recorder = InputRecorder(
+            path, self.seed, self.width, self.height,
+            self.left_clicks, self.right_clicks, self.achievements.get_unlocked_bits())
+    
+    def start_replay(self, replay):
+        """
+        Готує гру до відтворення запису: відновлює початковий стан,
+        а регулятор якості замінюється записаними змінами рівня.
+        
+        Args:
+            replay: Об'єкт InputReplay
+        """
+        self.replay = replay
+        self.left_clicks = replay.left_clicks
+        self.right_clicks = replay.right_clicks
+        self.achievements.restore_achievements(replay.achievements)
+    
+    def handle_events(self, events):
+        """
+        Обробка подій введення користувача.
+        
+        Args:
+            events: Список подій pygame за кадр
+        """
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+                # Кліки цього кадру мають потрапити у збереження
+                self.apply_pending_clicks()
+                self.save_progress()
+            
+            elif event.type == pygame.VIDEORESIZE:
+                self.handle_resize(event.w, event.h)
+            
+            elif event.type == pygame.WINDOWEXPOSED:
+                # Вікно знову видно — система могла стерти його вміст
+                self.full_redraw = True
+            
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F2:  # Перемикання мови
+                    self.language_manager.cycle_language()
+                elif event.key == pygame.K_F3:  # Накладка профайлера
+                    self.profiler.toggle_overlay()
+                elif event.key == pygame.K_F4:  # Запис повільних кадрів
+                    self.profiler.toggle_capture()
+                elif event.key == pygame.K_F5:  # Теплова карта кліків
+                    self.heatmap.toggle()
+            
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Перевіряємо, чи відкрито панель досягнень
+                if self.show_achievements_panel:
+                    if event.button == 1:  # Ліва кнопка миші
+                        # Перевіряємо натискання на кнопку "Закрити"
+                        if self.ui.close_button_rect.collidepoint(event.pos):
+                            self.show_achievements_panel = False
+                        else:
+                            self.ui.start_achievements_panel_drag(event.pos)
+                else:
+                    # Перевіряємо кнопки інтерфейсу
+                    if event.button == 1:  # Ліва кнопка миші
+                        if self.ui.achievements_button_rect.collidepoint(event.pos):
+                            self.show_achievements_panel = True
+                        elif self.animation.hit_test(event.pos):
+                            self.handle_eggplant_click(event.button, event.pos)
+                    elif event.button == 3 and self.animation.hit_test(event.pos):  # Права кнопка миші
+                        self.handle_eggplant_click(event.button, event.pos)
+            
+            elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 1:
+                    self.ui.end_achievements_panel_drag()
+            
+            elif event.type == pygame.MOUSEMOTION:
+                # Кнопку могли відпустити за межами вікна, і тоді MOUSEBUTTONUP не надходить
+                if self.ui.panel_dragging and not event.buttons[0]:
+                    self.ui.end_achievements_panel_drag()
+                else:
+                    self.ui.drag_achievements_panel(event.pos)
+            
+            elif event.type == pygame.MOUSEWHEEL:
+                # Прокрутка списку досягнень коліщатком
+                if self.show_achievements_panel:
+                    self.ui.scroll_achievements_panel(-event.y * ACHIEVEMENT_SCROLL_STEP)
+        
+        # Усі кліки кадру обробляються разом
+        self.apply_pending_clicks()
+    
+    def handle_eggplant_click(self, button, pos):
+        """
+        Обробка кліку на баклажан.
+        Клік лише додається до пакета поточного кадру, а вся робота
+        (частинки, досягнення, текст) виконується в apply_pending_clicks.
+        
+        Args:
+            button: Кнопка миші (1 - ліва, 3 - права)
+            pos: Позиція кліку
+        """
+        if button == 1:  # Ліва кнопка миші
+            self.pending_left_clicks += 1
+        elif button == 3:  # Права кнопка миші
+            self.pending_right_clicks += 1
+        self.pending_click_pos = pos
+        self.heatmap.add_click(pos)
+        if self.analytics is not None:
+            self.analytics.record_click(button, pos, self.frame_number)
+    
+    def apply_pending_clicks(self):
+        """
+        Застосовує всі кліки, накопичені за кадр, одним оновленням:
+        лічильники збільшуються на N, досягнення перевіряються один раз,
+        показується один текст "+N" та обмежений сплеск частинок.
+        """
+        click_count = self.pending_left_clicks + self.pending_right_clicks
+        if click_count == 0:
+            return
+        
+        self.left_clicks += self.pending_left_clicks
+        self.right_clicks += self.pending_right_clicks
+        if self.saver is not None:
+            self.saver.record_clicks(self.pending_left_clicks, self.pending_right_clicks)
+            self.unsaved_changes = True
+        self.pending_left_clicks = 0
+        self.pending_right_clicks = 0
+        self.click_rate.record(self.game_time, click_count)
+        
+        self.animation.start_click_animation()
+        self.animation.spawn_particles(
+            self.pending_click_pos,
+            min(self.animation.particle_spawn_count * click_count, PARTICLE_BURST_LIMIT))
+        
+        # Перевірка досягнень після кліків
+        total_clicks = self.left_clicks + self.right_clicks
+        if self.achievements.check_achievements(total_clicks):
+            # Нове досягнення — привід зберегти знімок
+            self.save_progress()
+        
+        # Показуємо текст над баклажаном
+        self.animation.add_floating_text(
+            ["+", click_count, self.language_manager.get_text("floating_total_prefix"), total_clicks, ")"])
+    
+    def handle_resize(self, width, height):
+        """Обробляє зміну розміру вікна."""
+        self.width, self.height = width, height
+        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+        self.fit_eggplant_to_window()
+        self.ui.update_screen_size(width, height)
+        self.heatmap.resize(width, height)
+        # Після зміни розміру вікна потрібно перемалювати весь екран
+        self.full_redraw = True
+    
+    def on_language_changed(self, language):
+        """
+        Скидає кешовані тексти після зміни мови.
+        
+        Args:
+            language: Код нової мови
+        """
+        self.text_cache.clear()
+        self.animation.text_atlas.reset(self.language_manager.get_text("thousands_separator"))
+        pygame.display.set_caption(self.language_manager.get_text("window_title"))
+        self.full_redraw = True
+    
+    def fit_eggplant_to_window(self):
+        """Масштабує баклажан під поточний розмір вікна та центрує його."""
+        self.animation.set_window_size(self.width, self.height)
+        self.eggplant_rect = self.animation.get_scaled_image(1.0).get_rect()
+        self.eggplant_rect.center = (self.width // 2, self.height // 2)
+        # До наступного кадру натискання перевіряються за баклажаном у стані спокою
+        self.animation.eggplant_rect = self.eggplant_rect.copy()
+    
+    def update(self):
+        """Оновлення ігрового стану на один крок симуляції."""
+        self.animation.update()
+        self.heatmap.update()
+        self.profiler.lap("animation")
+        self.achievements.update()
+        self.profiler.lap("achievements")
+    
+    def render(self, alpha=1.0):
+        """
+        Рендеринг всіх елементів гри.
+        
+        У режимі часткового перемальовування очищаються лише ділянки,
+        змінені в попередньому кадрі, і старі місця тих елементів інтерфейсу,
+        які змінилися або перетинаються зі зміненими ділянками; решта
+        інтерфейсу не перемальовується. На дисплей передається об'єднання
+        очищених і нових змінених прямокутників.
+        
+        Args:
+            alpha: Частка кроку симуляції для інтерполяції анімацій
+        """
+        partial = self.dirty_rect_mode and not self.full_redraw
+        screen_rect = self.screen.get_rect()
+        total_clicks = self.left_clicks + self.right_clicks
+        clicks_per_second = self.click_rate.get_rate(self.game_time)
+        
+        # Очищення екрану
+        if partial:
+            # Наперед визначаємо, що анімація й теплова карта намалюють під інтерфейсом,
+            # щоб очистити й перемалювати лише зачеплені та змінені елементи UI
+            below_rects = self.animation.get_render_rects(self.eggplant_rect.center, alpha)
+            if self.heatmap.visible:
+                below_rects.append(screen_rect)
+            cleared_rects = self.previous_dirty_rects + [
+                screen_rect.clip(rect) for rect in self.ui.plan_redraw(
+                    self.left_clicks, self.right_clicks, total_clicks, self.achievements,
+                    clicks_per_second, self.previous_dirty_rects + below_rects)
+            ]
+            for rect in cleared_rects:
+                self.screen.fill(BACKGROUND_COLOR, rect)
+        else:
+            self.screen.fill(BACKGROUND_COLOR)
+        
+        # Малювання баклажана
+        dirty_rects = self.animation.render(self.eggplant_rect.center, alpha)
+        
+        # Теплова карта кліків поверх баклажана, але під інтерфейсом
+        dirty_rects += self.heatmap.render(self.screen)
+        
+        # Малювання UI; його прямокутники не очищаються в наступному кадрі,
+        # бо інтерфейс сам відстежує, які елементи потрібно перемалювати
+        ui_rects = self.ui.render(
+            self.left_clicks, self.right_clicks, total_clicks, self.achievements, clicks_per_second)
+        
+        # Малювання досягнень
+        dirty_rects += self.achievements.render(self.screen)
+        self.profiler.lap("render")
+        
+        # Малювання панелі досягнень
+        if self.show_achievements_panel:
+            dirty_rects += self.ui.render_achievements_panel(self.achievements, total_clicks)
+        self.profiler.lap("panel")
+        
+        # Малювання накладки профайлера поверх усього
+        dirty_rects += self.profiler.render(self.screen)
+        self.profiler.lap("overlay")
+        
+        # Відкидаємо частини прямокутників, що виходять за межі екрану
+        dirty_rects = [screen_rect.clip(rect) for rect in dirty_rects]
+        
+        # Оновлення екрану
+        if partial:
+            pygame.display.update(cleared_rects + dirty_rects + [screen_rect.clip(rect) for rect in ui_rects])
+        else:
+            pygame.display.flip()
+        self.profiler.lap("flip")
+        
+        self.previous_dirty_rects = dirty_rects
+        self.full_redraw = False
+    
+    def frame(self, dt=SIMULATION_STEP):
+        """
+        Обробка одного кадру: події, оновлення стану та рендеринг.
+        Симуляція просувається фіксованими кроками, тому швидкість анімацій
+        не залежить від тривалості кадрів.
+        
+        Args:
+            dt: Реальний час, що минув з попереднього кадру, в секундах
+        """
+        self.profiler.begin_frame()
+        self.frame_number += 1
+        if self.replay is not None:
+            # Тривалість кадру, події та зміни якості беруться з запису
+            dt, events, quality_level = self.replay.next_frame()
+            self.replay_dt = dt
+            if quality_level is not None:
+                self.quality.set_level(quality_level)
+                self.animation.apply_quality(self.quality.settings)
+        else:
+            events = pygame.event.get()
+            if self.wake_events:
+                events = self.wake_events + events
+                self.wake_events = []
+            if self.recorder is not None:
+                dt = self.recorder.record_frame(dt, events)
+        self.game_time += dt
+        self.handle_events(events)
+        self.profiler.lap("events")
+        
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= SIMULATION_STEP and steps < MAX_SIMULATION_STEPS:
+            self.update()
+            self.accumulator -= SIMULATION_STEP
+            steps += 1
+        # Якщо гра не встигає, відкидаємо накопичене відставання замість лавиноподібного наздоганяння
+        if self.accumulator >= SIMULATION_STEP:
+            self.accumulator %= SIMULATION_STEP
+        
+        self.render(self.accumulator / SIMULATION_STEP)
+        
+        self.autosave()
+        self.profiler.end_frame()
+    
+    def autosave(self):
+        """Періодичне автозбереження, якщо з останнього знімка були зміни."""
+        if self.unsaved_changes and time.monotonic() - self.last_autosave >= AUTOSAVE_INTERVAL:
+            self.save_progress()
+    
+    def is_idle(self):
+        """
+        Перевіряє, чи наступний кадр нічим не відрізнятиметься від попереднього.
+        
+        Returns:
+            True, якщо немає анімацій, накладок і незавершених змін екрану
+        """
+        return not (
+            self.full_redraw
+            or self.animation.is_animating()
+            or self.achievements.is_animating()
+            or (self.heatmap.active and self.heatmap.visible)
+            or self.click_rate.get_rate(self.game_time) > 0
+            or self.profiler.overlay_visible
+            or self.ui.panel_dragging
+        )
+    
+    def wait_for_input(self):
+        """
+        Режим простою: блокує цикл до першої події введення без витрат процесора.
+        Раз на IDLE_WAIT_TIMEOUT секунд прокидається лише для автозбереження.
+        Рух миші будить гру тільки під час перетягування списку досягнень.
+        """
+        idle_start = time.perf_counter()
+        while True:
+            event = pygame.event.wait(int(IDLE_WAIT_TIMEOUT * 1000))
+            if event.type == pygame.NOEVENT:
+                self.autosave()
+                continue
+            if event.type == pygame.MOUSEMOTION and not self.ui.panel_dragging:
+                continue
+            self.wake_events.append(event)
+            break
+        # Час простою не повинен потрапити в тривалість кадру
+        self.clock.reset()
+        # Прихована теплова карта згасає так, ніби кадри йшли весь час простою
+        self.heatmap.update(int((time.perf_counter() - idle_start) / SIMULATION_STEP))
+    
+    def update_quality(self, frame_ms):
+        """
+        Передає тривалість кадру регулятору якості та застосовує новий рівень, якщо він змінився.
+        
+        Args:
+            frame_ms: Час роботи кадру в мілісекундах
+        """
+        if self.replay is not None:
+            return
+        if self.quality.observe(frame_ms):
+            self.animation.apply_quality(self.quality.settings)
+            if self.recorder is not None:
+                self.recorder.record_quality(self.quality.level)
+    
+    def run(self):
+        """Головний цикл гри."""
+        dt = SIMULATION_STEP
+        while self.running:
+            if IDLE_MODE and self.is_idle():
+                self.wait_for_input()
+            self.frame(dt)
+            self.startup_timer.finish("перший кадр", STARTUP_REPORT)
+            self.clock.tick(FPS)
+            self.update_quality(self.clock.raw_time * 1000)
+            dt = self.clock.frame_time
+        
+        if self.recorder is not None:
+            self.recorder.save()
+            print(f"Сесію записано у {self.recorder.path}")
+        
+        # Дочікуємося запису останнього знімка
+        if self.saver is not None:
+            if self.saver.stop():
+                print("Прогрес збережено")
+            else:
+                print("Не вдалося зберегти прогрес перед виходом")
+        if self.analytics is not None:
+            self.analytics.stop()
+        
         pygame.quit()
\ No newline at end of file
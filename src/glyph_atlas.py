@@ -0,0 +1,120 @@
+import pygame
+from src.constants import *
+
+class GlyphAtlas:
+    """
+    Атлас гліфів для тексту з числами, що часто змінюються.
+    Цифри, роздільники та незмінні підписи рендеряться шрифтом лише раз,
+    а рядок складається з готових поверхонь одним викликом blits,
+    тому зміна числа не потребує растеризації шрифту.
+    
+    Текст описується списком частин: рядок — незмінний підпис (кешується
+    цілком), ціле число — розбивається на гліфи цифр із роздільником тисяч.
+    """
+    def __init__(self, font, color, separator=THOUSANDS_SEPARATOR):
+        """
+        Ініціалізація атласу.
+        
+        Args:
+            font: Шрифт для рендерингу гліфів
+            color: Колір тексту
+            separator: Роздільник груп розрядів
+        """
+        self.font = font
+        self.color = color
+        self.separator = separator
+        self.glyphs = {}
+        self.render_digits()
+    
+    def render_digits(self):
+        """Рендерить цифри та роздільник одразу, бо вони потрібні завжди."""
+        for char in "0123456789-" + self.separator:
+            self.get_glyph(char)
+    
+    def get_glyph(self, text):
+        """
+        Отримує поверхню гліфа або підпису, рендерячи її лише при першому запиті.
+        
+        Args:
+            text: Символ або незмінний підпис
+        
+        Returns:
+            Поверхня з текстом
+        """
+        glyph = self.glyphs.get(text)
+        if glyph is None:
+            glyph = self.font.render(text, True, self.color)
+            self.glyphs[text] = glyph
+        return glyph
+    
+    def reset(self, separator=None):
+        """
+        Видаляє всі гліфи (наприклад, після зміни мови) і заново рендерить цифри.
+        
+        Args:
+            separator: Новий роздільник груп розрядів (None — залишити поточний)
+        """
+        if separator is not None:
+            self.separator = separator
+        self.glyphs.clear()
+        self.render_digits()
+    
+    def layout(self, parts, pos=(0, 0)):
+        """
+        Розміщує гліфи частин тексту в рядок.
+        
+        Args:
+            parts: Список частин тексту (рядки та цілі числа)
+            pos: Позиція лівого верхнього кута рядка
+        
+        Returns:
+            Кортеж (послідовність (поверхня, позиція) для blits, ширина, висота)
+        """
+        x, y = pos
+        height = 0
+        sequence = []
+        for part in parts:
+            if isinstance(part, int):
+                pieces = f"{part:,}".replace(",", self.separator)
+            else:
+                pieces = (part,)
+            for piece in pieces:
+                glyph = self.get_glyph(piece)
+                sequence.append((glyph, (x, y)))
+                x += glyph.get_width()
+                height = max(height, glyph.get_height())
+        return sequence, x - pos[0], height
+    
+    def draw(self, target, pos, parts):
+        """
+        Малює текст на поверхні.
+        
+        Args:
+            target: Поверхня для рендерингу
+            pos: Позиція лівого верхнього кута рядка
+            parts: Список частин тексту (рядки та цілі числа)
+        
+        Returns:
+            Перемальований прямокутник
+        """
+        sequence, width, height = self.layout(parts, pos)
+        target.blits(sequence, doreturn=False)
+        return pygame.Rect(pos[0], pos[1], width, height)
+    
+    def render(self, parts):
+        """
+        Складає текст в окрему поверхню, якою викликач володіє сам
+        (наприклад, щоб змінювати її прозорість без копіювання).
+        
+        Args:
+            parts: Список частин тексту (рядки та цілі числа)
+        
+        Returns:
+            Нова поверхня з текстом
+        """
+        sequence, width, height = self.layout(parts)
+        surface = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        # Прозоре тло кольору тексту, щоб згладжені краї гліфів не темніли
+        surface.fill((*self.color[:3], 0))
+        surface.blits(sequence, doreturn=False)
+        return surface
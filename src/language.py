@@ -1,40 +1,175 @@
-from src.constants import TRANSLATIONS
-
-class LanguageManager:
-    """
-    Клас для управління мовою гри.
-    Забезпечує доступ до перекладів всіх текстів.
-    """
-    def __init__(self):
-        """Ініціалізація менеджера з українською мовою."""
-        self.current_language = "uk"
-        self.translations = TRANSLATIONS
-    
-    def get_text(self, key):
-        """
-        Отримує переклад за ключем для української мови.
-        
-        Args:
-            key: Ключ тексту для перекладу
-            
-        Returns:
-            Перекладений текст
-        """
-        if key in self.translations[self.current_language]:
-            return self.translations[self.current_language][key]
-        # Якщо ключ не знайдено, повертаємо сам ключ як текст
-        return key
-    
-    def get_achievement_name(self, index):
-        """
-        Отримує переклад назви досягнення за індексом.
-        
-        Args:
-            index: Індекс досягнення
-            
-        Returns:
-            Перекладена назва досягнення
-        """
-        if index < len(self.translations[self.current_language]["achievements"]):
-            return self.translations[self.current_language]["achievements"][index]["name"]
-        return f"Achievement {index}"
\ No newline at end of file
+import os
+import json
+from src.constants import *
+
+# Складені підписи, які використовуються щокадру.
+# Вони обчислюються один раз при компіляції каталогу з посилань на інші ключі.
+COMPOSED_TEXTS = {
+    "score_left_prefix": "{left_clicks}: ",
+    "score_right_prefix": " | {right_clicks}: ",
+    "score_total_prefix": " | {total}: ",
+    "floating_total_prefix": " ({total}: ",
+    "cps_prefix": "{clicks_per_second}: "
+}
+
+class TextsWithKeys(dict):
+    """Словник текстів, який для відсутнього ключа повертає сам ключ (як get_text)."""
+    def __missing__(self, key):
+        return key
+
+def compile_catalog(catalog, fallback=None):
+    """
+    Компілює каталог мови в плоску таблицю готових рядків.
+    Ключі, яких немає в каталозі, беруться з резервної таблиці.
+    
+    Args:
+        catalog: Словник каталогу з файлу мови
+        fallback: Скомпільована таблиця мови за замовчуванням (None — без резерву)
+    
+    Returns:
+        Словник {ключ: текст}, що містить також складені підписи
+    """
+    strings = TextsWithKeys(fallback or {})
+    strings.update(catalog.get("strings", {}))
+    strings.setdefault("thousands_separator", THOUSANDS_SEPARATOR)
+    table = dict(strings)
+    for key, template in COMPOSED_TEXTS.items():
+        table[key] = template.format_map(strings)
+    table["language_name"] = catalog.get("language_name", "")
+    return table
+
+class LanguageManager:
+    """
+    Клас для управління мовою гри.
+    Забезпечує доступ до перекладів всіх текстів.
+    
+    Каталоги мов зберігаються в окремих файлах і завантажуються лише при
+    першому виборі мови. Підсистеми з кешованими текстами підписуються
+    на зміну мови через subscribe().
+    """
+    def __init__(self, language=DEFAULT_LANGUAGE):
+        """
+        Ініціалізація менеджера.
+        
+        Args:
+            language: Початкова мова
+        """
+        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.catalog_dir = os.path.join(script_dir, LANGUAGE_DIR)
+        
+        # Скомпільовані каталоги: {мова: таблиця текстів}
+        self.catalogs = {}
+        self.listeners = []
+        
+        # Відформатовані підписи закритих досягнень: {поріг: текст}
+        self.locked_texts = {}
+        
+        self.current_language = None
+        self.texts = {}
+        self.set_language(language)
+    
+    def load_catalog(self, language):
+        """
+        Завантажує та компілює каталог мови (лише при першому запиті).
+        
+        Args:
+            language: Код мови
+        
+        Returns:
+            Таблиця текстів мови
+        """
+        table = self.catalogs.get(language)
+        if table is None:
+            # Неповний переклад доповнюється текстами мови за замовчуванням
+            fallback = self.load_catalog(DEFAULT_LANGUAGE) if language != DEFAULT_LANGUAGE else None
+            path = os.path.join(self.catalog_dir, f"{language}.json")
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    catalog = json.load(file)
+                if not isinstance(catalog, dict) or not isinstance(catalog.get("strings", {}), dict):
+                    raise ValueError("Невірна структура каталогу")
+                table = compile_catalog(catalog, fallback)
+            except (IOError, ValueError) as e:
+                print(f"Не вдалося завантажити мову {language}: {e}")
+                table = compile_catalog({}, fallback)
+            self.catalogs[language] = table
+        return table
+    
+    def set_language(self, language):
+        """
+        Змінює мову гри та повідомляє всіх підписників.
+        
+        Args:
+            language: Код мови
+        """
+        if language == self.current_language:
+            return
+        self.texts = self.load_catalog(language)
+        self.current_language = language
+        self.locked_texts = {}
+        for listener in self.listeners:
+            listener(language)
+    
+    def cycle_language(self):
+        """Перемикає мову на наступну зі списку LANGUAGES."""
+        if self.current_language in LANGUAGES:
+            index = (LANGUAGES.index(self.current_language) + 1) % len(LANGUAGES)
+        else:
+            index = 0
+        self.set_language(LANGUAGES[index])
+    
+    def subscribe(self, listener):
+        """
+        Реєструє функцію, яка викликається після зміни мови
+        (наприклад, для очищення кешованих текстових поверхонь).
+        
+        Args:
+            listener: Функція, що приймає код нової мови
+        """
+        self.listeners.append(listener)
+    
+    def get_text(self, key):
+        """
+        Отримує переклад за ключем для поточної мови.
+        
+        Args:
+            key: Ключ тексту для перекладу
+        
+        Returns:
+            Перекладений текст
+        """
+        # Якщо ключ не знайдено, повертаємо сам ключ як текст
+        return self.texts.get(key, key)
+    
+    def get_locked_achievement_text(self, threshold):
+        """
+        Отримує підпис закритого досягнення (форматується один раз для кожного порогу).
+        
+        Args:
+            threshold: Поріг досягнення
+        
+        Returns:
+            Перекладений підпис
+        """
+        text = self.locked_texts.get(threshold)
+        if text is None:
+            text = self.get_text("locked_achievement").format(threshold)
+            self.locked_texts[threshold] = text
+        return text
+    
+    def get_achievement_name(self, achievement):
+        """
+        Отримує переклад назви досягнення.
+        
+        Args:
+            achievement: Досягнення з назвами різними мовами
+        
+        Returns:
+            Перекладена назва досягнення
+        """
+        names = achievement["names"]
+        if self.current_language in names:
+            return names[self.current_language]
+        if DEFAULT_LANGUAGE in names:
+            return names[DEFAULT_LANGUAGE]
+        return f"Achievement {achievement['id']}"
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Генератор навантаження для сервера спільного лічильника.
+Запускає багато клієнтів в одному процесі asyncio; кожен клієнт клікає
+із заданою частотою, надсилає приріст кліків раз за такт і читає знімки
+стану. Після завершення перевіряє, що сервер врахував усі надіслані кліки,
+і виводить статистику у форматі JSON; якщо частину кліків втрачено або
+сервер не надіслав жодного знімка, повертає ненульовий код виходу.
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from src.constants import *
+
+async def read_total(host, port):
+    """
+    Читає поточний лічильник сервера з першого знімка окремого з'єднання.
+    
+    Args:
+        host: Адреса сервера
+        port: Порт сервера
+    
+    Returns:
+        Загальна кількість кліків або None, якщо сервер закрив з'єднання
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        # Нове з'єднання змінює стан сервера, тому знімок надходить на найближчому такті
+        line = await reader.readline()
+    finally:
+        writer.close()
+    if not line:
+        return None
+    return json.loads(line)["total"]
+
+async def run_client(host, port, index, clicks_per_second, duration, tick_rate, stats):
+    """
+    Імітує одного клієнта.
+    
+    Args:
+        host: Адреса сервера
+        port: Порт сервера
+        index: Номер клієнта
+        clicks_per_second: Частота кліків клієнта
+        duration: Тривалість надсилання кліків у секундах
+        tick_rate: Частота надсилання приростів, разів на секунду
+        stats: Спільний словник статистики
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"n bot{index}\n".encode("utf-8"))
+    
+    async def read_snapshots():
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            stats["snapshots"] += 1
+            stats["bytes_received"] += len(line)
+            stats["last_snapshot"] = line
+    
+    reader_task = asyncio.create_task(read_snapshots())
+    
+    # Випадковий зсув, щоб клієнти не надсилали приріст одночасно
+    interval = 1.0 / tick_rate
+    await asyncio.sleep(random.uniform(0, interval))
+    
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    next_tick = start
+    clicks_due = 0.0
+    sent = 0
+    while loop.time() - start < duration:
+        next_tick += interval
+        delay = next_tick - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        clicks_due += clicks_per_second * interval
+        delta = int(clicks_due) - sent
+        if delta > 0:
+            left = (delta + index % 2) // 2
+            writer.write(f"d {left} {delta - left}\n".encode("ascii"))
+            stats["messages"] += 1
+            sent += delta
+    await writer.drain()
+    stats["clicks_sent"] += sent
+    return writer, reader_task
+
+async def run_load(host, port, clients, clicks_per_second, duration, tick_rate, settle):
+    """
+    Запускає всіх клієнтів і збирає статистику.
+    
+    Args:
+        host: Адреса сервера
+        port: Порт сервера
+        clients: Кількість клієнтів
+        clicks_per_second: Частота кліків кожного клієнта
+        duration: Тривалість надсилання кліків у секундах
+        tick_rate: Частота надсилання приростів, разів на секунду
+        settle: Час очікування останніх знімків після завершення, секунди
+    
+    Returns:
+        Словник з результатами
+    """
+    # Сервер міг уже мати кліки, тому втрати рахуються від початкового значення
+    initial_total = await read_total(host, port)
+    stats = {"clicks_sent": 0, "messages": 0, "snapshots": 0, "bytes_received": 0, "last_snapshot": None}
+    start = time.perf_counter()
+    connections = await asyncio.gather(*(
+        run_client(host, port, i, clicks_per_second, duration, tick_rate, stats)
+        for i in range(clients)
+    ))
+    await asyncio.sleep(settle)
+    elapsed = time.perf_counter() - start
+    
+    for writer, reader_task in connections:
+        writer.close()
+        reader_task.cancel()
+    await asyncio.gather(*(reader_task for _, reader_task in connections), return_exceptions=True)
+    
+    final_total = None
+    if stats["last_snapshot"] is not None:
+        final_total = json.loads(stats["last_snapshot"])["total"]
+    lost_clicks = None
+    if initial_total is not None and final_total is not None:
+        lost_clicks = stats["clicks_sent"] - (final_total - initial_total)
+    return {
+        "clients": clients,
+        "clicks_per_second": clicks_per_second,
+        "duration": duration,
+        "elapsed": elapsed,
+        "clicks_sent": stats["clicks_sent"],
+        "messages_sent": stats["messages"],
+        "snapshots_received": stats["snapshots"],
+        "snapshots_per_client_per_second": stats["snapshots"] / clients / elapsed if clients else 0.0,
+        "bytes_received": stats["bytes_received"],
+        "initial_total": initial_total,
+        "final_total": final_total,
+        "lost_clicks": lost_clicks
+    }
+
+def main(argv=None):
+    """
+    Точка входу генератора навантаження.
+    
+    Args:
+        argv: Аргументи командного рядка
+    """
+    parser = argparse.ArgumentParser(description="Генератор навантаження для сервера гри з баклажаном")
+    parser.add_argument("--host", default=SERVER_HOST, help="Адреса сервера")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Порт сервера")
+    parser.add_argument("--clients", type=int, default=100, help="Кількість клієнтів")
+    parser.add_argument("--cps", type=float, default=10.0, help="Кліків на секунду для кожного клієнта")
+    parser.add_argument("--duration", type=float, default=10.0, help="Тривалість навантаження, секунди")
+    parser.add_argument("--tick-rate", type=float, default=CLIENT_TICK_RATE,
+                        help="Частота надсилання приростів, разів на секунду")
+    parser.add_argument("--settle", type=float, default=1.0,
+                        help="Час очікування останніх знімків після завершення, секунди")
+    args = parser.parse_args(argv)
+    
+    try:
+        result = asyncio.run(run_load(
+            args.host, args.port, args.clients, args.cps, args.duration, args.tick_rate, args.settle))
+    except OSError as e:
+        print(f"Не вдалося підключитися до сервера: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    if result["lost_clicks"] is None:
+        print("Сервер не надіслав жодного знімка стану", file=sys.stderr)
+        return 1
+    if result["lost_clicks"] != 0:
+        print(f"Сервер не врахував {result['lost_clicks']} кліків", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import time
+import numpy as np
+from src.constants import *
+
+class FramePacer:
+    """
+    Точний обмежувач частоти кадрів.
+    Більшу частину очікування проводить у time.sleep, а останні
+    мілісекунди до дедлайну — в активному циклі, тому кадри починаються
+    вчасно навіть за грубої роздільної здатності системного таймера.
+    Інтерфейс сумісний з pygame.time.Clock (tick, get_time, get_rawtime, get_fps).
+    """
+    def __init__(self, spin_margin=PACER_SPIN_MARGIN, history=PACER_HISTORY):
+        """
+        Ініціалізація обмежувача.
+        
+        Args:
+            spin_margin: Час до дедлайну (в секундах), який очікується активно
+            history: Кількість кадрів у буфері статистики
+        """
+        self.spin_margin = spin_margin
+        self.history = history
+        
+        self.last_tick = time.perf_counter()
+        self.frame_time = 0.0  # Повний час кадру, секунди
+        self.raw_time = 0.0  # Час роботи кадру без очікування, секунди
+        
+        # Кільцеві буфери тривалості кадрів та відхилення від дедлайну (мс)
+        self.frame_times = np.zeros(history, dtype=np.float64)
+        self.jitters = np.zeros(history, dtype=np.float64)
+        self.frames = 0
+    
+    def tick(self, framerate=0):
+        """
+        Очікує початку наступного кадру.
+        
+        Args:
+            framerate: Бажана частота кадрів (0 — без обмеження)
+        
+        Returns:
+            Тривалість кадру в мілісекундах
+        """
+        now = time.perf_counter()
+        self.raw_time = now - self.last_tick
+        
+        jitter = 0.0
+        if framerate > 0:
+            deadline = self.last_tick + 1.0 / framerate
+            remaining = deadline - now
+            if remaining > self.spin_margin:
+                time.sleep(remaining - self.spin_margin)
+            # Активне очікування останніх мілісекунд
+            while time.perf_counter() < deadline:
+                pass
+            now = time.perf_counter()
+            jitter = (now - deadline) * 1000
+        
+        self.frame_time = now - self.last_tick
+        self.last_tick = now
+        
+        index = self.frames % self.history
+        self.frame_times[index] = self.frame_time * 1000
+        self.jitters[index] = jitter
+        self.frames += 1
+        return int(self.frame_time * 1000)
+    
+    def reset(self):
+        """Починає відлік заново (наприклад, після тривалої паузи)."""
+        self.last_tick = time.perf_counter()
+    
+    def get_time(self):
+        """Повертає тривалість попереднього кадру в мілісекундах."""
+        return int(self.frame_time * 1000)
+    
+    def get_rawtime(self):
+        """Повертає час роботи попереднього кадру без очікування в мілісекундах."""
+        return int(self.raw_time * 1000)
+    
+    def get_fps(self):
+        """Повертає середню частоту кадрів за період буфера."""
+        filled = self.frame_times[:min(self.frames, self.history)]
+        if len(filled) == 0 or filled.mean() == 0:
+            return 0.0
+        return 1000.0 / filled.mean()
+    
+    def get_jitter(self):
+        """
+        Отримує статистику відхилення початку кадру від дедлайну.
+        
+        Returns:
+            Словник із середнім та максимальним відхиленням у мілісекундах
+        """
+        filled = self.jitters[:min(self.frames, self.history)]
+        if len(filled) == 0:
+            return {"mean": 0.0, "max": 0.0}
+        return {"mean": float(filled.mean()), "max": float(filled.max())}
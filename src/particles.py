@@ -0,0 +1,122 @@
+import math
+import numpy as np
+from src.constants import *
+
+class ParticleSystem:
+    """
+    Сховище частинок у форматі "структура масивів".
+    Усі властивості частинок зберігаються в заздалегідь виділених масивах NumPy,
+    а живі частинки завжди займають перші `count` елементів.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        """
+        Ініціалізація сховища частинок.
+        
+        Args:
+            capacity: Максимальна кількість одночасно живих частинок
+            seed: Зерно генератора випадкових чисел (None — випадкове)
+        """
+        self.capacity = capacity
+        self.limit = capacity  # Поточний ліміт живих частинок (не більше за місткість)
+        self.count = 0
+        
+        # Заздалегідь виділені масиви властивостей
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.previous_positions = np.zeros((capacity, 2), dtype=np.float32)  # Для інтерполяції
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetimes = np.zeros(capacity, dtype=np.int32)
+        self.colors = np.zeros(capacity, dtype=np.uint8)  # Індекс кольору в PARTICLE_COLORS
+        self.sizes = np.zeros(capacity, dtype=np.uint8)
+        
+        # Генератор випадкових чисел для векторизованого створення частинок
+        self.rng = np.random.default_rng(seed)
+    
+    def __len__(self):
+        """Повертає кількість живих частинок."""
+        return self.count
+    
+    def spawn(self, pos, count):
+        """
+        Створює частинки в заданій точці.
+        Якщо досягнуто ліміту, зайві частинки просто не створюються.
+        
+        Args:
+            pos: Позиція, де створити частинки
+            count: Кількість частинок
+        """
+        count = min(count, self.limit - self.count)
+        if count <= 0:
+            return
+        
+        start = self.count
+        end = start + count
+        
+        # Випадковий кут і швидкість
+        angles = self.rng.uniform(0, math.pi * 2, count)
+        speeds = self.rng.uniform(PARTICLE_MIN_SPEED, PARTICLE_MAX_SPEED, count)
+        
+        self.positions[start:end] = pos
+        self.previous_positions[start:end] = pos
+        self.velocities[start:end, 0] = np.cos(angles) * speeds
+        self.velocities[start:end, 1] = np.sin(angles) * speeds
+        # Випадкова тривалість життя, колір і розмір
+        self.lifetimes[start:end] = self.rng.integers(
+            PARTICLE_MIN_LIFETIME, PARTICLE_MAX_LIFETIME, size=count, endpoint=True)
+        self.colors[start:end] = self.rng.integers(0, len(PARTICLE_COLORS), size=count)
+        self.sizes[start:end] = self.rng.integers(
+            PARTICLE_MIN_SIZE, PARTICLE_MAX_SIZE, size=count, endpoint=True)
+        
+        self.count = end
+    
+    def update(self):
+        """Оновлення стану всіх частинок на один крок симуляції."""
+        if self.count == 0:
+            return
+        
+        lifetimes = self.lifetimes[:self.count]
+        lifetimes -= 1
+        
+        # Ущільнення масивів: живі частинки зсуваються на початок
+        alive = lifetimes > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            alive_count = len(keep)
+            for array in (self.positions, self.previous_positions, self.velocities,
+                          self.lifetimes, self.colors, self.sizes):
+                array[:alive_count] = array[keep]
+            self.count = alive_count
+        
+        # Рух частинок та додавання "гравітації"
+        count = self.count
+        self.previous_positions[:count] = self.positions[:count]
+        self.positions[:count] += self.velocities[:count]
+        self.velocities[:count, 1] += PARTICLE_GRAVITY
+    
+    def set_limit(self, limit):
+        """
+        Встановлює ліміт живих частинок. Уже створені частинки доживають свій час.
+        
+        Args:
+            limit: Новий ліміт
+        """
+        self.limit = min(limit, self.capacity)
+    
+    def interpolated_positions(self, alpha):
+        """
+        Обчислює позиції частинок між двома останніми кроками симуляції.
+        
+        Args:
+            alpha: Частка кроку від 0 (попередній стан) до 1 (поточний)
+            
+        Returns:
+            Масив позицій живих частинок
+        """
+        count = self.count
+        if alpha >= 1.0:
+            return self.positions[:count]
+        previous = self.previous_positions[:count]
+        return previous + (self.positions[:count] - previous) * alpha
+    
+    def clear(self):
+        """Видаляє всі частинки."""
+        self.count = 0
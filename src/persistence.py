@@ -0,0 +1,238 @@
+import os
+import threading
+from src.save_format import encode_save, decode_save
+
+def fsync_directory(path):
+    """
+    Синхронізує запис каталогу на диск, щоб перейменування файлу пережило збій.
+    На системах без підтримки (наприклад, Windows) нічого не робить.
+    
+    Args:
+        path: Шлях до каталогу
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def atomic_write(path, content):
+    """
+    Атомарно записує вміст у файл: тимчасовий файл, fsync і перейменування.
+    Після збою на диску залишається або старий, або новий файл повністю.
+    
+    Args:
+        path: Шлях до файлу
+        content: Байти для запису
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+class SaveManager:
+    """
+    Фоновий менеджер збережень з відкладеним записом.
+    Головний потік лише передає знімки стану та прирости кліків, а окремий
+    потік записує їх на диск, тому ігровий цикл ніколи не чекає на диск.
+    
+    Між знімками кліки дописуються в журнал (по рядку "номер ліві праві"),
+    який відтворюється при завантаженні. Кожен знімок запам'ятовує номер
+    останнього врахованого запису журналу.
+    """
+    def __init__(self, save_path, journal_path, binary=False, fallback_path=None):
+        """
+        Ініціалізація менеджера.
+        
+        Args:
+            save_path: Шлях до файлу знімка
+            journal_path: Шлях до журналу кліків
+            binary: Записувати знімок у двійковому форматі замість JSON
+            fallback_path: Файл знімка, який читається, якщо основного ще немає
+                (наприклад, збереження в іншому форматі)
+        """
+        self.save_path = save_path
+        self.journal_path = journal_path
+        self.binary = binary
+        self.fallback_path = fallback_path
+        
+        # Стан, спільний з фоновим потоком (захищений умовою)
+        self.condition = threading.Condition()
+        self.pending_snapshot = None
+        self.pending_journal = []
+        self.sequence = 0
+        self.stopping = False
+        
+        # Чи збережено весь прогрес: хибне після будь-якої помилки запису, доки
+        # повний знімок не запишеться успішно (лише фоновий потік, читається після stop)
+        self.last_write_ok = True
+        
+        # Знімок існує, але його не вдалося прочитати (перезаписувати його не можна)
+        self.load_failed = False
+        
+        # Записи журналу, ще не враховані жодним знімком (лише фоновий потік)
+        self.uncovered_journal = []
+        self.journal_file = None
+        
+        self.thread = threading.Thread(target=self.worker, name="SaveManager", daemon=True)
+    
+    def load(self):
+        """
+        Завантажує останній знімок і відтворює журнал кліків після нього.
+        Викликається до start().
+        
+        Returns:
+            Кортеж (декодовані дані знімка або None, ліві кліки з журналу, праві кліки з журналу)
+        """
+        data = None
+        for path in (self.save_path, self.fallback_path):
+            if path is None or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "rb") as file:
+                    data = decode_save(file.read())
+            except (IOError, ValueError) as e:
+                print(f"Не вдалося прочитати збереження {path}: {e}")
+                self.load_failed = True
+            break
+        
+        base_sequence = data.get("journal_sequence", 0) if data else 0
+        self.sequence = base_sequence
+        replay_left = 0
+        replay_right = 0
+        try:
+            with open(self.journal_path, "r") as file:
+                lines = file.read().split("\n")
+            # Останній елемент — або порожній рядок, або обірваний під час збою запис
+            for line in lines[:-1]:
+                try:
+                    sequence, left, right = (int(part) for part in line.split())
+                except ValueError:
+                    continue
+                if sequence > base_sequence:
+                    replay_left += left
+                    replay_right += right
+                    self.uncovered_journal.append((sequence, left, right))
+                self.sequence = max(self.sequence, sequence)
+        except IOError:
+            pass
+        
+        return data, replay_left, replay_right
+    
+    def start(self):
+        """Запускає фоновий потік запису."""
+        self.thread.start()
+    
+    def record_clicks(self, left, right):
+        """
+        Додає приріст кліків у чергу журналу.
+        
+        Args:
+            left: Кількість нових лівих кліків
+            right: Кількість нових правих кліків
+        """
+        with self.condition:
+            self.sequence += 1
+            self.pending_journal.append((self.sequence, left, right))
+            self.condition.notify()
+    
+    def request_snapshot(self, data):
+        """
+        Ставить знімок стану в чергу на запис.
+        Якщо попередній знімок ще не записано, він замінюється новим.
+        
+        Args:
+            data: Словник зі станом гри (не повинен змінюватися після передачі)
+        """
+        with self.condition:
+            data["journal_sequence"] = self.sequence
+            self.pending_snapshot = data
+            self.condition.notify()
+    
+    def stop(self):
+        """
+        Записує все, що залишилося в черзі, і зупиняє фоновий потік.
+        
+        Returns:
+            True, якщо весь переданий прогрес записано на диск
+        """
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        if self.thread.is_alive():
+            self.thread.join()
+        return self.last_write_ok
+    
+    def worker(self):
+        """Цикл фонового потоку: забирає накопичені записи та пише їх на диск."""
+        while True:
+            with self.condition:
+                while not (self.pending_journal or self.pending_snapshot or self.stopping):
+                    self.condition.wait()
+                journal = self.pending_journal
+                self.pending_journal = []
+                snapshot = self.pending_snapshot
+                self.pending_snapshot = None
+                stopping = self.stopping
+            
+            try:
+                if journal:
+                    self.append_journal(journal)
+                if snapshot is not None:
+                    self.write_snapshot(snapshot)
+                    self.last_write_ok = True
+            except (IOError, OSError) as e:
+                print(f"Не вдалося зберегти прогрес: {e}")
+                self.last_write_ok = False
+            
+            if stopping:
+                with self.condition:
+                    if not (self.pending_journal or self.pending_snapshot):
+                        break
+        self.close_journal()
+    
+    def append_journal(self, entries):
+        """
+        Дописує записи в журнал і синхронізує його з диском.
+        
+        Args:
+            entries: Список кортежів (номер, ліві, праві)
+        """
+        if self.journal_file is None:
+            self.journal_file = open(self.journal_path, "a")
+        self.journal_file.write("".join(f"{sequence} {left} {right}\n" for sequence, left, right in entries))
+        self.journal_file.flush()
+        os.fsync(self.journal_file.fileno())
+        self.uncovered_journal.extend(entries)
+    
+    def write_snapshot(self, snapshot):
+        """
+        Атомарно записує знімок і прибирає з журналу враховані ним записи.
+        
+        Args:
+            snapshot: Словник зі станом гри
+        """
+        atomic_write(self.save_path, encode_save(snapshot, self.binary))
+        
+        covered = snapshot["journal_sequence"]
+        self.uncovered_journal = [entry for entry in self.uncovered_journal if entry[0] > covered]
+        self.close_journal()
+        atomic_write(self.journal_path, "".join(
+            f"{sequence} {left} {right}\n" for sequence, left, right in self.uncovered_journal
+        ).encode("utf-8"))
+    
+    def close_journal(self):
+        """Закриває файл журналу, якщо він відкритий."""
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
@@ -0,0 +1,163 @@
+import os
+import time
+import cProfile
+import numpy as np
+from src.constants import *
+from src.fonts import get_font
+
+# Фази кадру в порядку їх виконання
+PROFILER_PHASES = ("events", "animation", "achievements", "render", "panel", "overlay", "flip")
+
+class FrameProfiler:
+    """
+    Профайлер кадрів гри.
+    Зберігає час кожної фази кадру в кільцевому буфері, малює накладку
+    зі статистикою та записує cProfile-знімки повільних кадрів на диск.
+    """
+    def __init__(self, text_cache, pacer=None, history=PROFILER_HISTORY, slow_frame_ms=SLOW_FRAME_THRESHOLD_MS):
+        """
+        Ініціалізація профайлера.
+        
+        Args:
+            text_cache: Спільний кеш текстових поверхонь
+            pacer: Обмежувач кадрів, статистика якого показується в накладці
+            history: Кількість кадрів у кільцевому буфері
+            slow_frame_ms: Поріг повільного кадру в мілісекундах
+        """
+        self.text_cache = text_cache
+        self.pacer = pacer
+        self.history = history
+        self.slow_frame_ms = slow_frame_ms
+        
+        # Кільцевий буфер: стовпці фаз і останній стовпець із загальним часом кадру
+        self.timings = np.zeros((history, len(PROFILER_PHASES) + 1), dtype=np.float64)
+        self.phase_columns = {phase: i for i, phase in enumerate(PROFILER_PHASES)}
+        self.current = np.zeros(len(PROFILER_PHASES) + 1, dtype=np.float64)
+        self.frame_index = 0
+        self.frame_start = 0.0
+        self.lap_start = 0.0
+        
+        # Накладка зі статистикою
+        self.overlay_visible = False
+        self.overlay_lines = []
+        self.font = get_font(SMALL_FONT_SIZE)
+        
+        # Запис повільних кадрів
+        self.capture_slow_frames = PROFILER_CAPTURE_SLOW_FRAMES
+        self.captures = 0
+        self.profile = None
+        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.capture_dir = os.path.join(script_dir, PROFILER_CAPTURE_DIR)
+    
+    def begin_frame(self):
+        """Починає вимірювання нового кадру."""
+        self.current.fill(0.0)
+        if self.capture_slow_frames and self.captures < PROFILER_MAX_CAPTURES:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.frame_start = self.lap_start = time.perf_counter()
+    
+    def lap(self, phase):
+        """
+        Записує час, що минув від попередньої позначки, у вказану фазу.
+        
+        Args:
+            phase: Назва фази з PROFILER_PHASES
+        """
+        now = time.perf_counter()
+        self.current[self.phase_columns[phase]] += (now - self.lap_start) * 1000
+        self.lap_start = now
+    
+    def end_frame(self):
+        """Завершує кадр: зберігає час у буфер та записує знімок, якщо кадр повільний."""
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.current[-1] = frame_ms
+        self.timings[self.frame_index % self.history] = self.current
+        
+        if self.profile is not None:
+            self.profile.disable()
+            if frame_ms > self.slow_frame_ms:
+                self.save_capture(frame_ms)
+            self.profile = None
+        
+        self.frame_index += 1
+        if self.overlay_visible and self.frame_index % PROFILER_OVERLAY_REFRESH == 0:
+            self.update_overlay_lines()
+    
+    def save_capture(self, frame_ms):
+        """
+        Записує cProfile-знімок поточного кадру у файл.
+        
+        Args:
+            frame_ms: Тривалість кадру в мілісекундах
+        """
+        try:
+            os.makedirs(self.capture_dir, exist_ok=True)
+            path = os.path.join(
+                self.capture_dir, f"slow_frame_{self.frame_index}_{int(frame_ms)}ms.prof")
+            self.profile.dump_stats(path)
+            self.captures += 1
+            print(f"Повільний кадр ({frame_ms:.1f} мс) записано у {path}")
+        except (IOError, OSError) as e:
+            print(f"Не вдалося записати профіль кадру: {e}")
+    
+    def get_summary(self):
+        """
+        Отримує середній та максимальний час кожної фази за період буфера.
+        
+        Returns:
+            Словник {фаза: {"mean": мс, "max": мс}}, включно з "frame"
+        """
+        filled = self.timings[:min(self.frame_index, self.history)]
+        summary = {}
+        if len(filled) == 0:
+            return summary
+        means = filled.mean(axis=0)
+        maxima = filled.max(axis=0)
+        for i, phase in enumerate(PROFILER_PHASES + ("frame",)):
+            summary[phase] = {"mean": float(means[i]), "max": float(maxima[i])}
+        return summary
+    
+    def toggle_overlay(self):
+        """Вмикає або вимикає накладку зі статистикою."""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.update_overlay_lines()
+    
+    def toggle_capture(self):
+        """Вмикає або вимикає запис повільних кадрів."""
+        self.capture_slow_frames = not self.capture_slow_frames
+    
+    def update_overlay_lines(self):
+        """Оновлює рядки накладки (не щокадру, щоб не рендерити текст постійно)."""
+        self.overlay_lines = [
+            f"{phase}: {stats['mean']:.2f} / {stats['max']:.2f} ms"
+            for phase, stats in self.get_summary().items()
+        ]
+        if self.pacer is not None:
+            jitter = self.pacer.get_jitter()
+            self.overlay_lines.append(
+                f"fps: {self.pacer.get_fps():.1f}, jitter: {jitter['mean']:.2f} / {jitter['max']:.2f} ms")
+        if self.capture_slow_frames:
+            self.overlay_lines.append(f"capture > {self.slow_frame_ms:.1f} ms: {self.captures}")
+    
+    def render(self, screen):
+        """
+        Рендеринг накладки зі статистикою фаз кадру.
+        
+        Args:
+            screen: Поверхня для рендерингу
+        
+        Returns:
+            Список перемальованих прямокутників
+        """
+        if not self.overlay_visible:
+            return []
+        
+        dirty_rects = []
+        y = screen.get_height() - 60 - len(self.overlay_lines) * 16
+        for line in self.overlay_lines:
+            text = self.text_cache.render(self.font, line, TEXT_COLOR)
+            dirty_rects.append(screen.blit(text, (10, y)))
+            y += 16
+        return dirty_rects
@@ -0,0 +1,69 @@
+import numpy as np
+from src.constants import *
+
+class QualityGovernor:
+    """
+    Регулятор якості, що утримує кадр у межах бюджету часу.
+    Стежить за тривалістю останніх кадрів і знижує рівень якості, коли
+    кадри не вміщуються в бюджет, та повертає його, коли з'являється запас.
+    """
+    def __init__(self, levels=QUALITY_LEVELS, budget_ms=1000 / FPS, window=QUALITY_WINDOW):
+        """
+        Ініціалізація регулятора.
+        
+        Args:
+            levels: Список рівнів якості від найвищого до найнижчого
+            budget_ms: Бюджет часу на кадр у мілісекундах
+            window: Кількість кадрів для усереднення
+        """
+        self.levels = levels
+        self.budget_ms = budget_ms
+        self.window = window
+        self.level = 0
+        
+        # Кільцевий буфер тривалості останніх кадрів
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.sample_count = 0
+    
+    @property
+    def settings(self):
+        """Параметри поточного рівня якості."""
+        return self.levels[self.level]
+    
+    def observe(self, frame_ms):
+        """
+        Враховує тривалість чергового кадру.
+        Рішення приймається лише після заповнення вікна, а після зміни
+        рівня вікно починається заново, щоб рівні не перемикалися щокадру.
+        
+        Args:
+            frame_ms: Час роботи кадру в мілісекундах (без очікування)
+            
+        Returns:
+            True, якщо рівень якості змінився
+        """
+        self.samples[self.sample_count % self.window] = frame_ms
+        self.sample_count += 1
+        if self.sample_count < self.window:
+            return False
+        
+        average = self.samples.mean()
+        if average > self.budget_ms * QUALITY_DOWNGRADE_RATIO and self.level < len(self.levels) - 1:
+            self.level += 1
+        elif average < self.budget_ms * QUALITY_UPGRADE_RATIO and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        
+        self.sample_count = 0
+        return True
+    
+    def set_level(self, level):
+        """
+        Встановлює рівень якості напряму (наприклад, під час відтворення запису).
+        
+        Args:
+            level: Індекс рівня в списку рівнів
+        """
+        self.level = max(0, min(level, len(self.levels) - 1))
+        self.sample_count = 0
\ No newline at end of file
@@ -0,0 +1,401 @@
+"""
+Запис та відтворення ігрових сесій.
+Записується потік подій введення з номерами кадрів, тривалість кадрів,
+зміни рівня якості, початковий стан гри та зерно генераторів випадкових
+чисел, тому відтворення дає ті самі частинки й тексти кадр у кадр.
+Відтворення виконується без вікна — швидко або в реальному часі — і
+виводить контрольну суму стану та статистику часу кадрів у форматі JSON.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+
+# Заголовок файлу запису: сигнатура, версія, зерно, ширина та висота вікна,
+# ліві та праві кліки на початку, кількість кадрів
+REPLAY_MAGIC = b"EGRP"
+REPLAY_VERSION = 3  # 2: відпускання кнопки, рух миші, коліщатко; 3: стан лівої кнопки під час руху
+REPLAY_HEADER = struct.Struct("<4sHQHHQQI")
+
+# Коди записаних подій
+EVENT_CLICK = 0
+EVENT_KEY = 1
+EVENT_RESIZE = 2
+EVENT_QUIT = 3
+EVENT_QUALITY = 4
+EVENT_BUTTON_UP = 5
+EVENT_MOTION = 6
+EVENT_WHEEL = 7
+
+# Кількість полів після коду для кожного типу події
+EVENT_FIELDS = {
+    EVENT_CLICK: 3,  # кнопка, x, y
+    EVENT_KEY: 1,  # клавіша
+    EVENT_RESIZE: 2,  # ширина, висота
+    EVENT_QUIT: 0,
+    EVENT_QUALITY: 1,  # рівень якості
+    EVENT_BUTTON_UP: 3,  # кнопка, x, y
+    EVENT_MOTION: 3,  # x, y, чи натиснута ліва кнопка
+    EVENT_WHEEL: 1  # прокрутка по вертикалі (зигзаг-кодування)
+}
+
+# У версії 2 рух миші записувався без стану кнопки
+EVENT_FIELDS_V2 = {**EVENT_FIELDS, EVENT_MOTION: 2}
+
+def write_varint(output, value):
+    """
+    Записує невід'ємне ціле число змінної довжини (по 7 біт у байті).
+    
+    Args:
+        output: bytearray для запису
+        value: Невід'ємне ціле число
+    """
+    while value >= 0x80:
+        output.append(value & 0x7F | 0x80)
+        value >>= 7
+    output.append(value)
+
+def read_varint(data, offset):
+    """
+    Читає ціле число змінної довжини.
+    
+    Args:
+        data: Байти
+        offset: Позиція початку числа
+    
+    Returns:
+        Кортеж (число, позиція після числа)
+    
+    Raises:
+        ValueError: Якщо дані закінчилися посеред числа
+    """
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Пошкоджений запис: дані обриваються посеред числа")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def encode_signed(value):
+    """
+    Перетворює ціле число зі знаком у невід'ємне (зигзаг-кодування: 0, -1, 1, -2, ...).
+    
+    Args:
+        value: Ціле число
+    
+    Returns:
+        Невід'ємне ціле число
+    """
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def decode_signed(value):
+    """
+    Обернене перетворення до encode_signed.
+    
+    Args:
+        value: Невід'ємне ціле число
+    
+    Returns:
+        Ціле число зі знаком
+    """
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+class InputRecorder:
+    """
+    Записувач ігрової сесії.
+    Крім кліків і клавіш записуються відпускання кнопки, рух миші та
+    коліщатко, тому перетягування й прокрутка списку досягнень теж
+    відтворюються. Тривалість кадру округлюється до мікросекунд ще під час гри, тому
+    відтворення подає в симуляцію точно ті самі значення.
+    """
+    def __init__(self, path, seed, width, height, left_clicks, right_clicks, achievements):
+        """
+        Ініціалізація записувача.
+        
+        Args:
+            path: Шлях до файлу запису
+            seed: Зерно генераторів випадкових чисел гри
+            width: Початкова ширина вікна
+            height: Початкова висота вікна
+            left_clicks: Ліві кліки на початку запису
+            right_clicks: Праві кліки на початку запису
+            achievements: Бітова маска отриманих досягнень на початку запису
+        """
+        self.path = path
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.left_clicks = left_clicks
+        self.right_clicks = right_clicks
+        self.achievements = achievements
+        
+        self.frames = bytearray()
+        self.frame_count = 0
+        self.pending = []  # Події, що стосуються наступного кадру (зміни якості)
+    
+    def record_frame(self, dt, events):
+        """
+        Записує кадр.
+        
+        Args:
+            dt: Тривалість кадру в секундах
+            events: Список подій pygame цього кадру
+        
+        Returns:
+            Тривалість кадру, округлена до мікросекунд (її слід передати в симуляцію)
+        """
+        import pygame
+        
+        entries = self.pending
+        self.pending = []
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                entries.append((EVENT_CLICK, event.button, max(0, event.pos[0]), max(0, event.pos[1])))
+            elif event.type == pygame.MOUSEBUTTONUP:
+                entries.append((EVENT_BUTTON_UP, event.button, max(0, event.pos[0]), max(0, event.pos[1])))
+            elif event.type == pygame.MOUSEMOTION:
+                entries.append((EVENT_MOTION, max(0, event.pos[0]), max(0, event.pos[1]), 1 if event.buttons[0] else 0))
+            elif event.type == pygame.MOUSEWHEEL:
+                entries.append((EVENT_WHEEL, encode_signed(event.y)))
+            elif event.type == pygame.KEYDOWN:
+                entries.append((EVENT_KEY, event.key))
+            elif event.type == pygame.VIDEORESIZE:
+                entries.append((EVENT_RESIZE, event.w, event.h))
+            elif event.type == pygame.QUIT:
+                entries.append((EVENT_QUIT,))
+        
+        dt_us = max(0, int(round(dt * 1000000)))
+        write_varint(self.frames, dt_us)
+        write_varint(self.frames, len(entries))
+        for entry in entries:
+            for value in entry:
+                write_varint(self.frames, value)
+        self.frame_count += 1
+        return dt_us / 1000000
+    
+    def record_quality(self, level):
+        """
+        Записує зміну рівня якості (застосовується на початку наступного кадру).
+        
+        Args:
+            level: Новий рівень якості
+        """
+        self.pending.append((EVENT_QUALITY, level))
+    
+    def save(self):
+        """Записує сесію у файл (стиснуту zlib)."""
+        header = REPLAY_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.width, self.height,
+            self.left_clicks, self.right_clicks, self.frame_count)
+        mask = self.achievements.to_bytes((self.achievements.bit_length() + 7) // 8, "little")
+        body = bytearray()
+        write_varint(body, len(mask))
+        body += mask
+        body += self.frames
+        with open(self.path, "wb") as file:
+            file.write(header + zlib.compress(bytes(body), 9))
+
+class InputReplay:
+    """
+    Відтворювач записаної сесії.
+    Видає для кожного кадру записану тривалість, події pygame та зміну якості.
+    """
+    def __init__(self, path):
+        """
+        Завантаження запису.
+        
+        Args:
+            path: Шлях до файлу запису
+        
+        Raises:
+            ValueError: Якщо файл не є записом сесії або пошкоджений
+        """
+        with open(path, "rb") as file:
+            content = file.read()
+        if len(content) < REPLAY_HEADER.size:
+            raise ValueError("Обрізаний заголовок запису")
+        (magic, version, self.seed, self.width, self.height,
+         self.left_clicks, self.right_clicks, self.frame_count) = REPLAY_HEADER.unpack_from(content)
+        # Старіші версії містять лише частину кодів подій, тому читаються так само
+        if magic != REPLAY_MAGIC or not 1 <= version <= REPLAY_VERSION:
+            raise ValueError("Невідомий формат запису")
+        self.event_fields = EVENT_FIELDS if version >= 3 else EVENT_FIELDS_V2
+        
+        try:
+            self.data = zlib.decompress(content[REPLAY_HEADER.size:])
+        except zlib.error as e:
+            raise ValueError(f"Пошкоджений запис: {e}")
+        mask_length, self.offset = read_varint(self.data, 0)
+        if self.offset + mask_length > len(self.data):
+            raise ValueError("Пошкоджений запис: обрізана маска досягнень")
+        self.achievements = int.from_bytes(self.data[self.offset:self.offset + mask_length], "little")
+        self.offset += mask_length
+        self.frame_index = 0
+    
+    def finished(self):
+        """Повертає True, якщо всі кадри вже відтворено."""
+        return self.frame_index >= self.frame_count
+    
+    def next_frame(self):
+        """
+        Читає наступний кадр.
+        
+        Returns:
+            Кортеж (тривалість кадру в секундах, список подій pygame, новий рівень якості або None)
+        
+        Raises:
+            ValueError: Якщо кадр обрізаний або містить невідомий код події
+        """
+        import pygame
+        
+        dt_us, self.offset = read_varint(self.data, self.offset)
+        count, self.offset = read_varint(self.data, self.offset)
+        events = []
+        quality_level = None
+        for _ in range(count):
+            code, self.offset = read_varint(self.data, self.offset)
+            if code not in self.event_fields:
+                raise ValueError(f"Пошкоджений запис: невідомий код події {code}")
+            fields = []
+            for _ in range(self.event_fields[code]):
+                value, self.offset = read_varint(self.data, self.offset)
+                fields.append(value)
+            if code == EVENT_CLICK:
+                events.append(pygame.event.Event(
+                    pygame.MOUSEBUTTONDOWN, button=fields[0], pos=(fields[1], fields[2])))
+            elif code == EVENT_BUTTON_UP:
+                events.append(pygame.event.Event(
+                    pygame.MOUSEBUTTONUP, button=fields[0], pos=(fields[1], fields[2])))
+            elif code == EVENT_MOTION:
+                # У версії 2 стан кнопки не записувався, а перетягування завершувало
+                # лише відпускання кнопки, тому вважаємо її натиснутою
+                left_pressed = fields[2] if len(fields) > 2 else 1
+                events.append(pygame.event.Event(
+                    pygame.MOUSEMOTION, pos=(fields[0], fields[1]), rel=(0, 0), buttons=(left_pressed, 0, 0)))
+            elif code == EVENT_WHEEL:
+                events.append(pygame.event.Event(
+                    pygame.MOUSEWHEEL, x=0, y=decode_signed(fields[0]), flipped=False))
+            elif code == EVENT_KEY:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=fields[0], mod=0, unicode="", scancode=0))
+            elif code == EVENT_RESIZE:
+                events.append(pygame.event.Event(
+                    pygame.VIDEORESIZE, w=fields[0], h=fields[1], size=(fields[0], fields[1])))
+            elif code == EVENT_QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+            elif code == EVENT_QUALITY:
+                quality_level = fields[0]
+        self.frame_index += 1
+        return dt_us / 1000000, events, quality_level
+
+def state_checksum(game, checksum=0):
+    """
+    Оновлює контрольну суму видимого стану гри: частинок, плаваючих текстів і лічильників.
+    
+    Args:
+        game: Об'єкт гри
+        checksum: Попереднє значення контрольної суми
+    
+    Returns:
+        Нове значення контрольної суми (CRC-32)
+    """
+    particles = game.animation.particles
+    count = particles.count
+    checksum = zlib.crc32(particles.positions[:count].tobytes(), checksum)
+    checksum = zlib.crc32(particles.lifetimes[:count].tobytes(), checksum)
+    checksum = zlib.crc32(particles.colors[:count].tobytes(), checksum)
+    checksum = zlib.crc32(particles.sizes[:count].tobytes(), checksum)
+    texts = [(text["pos"][0], text["pos"][1], text["alpha"], text["surface"].get_width())
+             for text in game.animation.floating_texts]
+    state = (game.left_clicks, game.right_clicks, game.animation.click_scale, texts)
+    return zlib.crc32(repr(state).encode("utf-8"), checksum)
+
+def run_replay(path, realtime=False):
+    """
+    Відтворює запис без вікна.
+    
+    Args:
+        path: Шлях до файлу запису
+        realtime: Відтворювати з записаною швидкістю замість максимальної
+    
+    Returns:
+        Словник з результатами відтворення
+    """
+    import pygame
+    from src.game import Game
+    from src.benchmark import summarize
+    
+    replay = InputReplay(path)
+    game = Game(replay.width, replay.height, persist_progress=False, seed=replay.seed)
+    game.start_replay(replay)
+    
+    frame_times = []
+    checksum = 0
+    start = time.perf_counter()
+    elapsed_recorded = 0.0
+    while not replay.finished():
+        frame_start = time.perf_counter()
+        game.frame()
+        frame_times.append((time.perf_counter() - frame_start) * 1000)
+        checksum = state_checksum(game, checksum)
+        
+        if realtime:
+            # Чекаємо, доки реальний час не наздожене записаний
+            elapsed_recorded += game.replay_dt
+            delay = start + elapsed_recorded - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    
+    result = {
+        "frames": replay.frame_count,
+        "checksum": f"{checksum:08x}",
+        "total_clicks": game.left_clicks + game.right_clicks,
+        "frame_time_ms": summarize(frame_times),
+        "phase_ms": game.profiler.get_summary()
+    }
+    pygame.quit()
+    return result
+
+def main(argv=None):
+    """
+    Точка входу відтворення.
+    
+    Args:
+        argv: Аргументи командного рядка
+    """
+    parser = argparse.ArgumentParser(description="Відтворення записаної сесії гри з баклажаном")
+    parser.add_argument("path", help="Файл запису")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Відтворювати з записаною швидкістю замість максимальної")
+    parser.add_argument("--output", help="Файл для результатів (за замовчуванням stdout)")
+    args = parser.parse_args(argv)
+    
+    # Фіктивні драйвери дозволяють відтворювати сесію без вікна та звуку
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    
+    try:
+        result = run_replay(args.path, args.realtime)
+    except (IOError, ValueError) as e:
+        print(f"Не вдалося відтворити запис: {e}", file=sys.stderr)
+        return 1
+    
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
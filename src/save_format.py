@@ -0,0 +1,199 @@
+"""
+Формат файлу збереження.
+
+Поточна версія (2) зберігає:
+    left_clicks, right_clicks, journal_sequence — цілі числа;
+    achievements — множина отриманих досягнень як бітова маска
+        (біт з номером id встановлено, якщо досягнення з цим id отримано);
+    будь-які інші поля без змін.
+
+Підтримуються два кодування: JSON (маска в base64) та компактне двійкове.
+Старі збереження без поля version (версія 1, список словників досягнень
+з назвами) переводяться в поточну версію через migrate_save.
+"""
+
+import json
+import base64
+import struct
+
+SAVE_FORMAT_VERSION = 2
+
+# Заголовок двійкового формату: сигнатура, версія, ліві кліки, праві кліки,
+# номер журналу, довжина бітової маски, довжина JSON з додатковими полями
+BINARY_MAGIC = b"EGGS"
+BINARY_HEADER = struct.Struct("<4sHQQQII")
+
+# Поля, що зберігаються в заголовку двійкового формату
+HEADER_FIELDS = ("version", "left_clicks", "right_clicks", "journal_sequence", "achievements")
+
+def bitset_to_bytes(bits):
+    """
+    Перетворює бітову маску на байти (little-endian).
+    
+    Args:
+        bits: Ціле число з бітовою маскою
+    
+    Returns:
+        Байти маски
+    """
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+def bitset_from_bytes(data):
+    """
+    Відновлює бітову маску з байтів (little-endian).
+    
+    Args:
+        data: Байти маски
+    
+    Returns:
+        Ціле число з бітовою маскою
+    """
+    return int.from_bytes(data, "little")
+
+def iterate_bits(bits):
+    """
+    Перелічує номери встановлених бітів маски.
+    
+    Args:
+        bits: Ціле число з бітовою маскою
+    
+    Returns:
+        Генератор номерів бітів у порядку зростання
+    """
+    for byte_index, byte in enumerate(bitset_to_bytes(bits)):
+        if byte:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield byte_index * 8 + bit
+
+def encode_save(data, binary=False):
+    """
+    Кодує збереження поточної версії.
+    
+    Args:
+        data: Словник збереження (achievements — бітова маска)
+        binary: Використовувати двійкове кодування замість JSON
+    
+    Returns:
+        Байти для запису у файл
+    """
+    extras = {key: value for key, value in data.items() if key not in HEADER_FIELDS}
+    
+    if binary:
+        mask = bitset_to_bytes(data.get("achievements", 0))
+        extras_json = json.dumps(extras).encode("utf-8") if extras else b""
+        header = BINARY_HEADER.pack(
+            BINARY_MAGIC,
+            SAVE_FORMAT_VERSION,
+            data.get("left_clicks", 0),
+            data.get("right_clicks", 0),
+            data.get("journal_sequence", 0),
+            len(mask),
+            len(extras_json)
+        )
+        return header + mask + extras_json
+    
+    document = {
+        "version": SAVE_FORMAT_VERSION,
+        "left_clicks": data.get("left_clicks", 0),
+        "right_clicks": data.get("right_clicks", 0),
+        "journal_sequence": data.get("journal_sequence", 0),
+        "achievements": base64.b64encode(bitset_to_bytes(data.get("achievements", 0))).decode("ascii")
+    }
+    document.update(extras)
+    return json.dumps(document).encode("utf-8")
+
+def decode_save(content):
+    """
+    Декодує збереження з байтів (кодування визначається автоматично).
+    Збереження старих версій повертаються як є — їх слід передати в migrate_save.
+    
+    Args:
+        content: Вміст файлу збереження
+    
+    Returns:
+        Словник збереження
+    
+    Raises:
+        ValueError: Якщо вміст пошкоджено
+    """
+    if content.startswith(BINARY_MAGIC):
+        if len(content) < BINARY_HEADER.size:
+            raise ValueError("Обрізаний заголовок збереження")
+        magic, version, left, right, sequence, mask_length, extras_length = \
+            BINARY_HEADER.unpack_from(content)
+        offset = BINARY_HEADER.size
+        if len(content) < offset + mask_length + extras_length:
+            raise ValueError("Обрізане збереження")
+        data = {}
+        if extras_length:
+            data.update(json.loads(content[offset + mask_length:offset + mask_length + extras_length]))
+        data.update({
+            "version": version,
+            "left_clicks": left,
+            "right_clicks": right,
+            "journal_sequence": sequence,
+            "achievements": bitset_from_bytes(content[offset:offset + mask_length])
+        })
+        return data
+    
+    data = json.loads(content.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("Невірна структура збереження")
+    if data.get("version", 1) >= 2:
+        data["achievements"] = bitset_from_bytes(base64.b64decode(data.get("achievements", "")))
+    return data
+
+def migrate_v1_to_v2(data, ids_by_name):
+    """
+    Переводить збереження версії 1 у версію 2.
+    Версія 1 зберігала отримані досягнення списком словників з назвою
+    (а пізніше ще й з id); назви зіставляються з id за словником.
+    
+    Args:
+        data: Словник збереження версії 1
+        ids_by_name: Словник {назва будь-якою мовою: id досягнення}
+    
+    Returns:
+        Словник збереження версії 2
+    """
+    bits = 0
+    for saved in data.get("achievements", []):
+        achievement_id = saved.get("id")
+        if achievement_id is None:
+            achievement_id = ids_by_name.get(saved.get("name"))
+        if achievement_id is not None:
+            bits |= 1 << achievement_id
+    
+    migrated = dict(data)
+    migrated["version"] = 2
+    migrated["achievements"] = bits
+    migrated.setdefault("journal_sequence", 0)
+    return migrated
+
+# Міграції: версія -> функція переходу на наступну версію
+MIGRATIONS = {
+    1: migrate_v1_to_v2
+}
+
+def migrate_save(data, ids_by_name):
+    """
+    Послідовно застосовує міграції, доки збереження не досягне поточної версії.
+    
+    Args:
+        data: Декодований словник збереження будь-якої версії
+        ids_by_name: Словник {назва будь-якою мовою: id досягнення}
+    
+    Returns:
+        Словник збереження поточної версії
+    
+    Raises:
+        ValueError: Якщо версія збереження новіша за підтримувану
+    """
+    version = data.get("version", 1)
+    if version > SAVE_FORMAT_VERSION:
+        raise ValueError(f"Непідтримувана версія збереження: {version}")
+    while version < SAVE_FORMAT_VERSION:
+        data = MIGRATIONS[version](data, ids_by_name)
+        version = data["version"]
+    return data
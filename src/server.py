@@ -0,0 +1,205 @@
+"""
+Сервер спільного лічильника для локальної гри кількох гравців.
+Клієнти надсилають прирости кліків, накопичені за свій такт, а сервер
+додає їх до спільного лічильника, перевіряє досягнення тим самим індексом,
+що й гра, і з фіксованою частотою розсилає всім клієнтам один знімок стану.
+
+Протокол — текстові рядки:
+    клієнт -> сервер: "n <ім'я>" — ім'я гравця для таблиці лідерів
+                      "d <ліві> <праві>" — приріст кліків за такт
+    сервер -> клієнт: JSON-знімок стану в одному рядку
+"""
+
+import sys
+import json
+import heapq
+import asyncio
+import argparse
+from src.constants import *
+from src.achievement_index import AchievementIndex, load_achievement_definitions
+
+class ClickServer:
+    """
+    Асинхронний сервер спільного лічильника кліків.
+    Повідомлення клієнтів лише збільшують лічильники; вся інша робота
+    (досягнення, таблиця лідерів, кодування JSON) виконується раз за такт
+    розсилки, а не для кожного повідомлення, тому сервер витримує тисячі
+    клієнтів на одному ядрі.
+    """
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, snapshot_rate=SERVER_SNAPSHOT_RATE, definitions=None):
+        """
+        Ініціалізація сервера.
+        
+        Args:
+            host: Адреса для прослуховування
+            port: Порт
+            snapshot_rate: Частота розсилки знімків, разів на секунду
+            definitions: Визначення досягнень (за замовчуванням з файлу даних)
+        """
+        self.host = host
+        self.port = port
+        self.snapshot_rate = snapshot_rate
+        
+        # Спільний стан гри
+        if definitions is None:
+            definitions = load_achievement_definitions()
+        self.index = AchievementIndex(definitions)
+        self.left_clicks = 0
+        self.right_clicks = 0
+        
+        # Підключені клієнти: {writer: {"name": ім'я, "clicks": кліки}}
+        self.clients = {}
+        self.next_client_id = 1
+        
+        # Стан розсилки
+        self.changed = False
+        self.tick = 0
+        self.snapshots_sent = 0
+        self.snapshots_skipped = 0
+    
+    async def handle_client(self, reader, writer):
+        """
+        Обслуговує з'єднання одного клієнта.
+        
+        Args:
+            reader: Потік читання asyncio
+            writer: Потік запису asyncio
+        """
+        client = {"name": f"Гравець {self.next_client_id}", "clicks": 0}
+        self.next_client_id += 1
+        self.clients[writer] = client
+        self.changed = True
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.handle_message(client, line)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            del self.clients[writer]
+            self.changed = True
+            writer.close()
+    
+    def handle_message(self, client, line):
+        """
+        Обробляє одне повідомлення клієнта.
+        Некоректні повідомлення ігноруються.
+        
+        Args:
+            client: Стан клієнта
+            line: Рядок повідомлення (байти)
+        """
+        parts = line.split(None, 1)
+        if not parts:
+            return
+        if parts[0] == b"d":
+            try:
+                left, right = (int(value) for value in parts[1].split())
+            except (IndexError, ValueError):
+                return
+            if not (0 <= left <= SERVER_MAX_DELTA and 0 <= right <= SERVER_MAX_DELTA):
+                return
+            self.left_clicks += left
+            self.right_clicks += right
+            client["clicks"] += left + right
+            self.changed = True
+        elif parts[0] == b"n" and len(parts) == 2:
+            client["name"] = parts[1].strip().decode("utf-8", "replace")[:32]
+            self.changed = True
+    
+    def build_snapshot(self):
+        """
+        Перевіряє досягнення та кодує знімок стану.
+        
+        Returns:
+            Байти знімка (JSON-рядок із символом нового рядка)
+        """
+        total_clicks = self.left_clicks + self.right_clicks
+        unlocked = self.index.unlock_up_to(total_clicks)
+        leaders = heapq.nlargest(LEADERBOARD_SIZE, self.clients.values(), key=lambda client: client["clicks"])
+        snapshot = {
+            "tick": self.tick,
+            "left_clicks": self.left_clicks,
+            "right_clicks": self.right_clicks,
+            "total": total_clicks,
+            "players": len(self.clients),
+            "achievements": self.index.cursor,
+            "next_milestone": self.index.next_milestone(),
+            "unlocked": [
+                {"id": achievement["id"], "name": achievement["names"].get(DEFAULT_LANGUAGE, "")}
+                for achievement in unlocked
+            ],
+            "leaderboard": [[client["name"], client["clicks"]] for client in leaders]
+        }
+        return (json.dumps(snapshot, ensure_ascii=False) + "\n").encode("utf-8")
+    
+    def broadcast(self):
+        """
+        Розсилає знімок стану всім клієнтам, якщо стан змінився.
+        Знімок кодується один раз; клієнти з переповненою чергою запису
+        пропускають його, бо наступний знімок все одно містить повний стан.
+        """
+        self.tick += 1
+        if not self.changed:
+            return
+        self.changed = False
+        data = self.build_snapshot()
+        for writer in self.clients:
+            if writer.transport.get_write_buffer_size() > SERVER_MAX_WRITE_BUFFER:
+                self.snapshots_skipped += 1
+                continue
+            writer.write(data)
+            self.snapshots_sent += 1
+    
+    async def broadcast_loop(self):
+        """Цикл розсилки знімків з фіксованою частотою."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.snapshot_rate
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Сервер не встигає — пропускаємо такти замість накопичення відставання
+                next_tick = loop.time()
+            self.broadcast()
+    
+    async def serve(self):
+        """Запускає сервер і працює до скасування."""
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        broadcaster = asyncio.create_task(self.broadcast_loop())
+        print(f"Сервер слухає {self.host}:{self.port}, розсилка {self.snapshot_rate} разів на секунду")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            broadcaster.cancel()
+
+def main(argv=None):
+    """
+    Точка входу сервера.
+    
+    Args:
+        argv: Аргументи командного рядка
+    """
+    parser = argparse.ArgumentParser(description="Сервер спільного лічильника гри з баклажаном")
+    parser.add_argument("--host", default=SERVER_HOST, help="Адреса (0.0.0.0 — доступ з локальної мережі)")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Порт")
+    parser.add_argument("--rate", type=float, default=SERVER_SNAPSHOT_RATE,
+                        help="Частота розсилки знімків, разів на секунду")
+    args = parser.parse_args(argv)
+    
+    server = ClickServer(args.host, args.port, args.rate)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    print(f"Сервер зупинено. Всього кліків: {server.left_clicks + server.right_clicks}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
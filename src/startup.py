@@ -0,0 +1,60 @@
+import time
+
+class StartupTimer:
+    """
+    Вимірювач часу запуску гри.
+    Запам'ятовує позначки етапів від початку імпорту до першого
+    показаного кадру та виводить їх тривалість.
+    """
+    def __init__(self, start=None):
+        """
+        Ініціалізація вимірювача.
+        
+        Args:
+            start: Момент початку відліку (time.perf_counter), за замовчуванням зараз
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.stages = []
+        self.finished = False
+    
+    def mark(self, stage):
+        """
+        Завершує етап запуску.
+        
+        Args:
+            stage: Назва етапу
+        """
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self.last) * 1000))
+        self.last = now
+    
+    def get_total(self):
+        """
+        Отримує загальний час від початку відліку до останньої позначки.
+        
+        Returns:
+            Час у мілісекундах
+        """
+        return (self.last - self.start) * 1000
+    
+    def finish(self, stage, report=True):
+        """
+        Завершує вимірювання останнім етапом. Повторні виклики ігноруються.
+        
+        Args:
+            stage: Назва останнього етапу
+            report: Чи виводити тривалість етапів
+        """
+        if self.finished:
+            return
+        self.mark(stage)
+        self.finished = True
+        if report:
+            self.report()
+    
+    def report(self):
+        """Виводить тривалість етапів запуску."""
+        print(f"Час запуску: {self.get_total():.1f} мс")
+        for stage, duration in self.stages:
+            print(f"  {stage}: {duration:.1f} мс")
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from src.constants import *
+
+class TextCache:
+    """
+    Обмежений LRU-кеш відрендерених текстових поверхонь.
+    Ключ кешу: (шрифт, текст, колір, згладжування).
+    Повернуті поверхні спільні для всіх користувачів кешу, тому їх не можна
+    змінювати напряму (наприклад, через set_alpha) — лише через копію.
+    """
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        """
+        Ініціалізація кешу.
+        
+        Args:
+            max_size: Максимальна кількість поверхонь у кеші
+        """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        
+        # Лічильники для оцінки ефективності кешу
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def render(self, font, text, color, antialias=True):
+        """
+        Повертає поверхню з текстом, рендерячи її лише за відсутності в кеші.
+        
+        Args:
+            font: Шрифт pygame
+            text: Текст для рендерингу
+            color: Колір тексту
+            antialias: Чи використовувати згладжування
+        
+        Returns:
+            Поверхня з текстом
+        """
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        
+        # Витісняємо найдавніше використану поверхню
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+    
+    def clear(self):
+        """Очищає кеш (лічильники не скидаються)."""
+        self.surfaces.clear()
+    
+    def get_stats(self):
+        """
+        Отримує статистику використання кешу.
+        
+        Returns:
+            Словник з кількістю влучань, промахів, витіснень та розміром кешу
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.surfaces)
+        }
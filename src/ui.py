@@ -1,281 +1,613 @@
-import pygame
-from src.constants import *
-
-class UI:
-    """
-    Клас для відображення всіх елементів інтерфейсу користувача.
-    """
-    def __init__(self, screen, width, height, language_manager):
-        """
-        Ініціалізація інтерфейсу користувача.
-        
-        Args:
-            screen: Поверхня для рендерингу
-            width: Ширина екрану
-            height: Висота екрану
-            language_manager: Менеджер мови
-        """
-        self.screen = screen
-        self.width = width
-        self.height = height
-        self.language_manager = language_manager
-        
-        # Ініціалізація шрифтів
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.large_font = pygame.font.Font(None, LARGE_FONT_SIZE)
-        self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
-        
-        # Створення кнопок (тільки кнопка досягнень)
-        self.achievements_button_rect = pygame.Rect(self.width - BUTTON_WIDTH - 10, 10, BUTTON_WIDTH, BUTTON_HEIGHT)
-        self.close_button_rect = pygame.Rect(0, 0, BUTTON_WIDTH, BUTTON_HEIGHT)  # Позиція буде оновлена при рендерингу панелі
-    
-    def update_screen_size(self, width, height):
-        """
-        Оновлення розмірів екрану після зміни розміру вікна.
-        
-        Args:
-            width: Нова ширина екрану
-            height: Нова висота екрану
-        """
-        self.width = width
-        self.height = height
-        
-        # Оновлення позицій кнопок
-        self.achievements_button_rect = pygame.Rect(self.width - BUTTON_WIDTH - 10, 10, BUTTON_WIDTH, BUTTON_HEIGHT)
-    
-    def render(self, left_clicks, right_clicks, total_clicks, achievements):
-        """
-        Рендеринг усіх елементів інтерфейсу.
-        
-        Args:
-            left_clicks: Кількість лівих кліків
-            right_clicks: Кількість правих кліків
-            total_clicks: Загальна кількість кліків
-            achievements: Об'єкт системи досягнень
-        """
-        self.draw_score(left_clicks, right_clicks, total_clicks)
-        self.draw_progress_bar(total_clicks, achievements.achievements)
-        self.draw_help_text()
-        self.draw_buttons()
-    
-    def draw_score(self, left_clicks, right_clicks, total_clicks):
-        """
-        Рендеринг рахунку кліків.
-        
-        Args:
-            left_clicks: Кількість лівих кліків
-            right_clicks: Кількість правих кліків
-            total_clicks: Загальна кількість кліків
-        """
-        # Рядок із загальною статистикою
-        stats_text = self.font.render(
-            f"{self.language_manager.get_text('left_clicks')}: {left_clicks} | {self.language_manager.get_text('right_clicks')}: {right_clicks} | {self.language_manager.get_text('total')}: {total_clicks}", 
-            True, 
-            TEXT_COLOR
-        )
-        self.screen.blit(stats_text, (10, 10))
-    
-    def draw_progress_bar(self, total_clicks, achievements):
-        """
-        Рендеринг прогрес-бару до наступного досягнення.
-        
-        Args:
-            total_clicks: Загальна кількість кліків
-            achievements: Список досягнень
-        """
-        # Знаходимо наступне досягнення
-        next_milestone = 10
-        next_achievement_name = ""
-        for achievement in achievements:
-            if not achievement["achieved"]:
-                next_milestone = achievement["threshold"]
-                next_achievement_name = achievement["name"]
-                break
-        
-        # Якщо пройдено всі досягнення, показуємо прогрес до "наступних 100 кліків"
-        if total_clicks >= achievements[-1]["threshold"]:
-            current_hundred = (total_clicks // 100) * 100
-            next_milestone = current_hundred + 100
-        
-        # Обчислюємо прогрес до наступного досягнення
-        if next_milestone > 0:
-            if total_clicks >= next_milestone:
-                progress = 1.0
-            else:
-                # Для плавності використовуємо прогрес від останнього досягнення
-                last_milestone = 0
-                for achievement in achievements:
-                    if achievement["threshold"] < next_milestone and achievement["threshold"] > last_milestone:
-                        last_milestone = achievement["threshold"]
-                
-                total_range = next_milestone - last_milestone
-                current_progress = total_clicks - last_milestone
-                progress = current_progress / total_range
-        else:
-            progress = 1.0
-        
-        # Малюємо прогрес-бар
-        pygame.draw.rect(
-            self.screen, 
-            PROGRESS_BAR_BG_COLOR, 
-            (10, 40, PROGRESS_BAR_WIDTH, PROGRESS_BAR_HEIGHT)
-        )
-        
-        pygame.draw.rect(
-            self.screen, 
-            PROGRESS_BAR_FILL_COLOR, 
-            (10, 40, int(PROGRESS_BAR_WIDTH * progress), PROGRESS_BAR_HEIGHT)
-        )
-        
-        # Текст із прогресом
-        progress_text = self.font.render(
-            f"{total_clicks}/{next_milestone}", 
-            True, 
-            TEXT_COLOR
-        )
-        self.screen.blit(progress_text, (PROGRESS_BAR_WIDTH + 20, 40))
-        
-        # Додаємо назву наступного досягнення, якщо воно є
-        if next_achievement_name:
-            next_achievement_text = self.small_font.render(
-                next_achievement_name, 
-                True, 
-                TEXT_COLOR
-            )
-            self.screen.blit(next_achievement_text, (10, PROGRESS_BAR_HEIGHT + 45))
-    
-    def draw_help_text(self):
-        """Рендеринг тексту з підказками."""
-        help_text = self.font.render(
-            self.language_manager.get_text("help_text"), 
-            True, 
-            TEXT_COLOR
-        )
-        self.screen.blit(
-            help_text, 
-            (self.width // 2 - help_text.get_width() // 2, self.height - 30)
-        )
-    
-    def draw_buttons(self):
-        """Рендеринг кнопок інтерфейсу."""
-        # Кнопка досягнень
-        pygame.draw.rect(
-            self.screen,
-            BUTTON_COLOR,
-            self.achievements_button_rect
-        )
-        achievements_text = self.font.render(
-            self.language_manager.get_text("achievements_button"),
-            True,
-            BUTTON_TEXT_COLOR
-        )
-        self.screen.blit(
-            achievements_text,
-            (self.achievements_button_rect.centerx - achievements_text.get_width() // 2,
-             self.achievements_button_rect.centery - achievements_text.get_height() // 2)
-        )
-    
-    def render_achievements_panel(self, achievements, total_clicks):
-        """
-        Рендеринг панелі зі списком досягнень.
-        
-        Args:
-            achievements: Список досягнень
-            total_clicks: Загальна кількість кліків
-        """
-        # Створюємо напівпрозору панель на весь екран
-        panel_surface = pygame.Surface((self.width, self.height))
-        panel_surface.fill((0, 0, 0))
-        panel_surface.set_alpha(200)  # Напівпрозорість
-        self.screen.blit(panel_surface, (0, 0))
-        
-        # Вікно досягнень
-        panel_width = min(self.width - 100, 600)
-        panel_height = min(self.height - 100, 400)
-        panel_x = (self.width - panel_width) // 2
-        panel_y = (self.height - panel_height) // 2
-        
-        pygame.draw.rect(
-            self.screen,
-            ACHIEVEMENTS_BG_COLOR,
-            (panel_x, panel_y, panel_width, panel_height)
-        )
-        pygame.draw.rect(
-            self.screen,
-            (200, 200, 200),  # Світло-сірий обідок
-            (panel_x, panel_y, panel_width, panel_height),
-            2  # Товщина обідка
-        )
-        
-        # Заголовок
-        title_text = self.large_font.render(
-            self.language_manager.get_text("achievements_title"),
-            True,
-            ACHIEVEMENT_COLOR
-        )
-        self.screen.blit(
-            title_text,
-            (panel_x + (panel_width - title_text.get_width()) // 2, panel_y + 20)
-        )
-        
-        # Список досягнень
-        unlocked_achievements = [a for a in achievements if a["achieved"]]
-        if not unlocked_achievements:
-            # Якщо немає розблокованих досягнень
-            no_achievements_text = self.font.render(
-                self.language_manager.get_text("no_achievements"),
-                True,
-                TEXT_COLOR
-            )
-            self.screen.blit(
-                no_achievements_text,
-                (panel_x + (panel_width - no_achievements_text.get_width()) // 2, 
-                 panel_y + panel_height // 2 - no_achievements_text.get_height() // 2)
-            )
-        else:
-            # Виводимо список розблокованих досягнень
-            y_offset = panel_y + 70
-            for achievement in unlocked_achievements:
-                achievement_text = self.font.render(
-                    achievement["name"],
-                    True,
-                    ACHIEVEMENT_COLOR
-                )
-                self.screen.blit(achievement_text, (panel_x + 20, y_offset))
-                y_offset += 30
-            
-            # Виводимо заблоковані досягнення
-            y_offset += 20  # Додатковий відступ
-            for achievement in achievements:
-                if not achievement["achieved"]:
-                    # Використовуємо текст для заблокованого досягнення
-                    locked_text = self.small_font.render(
-                        self.language_manager.get_text("locked_achievement").format(achievement["threshold"]),
-                        True,
-                        (150, 150, 150)  # Сірий колір для заблокованих
-                    )
-                    self.screen.blit(locked_text, (panel_x + 20, y_offset))
-                    y_offset += 25
-        
-        # Кнопка "Закрити"
-        self.close_button_rect = pygame.Rect(
-            panel_x + panel_width - BUTTON_WIDTH - 10,
-            panel_y + panel_height - BUTTON_HEIGHT - 10,
-            BUTTON_WIDTH,
-            BUTTON_HEIGHT
-        )
-        pygame.draw.rect(
-            self.screen,
-            BUTTON_COLOR,
-            self.close_button_rect
-        )
-        close_text = self.font.render(
-            self.language_manager.get_text("close_button"),
-            True,
-            BUTTON_TEXT_COLOR
-        )
-        self.screen.blit(
-            close_text,
-            (self.close_button_rect.centerx - close_text.get_width() // 2,
-             self.close_button_rect.centery - close_text.get_height() // 2)
-        )
\ No newline at end of file
+import pygame
+from src.constants import *
+from src.fonts import get_font
+from src.glyph_atlas import GlyphAtlas
+
+class UI:
+    """
+    Клас для відображення всіх елементів інтерфейсу користувача.
+    """
+    def __init__(self, screen, width, height, language_manager, text_cache):
+        """
+        Ініціалізація інтерфейсу користувача.
+        
+        Args:
+            screen: Поверхня для рендерингу
+            width: Ширина екрану
+            height: Висота екрану
+            language_manager: Менеджер мови
+            text_cache: Спільний кеш текстових поверхонь
+        """
+        self.screen = screen
+        self.width = width
+        self.height = height
+        self.language_manager = language_manager
+        self.text_cache = text_cache
+        
+        # Ініціалізація шрифтів
+        self.font = get_font(FONT_SIZE)
+        self.large_font = get_font(LARGE_FONT_SIZE)
+        self.small_font = get_font(SMALL_FONT_SIZE)
+        
+        # Атлас гліфів для рядків з лічильниками
+        self.glyph_atlas = GlyphAtlas(self.font, TEXT_COLOR, language_manager.get_text("thousands_separator"))
+        
+        # Створення кнопок (тільки кнопка досягнень)
+        self.achievements_button_rect = pygame.Rect(self.width - BUTTON_WIDTH - 10, 10, BUTTON_WIDTH, BUTTON_HEIGHT)
+        self.close_button_rect = pygame.Rect(0, 0, BUTTON_WIDTH, BUTTON_HEIGHT)  # Позиція буде оновлена при рендерингу панелі
+        
+        # Кеш готової панелі досягнень (рамка без списку) та затемнення
+        self.panel_surface = None
+        self.panel_key = None
+        self.overlay_surface = None
+        
+        # Віртуалізований список досягнень: малюються лише рядки у видимій області.
+        # Поверхні рядків, що вийшли з області, повертаються в пул і перевикористовуються.
+        self.panel_viewport = pygame.Rect(0, 0, 0, 0)
+        self.panel_scroll = 0
+        self.panel_rows_revision = None
+        self.unlocked_rows = []
+        self.locked_rows = []
+        self.row_surfaces = {}
+        self.row_pool = {}
+        
+        # Перетягування списку мишею
+        self.panel_dragging = False
+        self.drag_start_y = 0
+        self.drag_start_scroll = 0
+        
+        # Ключі вмісту та прямокутники елементів з останнього малювання, а також
+        # елементи, вибрані для перемальовування в поточному кадрі (None — усі)
+        self.element_keys = {}
+        self.element_rects = {}
+        self.redraw_elements = None
+        
+        # Після зміни мови кешовані підписи потрібно перерендерити
+        language_manager.subscribe(self.on_language_changed)
+    
+    def on_language_changed(self, language):
+        """
+        Скидає кешовані підписи після зміни мови.
+        
+        Args:
+            language: Код нової мови
+        """
+        self.glyph_atlas.reset(self.language_manager.get_text("thousands_separator"))
+        self.panel_surface = None
+        self.panel_key = None
+        self.element_keys = {}
+        self.recycle_rows()
+    
+    def update_screen_size(self, width, height):
+        """
+        Оновлення розмірів екрану після зміни розміру вікна.
+        
+        Args:
+            width: Нова ширина екрану
+            height: Нова висота екрану
+        """
+        self.width = width
+        self.height = height
+        
+        # Оновлення позицій кнопок
+        self.achievements_button_rect = pygame.Rect(self.width - BUTTON_WIDTH - 10, 10, BUTTON_WIDTH, BUTTON_HEIGHT)
+    
+    def render(self, left_clicks, right_clicks, total_clicks, achievements, clicks_per_second=0):
+        """
+        Рендеринг усіх елементів інтерфейсу.
+        
+        Args:
+            left_clicks: Кількість лівих кліків
+            right_clicks: Кількість правих кліків
+            total_clicks: Загальна кількість кліків
+            achievements: Об'єкт системи досягнень
+            clicks_per_second: Поточна кількість кліків за секунду
+            
+        Малюються всі елементи або лише вибрані попереднім викликом plan_redraw.
+        
+        Returns:
+            Список прямокутників, які були перемальовані
+        """
+        keys = self.get_element_keys(left_clicks, right_clicks, total_clicks, achievements, clicks_per_second)
+        elements = (
+            ("score", self.draw_score, (left_clicks, right_clicks, total_clicks, clicks_per_second)),
+            ("progress", self.draw_progress_bar, (total_clicks, achievements)),
+            ("help", self.draw_help_text, ()),
+            ("buttons", self.draw_buttons, ())
+        )
+        dirty_rects = []
+        for name, draw, args in elements:
+            if self.redraw_elements is not None and name not in self.redraw_elements:
+                continue
+            rects = draw(*args)
+            self.element_keys[name] = keys[name]
+            self.element_rects[name] = rects
+            dirty_rects += rects
+        self.redraw_elements = None
+        return dirty_rects
+    
+    def get_element_keys(self, left_clicks, right_clicks, total_clicks, achievements, clicks_per_second):
+        """
+        Значення, від яких залежить вигляд кожного елемента інтерфейсу.
+        
+        Args:
+            left_clicks: Кількість лівих кліків
+            right_clicks: Кількість правих кліків
+            total_clicks: Загальна кількість кліків
+            achievements: Об'єкт системи досягнень
+            clicks_per_second: Поточна кількість кліків за секунду
+        
+        Returns:
+            Словник {назва елемента: ключ}
+        """
+        return {
+            "score": (left_clicks, right_clicks, total_clicks, int(round(clicks_per_second))),
+            "progress": (total_clicks, achievements.revision),
+            "help": (self.width, self.height),
+            "buttons": tuple(self.achievements_button_rect)
+        }
+    
+    def plan_redraw(self, left_clicks, right_clicks, total_clicks, achievements, clicks_per_second, damage):
+        """
+        Вибирає елементи для наступного render у режимі часткового перемальовування:
+        ті, що змінилися, і ті, що перетинаються з пошкодженими ділянками.
+        Незмінні елементи поза цими ділянками лишаються на екрані з попереднього кадру.
+        
+        Args:
+            left_clicks: Кількість лівих кліків
+            right_clicks: Кількість правих кліків
+            total_clicks: Загальна кількість кліків
+            achievements: Об'єкт системи досягнень
+            clicks_per_second: Поточна кількість кліків за секунду
+            damage: Прямокутники, які в цьому кадрі очищаються або перемальовуються під інтерфейсом
+        
+        Returns:
+            Старі прямокутники вибраних елементів, які потрібно очистити перед малюванням
+        """
+        keys = self.get_element_keys(left_clicks, right_clicks, total_clicks, achievements, clicks_per_second)
+        damage = list(damage)
+        self.redraw_elements = set()
+        stale_rects = []
+        # Очищення старого місця одного елемента може зачепити сусідній, тому повторюємо до стабілізації
+        changed = True
+        while changed:
+            changed = False
+            for name, key in keys.items():
+                if name in self.redraw_elements:
+                    continue
+                rects = self.element_rects.get(name)
+                if (rects is None or self.element_keys.get(name) != key
+                        or any(rect.collidelist(damage) != -1 for rect in rects)):
+                    self.redraw_elements.add(name)
+                    if rects:
+                        stale_rects += rects
+                        damage += rects
+                    changed = True
+        return stale_rects
+    
+    def draw_score(self, left_clicks, right_clicks, total_clicks, clicks_per_second=0):
+        """
+        Рендеринг рахунку кліків і поточної швидкості кліків.
+        
+        Args:
+            left_clicks: Кількість лівих кліків
+            right_clicks: Кількість правих кліків
+            total_clicks: Загальна кількість кліків
+            clicks_per_second: Поточна кількість кліків за секунду
+            
+        Returns:
+            Список перемальованих прямокутників
+        """
+        # Рядки зі статистикою складаються з готових гліфів
+        return [
+            self.glyph_atlas.draw(self.screen, (10, 10), [
+                self.language_manager.get_text("score_left_prefix"), left_clicks,
+                self.language_manager.get_text("score_right_prefix"), right_clicks,
+                self.language_manager.get_text("score_total_prefix"), total_clicks
+            ]),
+            # Швидкість кліків — у вільному лівому нижньому куті, над підказкою
+            self.glyph_atlas.draw(self.screen, (10, self.height - 60), [
+                self.language_manager.get_text("cps_prefix"), int(round(clicks_per_second))
+            ])
+        ]
+    
+    def draw_progress_bar(self, total_clicks, achievements):
+        """
+        Рендеринг прогрес-бару до наступного досягнення.
+        
+        Args:
+            total_clicks: Загальна кількість кліків
+            achievements: Об'єкт системи досягнень
+            
+        Returns:
+            Список перемальованих прямокутників
+        """
+        # Наступне та попереднє досягнення беремо з індексу за O(1)
+        index = achievements.index
+        next_achievement = index.next_achievement()
+        if next_achievement is not None:
+            next_milestone = next_achievement["threshold"]
+            next_achievement_name = next_achievement["name"]
+            last_milestone = index.previous_milestone()
+        else:
+            # Якщо пройдено всі досягнення, показуємо прогрес до "наступних 100 кліків"
+            current_hundred = (total_clicks // 100) * 100
+            next_milestone = current_hundred + 100
+            next_achievement_name = ""
+            last_milestone = index.last_milestone()
+        
+        # Обчислюємо прогрес до наступного досягнення
+        if total_clicks >= next_milestone:
+            progress = 1.0
+        else:
+            # Для плавності використовуємо прогрес від останнього досягнення
+            total_range = next_milestone - last_milestone
+            current_progress = total_clicks - last_milestone
+            progress = max(0.0, current_progress / total_range)
+        
+        # Малюємо прогрес-бар
+        dirty_rects = []
+        bar_rect = pygame.draw.rect(
+            self.screen, 
+            PROGRESS_BAR_BG_COLOR, 
+            (10, 40, PROGRESS_BAR_WIDTH, PROGRESS_BAR_HEIGHT)
+        )
+        
+        pygame.draw.rect(
+            self.screen, 
+            PROGRESS_BAR_FILL_COLOR, 
+            (10, 40, int(PROGRESS_BAR_WIDTH * progress), PROGRESS_BAR_HEIGHT)
+        )
+        
+        # Текст із прогресом
+        dirty_rects.append(bar_rect)
+        dirty_rects.append(self.glyph_atlas.draw(
+            self.screen, (PROGRESS_BAR_WIDTH + 20, 40), [total_clicks, "/", next_milestone]))
+        
+        # Додаємо назву наступного досягнення, якщо воно є
+        if next_achievement_name:
+            next_achievement_text = self.text_cache.render(
+                self.small_font,
+                next_achievement_name,
+                TEXT_COLOR
+            )
+            dirty_rects.append(self.screen.blit(next_achievement_text, (10, PROGRESS_BAR_HEIGHT + 45)))
+        
+        return dirty_rects
+    
+    def draw_help_text(self):
+        """
+        Рендеринг тексту з підказками.
+        
+        Returns:
+            Список перемальованих прямокутників
+        """
+        help_text = self.text_cache.render(
+            self.font,
+            self.language_manager.get_text("help_text"),
+            TEXT_COLOR
+        )
+        return [self.screen.blit(
+            help_text, 
+            (self.width // 2 - help_text.get_width() // 2, self.height - 30)
+        )]
+    
+    def draw_buttons(self):
+        """
+        Рендеринг кнопок інтерфейсу.
+        
+        Returns:
+            Список перемальованих прямокутників
+        """
+        # Кнопка досягнень
+        button_rect = pygame.draw.rect(
+            self.screen,
+            BUTTON_COLOR,
+            self.achievements_button_rect
+        )
+        achievements_text = self.text_cache.render(
+            self.font,
+            self.language_manager.get_text("achievements_button"),
+            BUTTON_TEXT_COLOR
+        )
+        self.screen.blit(
+            achievements_text,
+            (self.achievements_button_rect.centerx - achievements_text.get_width() // 2,
+             self.achievements_button_rect.centery - achievements_text.get_height() // 2)
+        )
+        return [button_rect]
+    
+    def render_achievements_panel(self, achievements, total_clicks):
+        """
+        Рендеринг панелі зі списком досягнень.
+        Рамка панелі компонується один раз у кешовану поверхню і перебудовується
+        лише при зміні мови або розміру вікна. Список віртуалізований: щокадру
+        малюються лише рядки, що потрапляють у видиму область.
+        
+        Args:
+            achievements: Об'єкт системи досягнень
+            total_clicks: Загальна кількість кліків
+            
+        Returns:
+            Список перемальованих прямокутників (панель накриває весь екран)
+        """
+        panel_key = (
+            self.language_manager.current_language,
+            self.width,
+            self.height
+        )
+        if self.panel_surface is None or self.panel_key != panel_key:
+            self.panel_surface = self.compose_achievements_panel()
+            self.panel_key = panel_key
+            self.recycle_rows()
+        
+        self.screen.blit(self.panel_surface, (0, 0))
+        self.update_panel_rows(achievements)
+        
+        viewport = self.panel_viewport
+        if not self.unlocked_rows:
+            # Якщо немає розблокованих досягнень
+            no_achievements_text = self.text_cache.render(
+                self.font,
+                self.language_manager.get_text("no_achievements"),
+                TEXT_COLOR
+            )
+            self.screen.blit(
+                no_achievements_text,
+                (viewport.centerx - no_achievements_text.get_width() // 2,
+                 viewport.centery - no_achievements_text.get_height() // 2)
+            )
+            return [self.screen.get_rect()]
+        
+        # Прокрутка обмежується висотою вмісту
+        content_height = self.get_panel_content_height()
+        self.panel_scroll = max(0, min(self.panel_scroll, content_height - viewport.height))
+        
+        blit_sequence = []
+        for key, y in self.get_visible_rows():
+            blit_sequence.append((self.get_row_surface(key, achievements), (viewport.x, viewport.y + y)))
+        
+        previous_clip = self.screen.get_clip()
+        self.screen.set_clip(viewport)
+        self.screen.blits(blit_sequence, doreturn=False)
+        self.screen.set_clip(previous_clip)
+        
+        # Смуга прокрутки, якщо вміст не вміщується
+        if content_height > viewport.height:
+            thumb_height = max(20, viewport.height * viewport.height // content_height)
+            thumb_y = viewport.y + (viewport.height - thumb_height) * self.panel_scroll // (content_height - viewport.height)
+            pygame.draw.rect(self.screen, (200, 200, 200), (viewport.right + 6, thumb_y, 4, thumb_height))
+        
+        return [self.screen.get_rect()]
+    
+    def update_panel_rows(self, achievements):
+        """
+        Оновлює списки індексів отриманих і закритих досягнень.
+        Списки перебудовуються лише при зміні набору отриманих досягнень.
+        
+        Args:
+            achievements: Об'єкт системи досягнень
+        """
+        if self.panel_rows_revision == achievements.revision:
+            return
+        self.unlocked_rows = []
+        self.locked_rows = []
+        for i, achievement in enumerate(achievements.achievements):
+            if achievement["achieved"]:
+                self.unlocked_rows.append(i)
+            else:
+                self.locked_rows.append(i)
+        self.panel_rows_revision = achievements.revision
+        self.recycle_rows()
+    
+    def get_panel_content_height(self):
+        """
+        Обчислює повну висоту списку досягнень.
+        
+        Returns:
+            Висота в пікселях
+        """
+        return (len(self.unlocked_rows) * ACHIEVEMENT_ROW_HEIGHT + ACHIEVEMENT_SECTION_GAP
+                + len(self.locked_rows) * LOCKED_ACHIEVEMENT_ROW_HEIGHT)
+    
+    def get_visible_rows(self):
+        """
+        Знаходить рядки, що потрапляють у видиму область при поточній прокрутці.
+        Позиції рядків обчислюються арифметично, тому час не залежить від довжини списку.
+        
+        Returns:
+            Список пар (ключ рядка, y відносно верху видимої області)
+        """
+        top = self.panel_scroll
+        bottom = top + self.panel_viewport.height
+        rows = []
+        
+        first = max(0, top // ACHIEVEMENT_ROW_HEIGHT)
+        last = min(len(self.unlocked_rows), -(-bottom // ACHIEVEMENT_ROW_HEIGHT))
+        for i in range(first, last):
+            rows.append((("unlocked", i), i * ACHIEVEMENT_ROW_HEIGHT - top))
+        
+        locked_top = len(self.unlocked_rows) * ACHIEVEMENT_ROW_HEIGHT + ACHIEVEMENT_SECTION_GAP
+        first = max(0, (top - locked_top) // LOCKED_ACHIEVEMENT_ROW_HEIGHT)
+        last = min(len(self.locked_rows), -(-(bottom - locked_top) // LOCKED_ACHIEVEMENT_ROW_HEIGHT))
+        for i in range(first, last):
+            rows.append((("locked", i), locked_top + i * LOCKED_ACHIEVEMENT_ROW_HEIGHT - top))
+        
+        # Рядки, що вийшли з видимої області, повертаються в пул
+        visible = {key for key, _ in rows}
+        for key in [key for key in self.row_surfaces if key not in visible]:
+            surface = self.row_surfaces.pop(key)
+            self.row_pool.setdefault(surface.get_height(), []).append(surface)
+        return rows
+    
+    def get_row_surface(self, key, achievements):
+        """
+        Отримує поверхню рядка списку, малюючи її лише при появі рядка у видимій області.
+        
+        Args:
+            key: Ключ рядка ("unlocked" або "locked", номер у відповідному списку)
+            achievements: Об'єкт системи досягнень
+            
+        Returns:
+            Поверхня рядка
+        """
+        surface = self.row_surfaces.get(key)
+        if surface is not None:
+            return surface
+        
+        kind, row = key
+        if kind == "unlocked":
+            achievement = achievements.achievements[self.unlocked_rows[row]]
+            height = ACHIEVEMENT_ROW_HEIGHT
+            text = self.text_cache.render(self.font, achievement["name"], ACHIEVEMENT_COLOR)
+        else:
+            achievement = achievements.achievements[self.locked_rows[row]]
+            height = LOCKED_ACHIEVEMENT_ROW_HEIGHT
+            # Використовуємо текст для заблокованого досягнення
+            text = self.text_cache.render(
+                self.small_font,
+                self.language_manager.get_locked_achievement_text(achievement["threshold"]),
+                (150, 150, 150)  # Сірий колір для заблокованих
+            )
+        
+        # Беремо вільну поверхню з пулу або створюємо нову
+        pool = self.row_pool.get(height)
+        if pool:
+            surface = pool.pop()
+        else:
+            surface = pygame.Surface((self.panel_viewport.width, height))
+        surface.fill(ACHIEVEMENTS_BG_COLOR[:3])
+        surface.blit(text, (0, 0))
+        self.row_surfaces[key] = surface
+        return surface
+    
+    def recycle_rows(self):
+        """Повертає всі намальовані рядки в пул (після зміни списку, мови чи розміру)."""
+        for surface in self.row_surfaces.values():
+            if surface.get_width() == self.panel_viewport.width:
+                self.row_pool.setdefault(surface.get_height(), []).append(surface)
+        self.row_surfaces = {}
+        # Поверхні іншої ширини (до зміни розміру вікна) більше не знадобляться
+        for height, pool in self.row_pool.items():
+            self.row_pool[height] = [surface for surface in pool if surface.get_width() == self.panel_viewport.width]
+    
+    def scroll_achievements_panel(self, delta):
+        """
+        Прокручує список досягнень.
+        
+        Args:
+            delta: Зсув у пікселях (додатний — вниз)
+        """
+        self.panel_scroll = max(0, self.panel_scroll + delta)
+    
+    def start_achievements_panel_drag(self, pos):
+        """
+        Починає перетягування списку, якщо натискання потрапило у видиму область.
+        
+        Args:
+            pos: Позиція курсора
+        """
+        if self.panel_viewport.collidepoint(pos):
+            self.panel_dragging = True
+            self.drag_start_y = pos[1]
+            self.drag_start_scroll = self.panel_scroll
+    
+    def drag_achievements_panel(self, pos):
+        """
+        Прокручує список відповідно до руху курсора під час перетягування.
+        
+        Args:
+            pos: Позиція курсора
+        """
+        if self.panel_dragging:
+            self.panel_scroll = max(0, self.drag_start_scroll - (pos[1] - self.drag_start_y))
+    
+    def end_achievements_panel_drag(self):
+        """Завершує перетягування списку."""
+        self.panel_dragging = False
+    
+    def get_overlay_surface(self):
+        """
+        Отримує напівпрозоре затемнення на весь екран, кешоване для поточного розміру вікна.
+        
+        Returns:
+            Поверхня затемнення
+        """
+        if self.overlay_surface is None or self.overlay_surface.get_size() != (self.width, self.height):
+            self.overlay_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.overlay_surface.fill((0, 0, 0, 200))  # Напівпрозорість
+        return self.overlay_surface
+    
+    def compose_achievements_panel(self):
+        """
+        Компонує рамку панелі досягнень разом із затемненням в одну поверхню
+        та визначає видиму область списку.
+        
+        Returns:
+            Поверхня розміром з екран з готовою панеллю без рядків списку
+        """
+        # Починаємо з копії напівпрозорого затемнення на весь екран
+        panel = self.get_overlay_surface().copy()
+        
+        # Вікно досягнень
+        panel_width = min(self.width - 100, 600)
+        panel_height = min(self.height - 100, 400)
+        panel_x = (self.width - panel_width) // 2
+        panel_y = (self.height - panel_height) // 2
+        
+        # Фон вікна малюємо непрозорим, як і на екрані без альфа-каналу
+        pygame.draw.rect(
+            panel,
+            ACHIEVEMENTS_BG_COLOR[:3],
+            (panel_x, panel_y, panel_width, panel_height)
+        )
+        pygame.draw.rect(
+            panel,
+            (200, 200, 200),  # Світло-сірий обідок
+            (panel_x, panel_y, panel_width, panel_height),
+            2  # Товщина обідка
+        )
+        
+        # Заголовок
+        title_text = self.text_cache.render(
+            self.large_font,
+            self.language_manager.get_text("achievements_title"),
+            ACHIEVEMENT_COLOR
+        )
+        panel.blit(
+            title_text,
+            (panel_x + (panel_width - title_text.get_width()) // 2, panel_y + 20)
+        )
+        
+        # Кнопка "Закрити"
+        self.close_button_rect = pygame.Rect(
+            panel_x + panel_width - BUTTON_WIDTH - 10,
+            panel_y + panel_height - BUTTON_HEIGHT - 10,
+            BUTTON_WIDTH,
+            BUTTON_HEIGHT
+        )
+        
+        # Видима область списку: від заголовка до кнопки "Закрити"
+        self.panel_viewport = pygame.Rect(
+            panel_x + 20,
+            panel_y + 70,
+            panel_width - 40,
+            max(0, self.close_button_rect.top - 10 - (panel_y + 70))
+        )
+        
+        pygame.draw.rect(
+            panel,
+            BUTTON_COLOR,
+            self.close_button_rect
+        )
+        close_text = self.text_cache.render(
+            self.font,
+            self.language_manager.get_text("close_button"),
+            BUTTON_TEXT_COLOR
+        )
+        panel.blit(
+            close_text,
+            (self.close_button_rect.centerx - close_text.get_width() // 2,
+             self.close_button_rect.centery - close_text.get_height() // 2)
+        )
+        return panel
\ No newline at end of file
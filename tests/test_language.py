@@ -0,0 +1,47 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.language
+from src.constants import DEFAULT_LANGUAGE, THOUSANDS_SEPARATOR
+
+class PartialCatalogTest(unittest.TestCase):
+    """Неповний або відсутній каталог мови не повинен ламати гру."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write_catalog(DEFAULT_LANGUAGE, {
+            "total": "Всього",
+            "clicks_per_second": "Кліків за секунду",
+            "left_clicks": "Ліві кліки",
+            "thousands_separator": " "
+        })
+        patch = mock.patch.object(src.language, "LANGUAGE_DIR", self.directory)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.addCleanup(shutil.rmtree, self.directory)
+    
+    def write_catalog(self, language, strings):
+        with open(os.path.join(self.directory, f"{language}.json"), "w", encoding="utf-8") as file:
+            json.dump({"language_name": language, "strings": strings}, file)
+    
+    def test_missing_keys_fall_back_to_default_language(self):
+        self.write_catalog("xx", {"total": "Total"})
+        manager = src.language.LanguageManager()
+        manager.set_language("xx")
+        self.assertEqual(manager.get_text("score_total_prefix"), " | Total: ")
+        self.assertEqual(manager.get_text("score_left_prefix"), "Ліві кліки: ")
+        self.assertEqual(manager.get_text("thousands_separator"), " ")
+    
+    def test_missing_catalog_keeps_separator(self):
+        manager = src.language.LanguageManager("missing")
+        self.assertEqual(manager.get_text("thousands_separator"), THOUSANDS_SEPARATOR)
+        self.assertEqual(manager.get_text("score_right_prefix"), " | right_clicks: ")
+
+if __name__ == "__main__":
+    unittest.main()
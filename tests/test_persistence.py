@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Фіктивні драйвери дозволяють створити гру без вікна та звуку
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import src.game
+from src.save_format import SAVE_FORMAT_VERSION
+from src.persistence import SaveManager
+
+class UnreadableSaveTest(unittest.TestCase):
+    """Збереження, яке не вдалося прочитати, не повинно перезаписуватися."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.save_path = os.path.join(self.directory, "save_data.json")
+        self.journal_path = os.path.join(self.directory, "save_data.journal")
+        # os.path.join з абсолютним шляхом повертає саме його, тому гра пише в тимчасовий каталог
+        self.patches = [
+            mock.patch.object(src.game, "SAVE_FILE", self.save_path),
+            mock.patch.object(src.game, "BINARY_SAVE_FILE", os.path.join(self.directory, "save_data.bin")),
+            mock.patch.object(src.game, "JOURNAL_FILE", self.journal_path),
+            mock.patch.object(src.game, "SAVE_BINARY", False),
+            mock.patch.object(src.game, "ANALYTICS_ENABLED", False)
+        ]
+        for patch in self.patches:
+            patch.start()
+    
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        pygame.quit()
+        shutil.rmtree(self.directory)
+    
+    def play_session(self):
+        """Запускає гру, клікає по баклажану та завершує сесію, як це робить Game.run."""
+        game = src.game.Game(persist_progress=True)
+        for _ in range(5):
+            pygame.event.post(pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN, button=1, pos=game.animation.eggplant_rect.center))
+            game.frame()
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        game.frame()
+        if game.saver is not None:
+            game.saver.stop()
+        return game
+    
+    def assert_session_keeps_save(self, content):
+        with open(self.save_path, "wb") as file:
+            file.write(content)
+        game = self.play_session()
+        self.assertIsNone(game.saver)
+        with open(self.save_path, "rb") as file:
+            self.assertEqual(file.read(), content)
+        self.assertFalse(os.path.exists(self.journal_path))
+    
+    def test_newer_version_save_is_not_overwritten(self):
+        content = json.dumps({
+            "version": SAVE_FORMAT_VERSION + 1,
+            "left_clicks": 123,
+            "right_clicks": 45
+        }).encode("utf-8")
+        self.assert_session_keeps_save(content)
+    
+    def test_corrupt_save_is_not_overwritten(self):
+        self.assert_session_keeps_save(b"{\"left_clicks\": 1")
+    
+    def test_readable_save_is_updated(self):
+        game = self.play_session()
+        self.assertIsNotNone(game.saver)
+        with open(self.save_path, "rb") as file:
+            self.assertIn(b"left_clicks", file.read())
+
+class SaveManagerStopTest(unittest.TestCase):
+    """stop() повідомляє, чи вдалося записати прогрес."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+    
+    def run_session(self, directory):
+        saver = SaveManager(os.path.join(directory, "save.json"), os.path.join(directory, "save.journal"))
+        saver.load()
+        saver.start()
+        saver.record_clicks(1, 0)
+        saver.request_snapshot({"left_clicks": 1, "right_clicks": 0, "achievements": 0})
+        return saver.stop()
+    
+    def test_successful_write(self):
+        self.assertTrue(self.run_session(self.directory))
+    
+    def test_failed_write(self):
+        self.assertFalse(self.run_session(os.path.join(self.directory, "missing")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+# Фіктивні драйвери дозволяють створити гру без вікна та звуку
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from src.game import Game
+
+def key_event(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+class DirtyRectRenderingTest(unittest.TestCase):
+    """Часткове перемальовування дає ті самі кадри, що й повне."""
+    def tearDown(self):
+        pygame.quit()
+    
+    def play(self, dirty_rect_mode):
+        """Кліки, паузи, панель досягнень, теплова карта, зміна мови та розміру вікна."""
+        game = Game(persist_progress=False, seed=1)
+        game.dirty_rect_mode = dirty_rect_mode
+        frames = []
+        for frame_index in range(360):
+            if (frame_index // 60) % 2 == 0 and frame_index % 3 == 0:
+                pygame.event.post(pygame.event.Event(
+                    pygame.MOUSEBUTTONDOWN, button=1 + frame_index % 2 * 2, pos=game.eggplant_rect.center))
+            if frame_index in (70, 100):
+                game.show_achievements_panel = frame_index == 70
+            elif frame_index in (130, 190):
+                pygame.event.post(key_event(pygame.K_F5))
+            elif frame_index == 250:
+                pygame.event.post(key_event(pygame.K_F2))
+            elif frame_index == 300:
+                pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, w=900, h=700, size=(900, 700)))
+            game.frame()
+            frames.append(pygame.image.tostring(game.screen, "RGB"))
+        pygame.quit()
+        return frames
+    
+    def test_partial_frames_match_full_frames(self):
+        full = self.play(False)
+        partial = self.play(True)
+        mismatched = [index for index, (a, b) in enumerate(zip(full, partial)) if a != b]
+        self.assertEqual(mismatched, [])
+
+if __name__ == "__main__":
+    unittest.main()
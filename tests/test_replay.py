@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+import zlib
+import tempfile
+import unittest
+
+# Фіктивні драйвери дозволяють створити гру без вікна та звуку
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from src.game import Game
+from src.replay import InputReplay, REPLAY_HEADER, REPLAY_MAGIC, REPLAY_VERSION, EVENT_MOTION
+
+class PanelReplayTest(unittest.TestCase):
+    """Прокрутка та перетягування списку досягнень відтворюються з запису."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "session.rec")
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(pygame.quit)
+    
+    def record_session(self):
+        """Відкриває панель, прокручує її коліщатком і перетягує список."""
+        game = Game(persist_progress=False)
+        game.start_recording(self.path)
+        game.frame(0.016)
+        pygame.event.post(pygame.event.Event(
+            pygame.MOUSEBUTTONDOWN, button=1, pos=game.ui.achievements_button_rect.center))
+        game.frame(0.016)
+        viewport = game.ui.panel_viewport
+        x, y = viewport.centerx, viewport.bottom - 10
+        steps = [
+            [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-3, flipped=False)],
+            [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1, flipped=False)],
+            [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x, y))],
+            [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y - 40), rel=(0, -40), buttons=(1, 0, 0))],
+            [pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(x, y - 40))],
+            [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y - 200), rel=(0, -160), buttons=(0, 0, 0))],
+            [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x, y - 200))],
+            [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y - 150), rel=(0, 50), buttons=(1, 0, 0))],
+            # Кнопку відпустили за межами вікна: MOUSEBUTTONUP не надійшов
+            [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y - 100), rel=(0, 50), buttons=(0, 0, 0))],
+            [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(0, 100), buttons=(0, 0, 0))]
+        ]
+        scrolls = []
+        for events in steps:
+            for event in events:
+                pygame.event.post(event)
+            game.frame(0.016)
+            scrolls.append(game.ui.panel_scroll)
+        self.assertFalse(game.ui.panel_dragging)
+        game.recorder.save()
+        return scrolls
+    
+    def replay_session(self):
+        replay = InputReplay(self.path)
+        game = Game(replay.width, replay.height, persist_progress=False, seed=replay.seed)
+        game.start_replay(replay)
+        game.frame()
+        game.frame()
+        scrolls = []
+        while not replay.finished():
+            game.frame()
+            scrolls.append(game.ui.panel_scroll)
+        return scrolls
+    
+    def test_scroll_and_drag_are_replayed(self):
+        recorded = self.record_session()
+        pygame.quit()
+        self.assertGreater(max(recorded), 0)
+        self.assertEqual(self.replay_session(), recorded)
+
+class CorruptReplayTest(unittest.TestCase):
+    """Пошкоджений запис призводить до ValueError, а не до довільного винятку."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "session.rec")
+        self.addCleanup(shutil.rmtree, self.directory)
+    
+    def write_replay(self, body, frame_count=1):
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, 0, 800, 600, 0, 0, frame_count)
+        with open(self.path, "wb") as file:
+            file.write(header + zlib.compress(bytes(body)))
+    
+    def read_all_frames(self):
+        replay = InputReplay(self.path)
+        while not replay.finished():
+            replay.next_frame()
+    
+    def test_truncated_frame(self):
+        # Порожня маска, тривалість кадру, одна подія-клік без координат
+        self.write_replay([0, 100, 1, 0, 1])
+        with self.assertRaises(ValueError):
+            self.read_all_frames()
+    
+    def test_missing_frames(self):
+        self.write_replay([0, 100, 0], frame_count=2)
+        with self.assertRaises(ValueError):
+            self.read_all_frames()
+    
+    def test_unknown_event_code(self):
+        self.write_replay([0, 100, 1, 99])
+        with self.assertRaises(ValueError):
+            self.read_all_frames()
+    
+    def test_version_2_motion_without_button_state(self):
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, 2, 0, 800, 600, 0, 0, 1)
+        with open(self.path, "wb") as file:
+            # Порожня маска, тривалість кадру, рух миші з двома полями
+            file.write(header + zlib.compress(bytes([0, 100, 1, EVENT_MOTION, 10, 20])))
+        replay = InputReplay(self.path)
+        dt, events, quality_level = replay.next_frame()
+        self.assertEqual(events[0].pos, (10, 20))
+        self.assertTrue(replay.finished())
+    
+    def test_truncated_achievement_mask(self):
+        self.write_replay([5, 1])
+        with self.assertRaises(ValueError):
+            InputReplay(self.path)
+
+if __name__ == "__main__":
+    unittest.main()